@@ -2,6 +2,8 @@ from fastapi import FastAPI, HTTPException, Request, Depends
 from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any, List
 import uvicorn
+import asyncio
+from contextlib import asynccontextmanager
 import os
 import json
 import io
@@ -32,7 +34,7 @@ from src.llm import (
 )
 from src.build_cap_log import build_cap_table
 from src.aqrr_pdf_generate import build_pdf_bytes_from_ticker
-from src.aqrr_word_generate import build_word_bytes_from_ticker
+from src.aqrr_word_generate import build_word_bytes_from_ticker, warm_sec_title_cache
 from utils.fetch_aqrr_data import fetch_all_ticker_data as fetch_data
 from src.credit_risk_metrics import generate_credit_risk_metrics
 # fsa import 
@@ -41,9 +43,18 @@ from src.fsa import analyze_ticker, clean_and_convert_to_json
 from src.on_demand_insights.chat_engine import chat, load_chat_history, save_chat_history
 from src.company_detail import get_company_table, build_exposure_table_for_ticker
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Fetch the SEC ticker index in the background so the first Word report
+    # doesn't wait on it, without holding up server startup either
+    asyncio.get_running_loop().run_in_executor(None, warm_sec_title_cache)
+    yield
+
+
 app = FastAPI(
     title="SEC Filings API",
-    description="API to fetch financial statements from SEC EDGAR filings"
+    description="API to fetch financial statements from SEC EDGAR filings",
+    lifespan=lifespan,
 )
 
 from fastapi.staticfiles import StaticFiles
@@ -371,19 +382,15 @@ def aqrr_pdf(req: AQRRRequest, request: Request):
         t = (req.ticker or "").strip().upper()
         if not t:
             raise HTTPException(status_code=400, detail="ticker is required")
-        # Generate PDF bytes
-        pdf_bytes = build_pdf_bytes_from_ticker(t)
-
         # Ensure output directory exists: output/pdf/AQRR
         base_dir = os.path.dirname(__file__)
         output_dir = os.path.join(base_dir, "output", "pdf", "AQRR")
         os.makedirs(output_dir, exist_ok=True)
 
-        # Save file as {TICKER}_AQRR.pdf (overwrite if exists)
+        # Write PDF straight to {TICKER}_AQRR.pdf (overwrite if exists)
         filename = f"{t}_AQRR.pdf"
         file_path = os.path.join(output_dir, filename)
-        with open(file_path, "wb") as f:
-             f.write(pdf_bytes)
+        build_pdf_bytes_from_ticker(t, output=file_path)
 
         # Return public URL path for preview/download
         public_path = f"/output/pdf/AQRR/{filename}"
@@ -404,19 +411,16 @@ def aqrr_word_only(req: AQRRRequest, request: Request):
         if not t:
             raise HTTPException(status_code=400, detail="ticker is required")
         
-        # Generate Word bytes (will make API calls internally)
-        word_bytes = build_word_bytes_from_ticker(t)
-        
         # Ensure output directory exists
         base_dir = os.path.dirname(__file__)
         output_dir = os.path.join(base_dir, "output", "word", "AQRR")
         os.makedirs(output_dir, exist_ok=True)
         
-        # Save file
+        # Generate the Word document (will make API calls internally) and save
+        # it straight to the output file rather than through an in-memory copy
         filename = f"{t}_AQRR.docx"
         file_path = os.path.join(output_dir, filename)
-        with open(file_path, "wb") as f:
-             f.write(word_bytes)
+        build_word_bytes_from_ticker(t, output=file_path)
         
         # Return public URL path
         public_path = f"/output/word/AQRR/{filename}"
@@ -441,28 +445,25 @@ def aqrr_pdf(req: AQRRRequest, request: Request):
         # Fetch all data once
         ticker_data = fetch_data(t)  # Use the fetch function from utils
         
-        # Generate both PDF and Word bytes using the same data
-        pdf_bytes = build_pdf_bytes_from_ticker(t, prefetched_data=ticker_data)
-        word_bytes = build_word_bytes_from_ticker(t, prefetched_data=ticker_data)
-        
         # Ensure output directories exist
         base_dir = os.path.dirname(__file__)
         pdf_output_dir = os.path.join(base_dir, "output", "pdf", "AQRR")
         word_output_dir = os.path.join(base_dir, "output", "word", "AQRR")
         os.makedirs(pdf_output_dir, exist_ok=True)
         os.makedirs(word_output_dir, exist_ok=True)
-        
-        # Save PDF file
         pdf_filename = f"{t}_AQRR.pdf"
         pdf_file_path = os.path.join(pdf_output_dir, pdf_filename)
-        with open(pdf_file_path, "wb") as f:
-            f.write(pdf_bytes)
-        
-        # Save Word file
         word_filename = f"{t}_AQRR.docx"
         word_file_path = os.path.join(word_output_dir, word_filename)
-        with open(word_file_path, "wb") as f:
-            f.write(word_bytes)
+        
+        # Generate both PDF and Word using the same data; the Word document is
+        # saved straight to its file, the PDF once both have been built
+        pdf_bytes = build_pdf_bytes_from_ticker(t, prefetched_data=ticker_data)
+        build_word_bytes_from_ticker(t, prefetched_data=ticker_data, output=word_file_path)
+        
+        # Save PDF file
+        with open(pdf_file_path, "wb") as f:
+            f.write(pdf_bytes)
         
         # Return both file paths
         base_url = str(request.base_url).rstrip('/')
@@ -0,0 +1,126 @@
+import os
+import json
+import re
+import tempfile
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from datetime import datetime
+
+try:
+    import orjson  # optional C JSON parser
+except ImportError:
+    orjson = None
+
+
+def json_loads(data):
+    """Parse JSON text/bytes with orjson when installed; json handles what orjson rejects (e.g. NaN)."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+def json_dumps(obj) -> bytes:
+    """Serialize `obj` to UTF-8 JSON bytes, via orjson when installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            pass
+    return json.dumps(obj).encode('utf-8')
+
+
+def write_file_atomic(path: str, data: bytes) -> None:
+    """
+    Write `data` to `path` through a uniquely named temp file in the same directory,
+    so concurrent writers never share a temp file and readers never see a torn file.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+# HTTP session shared by the PDF and Word generators for the AQRR data APIs and SEC.
+# Retry's default allowed_methods exclude POST, so API calls are only retried when the
+# connection itself fails; GETs are also retried on gateway errors.
+HTTP_SESSION = requests.Session()
+_HTTP_ADAPTER = HTTPAdapter(
+    pool_maxsize=8,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=(502, 503, 504)),
+)
+HTTP_SESSION.mount('http://', _HTTP_ADAPTER)
+HTTP_SESSION.mount('https://', _HTTP_ADAPTER)
+
+# On-disk copies of successful API payloads. Cache file names carry the date, so no
+# entry outlives the day whatever its TTL; endpoints not listed here use the default.
+API_CACHE_DIR = os.path.join('output', 'cache')
+# company-table is derived from SEC's ticker list, which company_detail refreshes hourly.
+API_CACHE_TTLS = {'hfa': 3600, 'credit_table': 24 * 3600, 'company-table': 3600,
+                  'cap-table': 24 * 3600, 'comp': 24 * 3600}
+_DEFAULT_CACHE_TTL_SECONDS = 3600
+
+# Tickers that may appear in a cache file name; anything else bypasses the cache
+_CACHEABLE_TICKER_RE = re.compile(r'[A-Z0-9.\-]+')
+
+
+def post_json(endpoint: str, ticker: str, timeout: float = 300):
+    """
+    POST {"ticker": ticker} to {APP_BASE_URL}/api/v1/{endpoint} and decode the body.
+    Returns (status_code, payload); payload is the error detail for non-200 responses.
+    Raises requests.RequestException on transport errors and ValueError on invalid JSON.
+    """
+    api_base = os.getenv('APP_BASE_URL', 'http://127.0.0.1:9259')
+    resp = HTTP_SESSION.post(f"{api_base.rstrip('/')}/api/v1/{endpoint}", json={"ticker": ticker}, timeout=timeout)
+    if resp.status_code != 200:
+        try:
+            detail = json_loads(resp.content)
+        except Exception:
+            detail = resp.text
+        return resp.status_code, detail
+    try:
+        return 200, json_loads(resp.content)
+    except Exception as e:
+        raise ValueError(str(e))
+
+
+def cached_post_json(endpoint: str, ticker: str, timeout: float = 300, force_refresh: bool = False):
+    """
+    post_json backed by output/cache/{ticker}_{endpoint}_{YYYYMMDD}.json, trusted for
+    API_CACHE_TTLS[endpoint] seconds. Only 200 payloads are stored; `force_refresh`
+    skips the cached copy but still rewrites it. Tickers outside [A-Z0-9.-] are never
+    used in a file name and always go to the API.
+    """
+    if not isinstance(ticker, str) or not _CACHEABLE_TICKER_RE.fullmatch(ticker):
+        return post_json(endpoint, ticker, timeout)
+
+    day = datetime.now().strftime('%Y%m%d')
+    cache_path = os.path.join(API_CACHE_DIR, f"{ticker}_{endpoint.replace('-', '_')}_{day}.json")
+    if not force_refresh:
+        try:
+            if time.time() - os.path.getmtime(cache_path) < API_CACHE_TTLS.get(endpoint, _DEFAULT_CACHE_TTL_SECONDS):
+                with open(cache_path, 'rb') as f:
+                    return 200, json_loads(f.read())
+        except Exception:
+            pass
+
+    status, payload = post_json(endpoint, ticker, timeout)
+    if status == 200:
+        # Best-effort cache write; a failure here must not break report generation
+        try:
+            os.makedirs(API_CACHE_DIR, exist_ok=True)
+            write_file_atomic(cache_path, json_dumps(payload))
+        except Exception:
+            pass
+    return status, payload
@@ -3,19 +3,25 @@ import os
 import io
 import json
 import re
+import hashlib
+import threading
+import time
 import requests
 import numpy as np
 import pandas as pd
 from datetime import datetime
 import argparse
 import sys
+from functools import lru_cache
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 # PDF generation imports
 from fastapi import APIRouter, FastAPI, HTTPException, Body
 from fastapi.responses import StreamingResponse
 from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.platypus.flowables import KeepTogether
+from reportlab.platypus import SimpleDocTemplate, Table, LongTable, TableStyle, Paragraph, Spacer
+from reportlab.platypus.flowables import CondPageBreak, KeepTogether
 from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
@@ -27,7 +33,9 @@ from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.enum.table import WD_ALIGN_VERTICAL, WD_TABLE_ALIGNMENT
 from docx.oxml.ns import qn
 from docx.oxml import OxmlElement
+from src.api_cache import API_CACHE_TTLS, cached_post_json
 from src.company_detail import build_exposure_table_for_ticker
+from src.excel_io import read_essence_table
 
 
 router = APIRouter()
@@ -35,6 +43,57 @@ app = FastAPI(title="PDF API")
 app.include_router(router, prefix="/pdf")
 
 
+# Base table style commands for generate_pdf, built once at import; each request
+# copies the list and appends only its row-specific LINEABOVE/SPAN/BACKGROUND rules
+_HEADER_BG = colors.HexColor('#44546A')
+
+_CSV_TWO_ROW_STYLE_CMDS = [
+    # Blue background for header rows
+    ('BACKGROUND', (0, 0), (-1, 1), _HEADER_BG),
+    ('TEXTCOLOR', (0, 0), (-1, 1), colors.whitesmoke),
+    # First column left aligned for ALL rows (including headers and data)
+    ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+    # Other columns center aligned
+    ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 1), 'Helvetica-Bold'),
+    # Reduce padding to make header rows closer together
+    ('BOTTOMPADDING', (0, 0), (-1, 1), 0),
+    ('TOPPADDING', (0, 0), (-1, 1), 3),
+    # White background for data rows
+    ('BACKGROUND', (0, 2), (-1, -1), colors.white),
+    # Only draw the outer border of the table
+    ('BOX', (0, 0), (-1, -1), 0.5, colors.black),
+    # Add horizontal line between header and data
+    ('LINEBELOW', (0, 1), (-1, 1), 0.5, colors.black),
+    # Minimal padding for all cells to ensure compact layout
+    ('LEFTPADDING', (0, 0), (-1, -1), 2),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 2),
+    # Tighten data rows
+    ('BOTTOMPADDING', (0, 2), (-1, -1), 1.5),
+    ('TOPPADDING', (0, 2), (-1, -1), 1.5),
+]
+
+_SINGLE_HEADER_STYLE_CMDS = [
+    ('BACKGROUND', (0, 0), (-1, 0), _HEADER_BG),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    # First column left aligned for ALL rows
+    ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+    # Other columns center aligned
+    ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 3),
+    ('TOPPADDING', (0, 0), (-1, 0), 3),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+    ('BOX', (0, 0), (-1, -1), 0.5, colors.black),
+    ('LINEBELOW', (0, 0), (-1, 0), 0.5, colors.black),
+    ('LEFTPADDING', (0, 0), (-1, -1), 2),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 2),
+]
+
+# Blank-line paragraph boundaries in statement_analysis.txt
+_PARA_BREAK_RE = re.compile(r'\n\s*\n')
+
+
 # def draw_aqrr_header(canvas, doc):
 #     canvas.saveState()
 #     width, height = doc.pagesize
@@ -85,6 +144,40 @@ def get_company_title_from_ticker(ticker: str, mapping_path: str = os.path.join(
     return ticker
 
 
+@lru_cache(maxsize=256)
+def _title_for_mapping(ticker: str, mapping_path: str, mtime_ns: int) -> str:
+    """get_company_title_from_ticker memoized per mapping file version (`mtime_ns` keys the cache)."""
+    return get_company_title_from_ticker(ticker, mapping_path)
+
+
+def _cached_title(ticker: str, mapping_path: str = os.path.join('static', 'company_ticker.json')) -> str:
+    """Company title for `ticker`, re-read whenever the mapping file changes."""
+    try:
+        mtime_ns = os.stat(mapping_path).st_mtime_ns
+    except OSError:
+        return get_company_title_from_ticker(ticker, mapping_path)
+    return _title_for_mapping(ticker, mapping_path, mtime_ns)
+
+
+# Exposure details come from SEC's ticker list, which company_detail refreshes hourly;
+# the Word report's cached company-table payload expires on the same schedule
+_EXPOSURE_TTL_SECONDS = API_CACHE_TTLS['company-table']
+
+
+@lru_cache(maxsize=256)
+def _exposure_for_bucket(ticker: str, ttl_bucket: int) -> dict:
+    """
+    Memoized build_exposure_table_for_ticker; failures raise and are not cached.
+    `ttl_bucket` only keys the cache so entries expire with the SEC data.
+    """
+    return build_exposure_table_for_ticker(ticker)
+
+
+def _cached_exposure(ticker: str) -> dict:
+    """Exposure table for `ticker`, rebuilt at most once per _EXPOSURE_TTL_SECONDS."""
+    return _exposure_for_bucket(ticker, int(time.time() // _EXPOSURE_TTL_SECONDS))
+
+
 def get_company_title_from_sec(ticker: str,
                                url: str = 'https://www.sec.gov/files/company_tickers.json') -> str | None:
     """Attempt to resolve company title from SEC's public company_tickers.json.
@@ -121,6 +214,7 @@ def current_quarter_index(reference: datetime | None = None) -> int:
     return 4
 
 
+@lru_cache(maxsize=256)
 def quarter_end_label_for_year(year: int, reference: datetime | None = None) -> str:
     """Return the quarter-end label like '3/31/25' based on the current quarter for the given year."""
     q = current_quarter_index(reference)
@@ -133,14 +227,22 @@ def quarter_end_label_for_year(year: int, reference: datetime | None = None) ->
 
 def format_number_for_display(val):
     """Format numbers for display in HFA table: remove 000s and format negatives with parentheses"""
-    try:
-        if val is None or val == "" or (isinstance(val, str) and val.strip() == "-"):
+    if val is None:
+        return "-"
+    if isinstance(val, str):
+        stripped = val.strip()
+        if val == "" or stripped == "-":
             return "-"
-        
+
         # Handle percentage values differently
-        if isinstance(val, str) and '%' in val:
+        if '%' in val:
             return val
-            
+
+        # Cheap numeric check so label cells don't raise and catch in float()
+        if not stripped.lstrip('-').replace('.', '', 1).isdigit():
+            return val
+
+    try:
         # Convert to float and divide by 1000 to remove 000s
         f = float(val) / 1000
         
@@ -213,6 +315,9 @@ def json_to_dataframe(json_data):
             return pd.DataFrame()
 
         if all(isinstance(item, dict) for item in json_data):
+            # Fast path: flat records need no normalization pass
+            if not any(isinstance(v, (dict, list)) for item in json_data for v in item.values()):
+                return pd.DataFrame(json_data)
             try:
                 return pd.json_normalize(json_data)
             except Exception:
@@ -244,6 +349,314 @@ def get_companies():
         raise HTTPException(status_code=404, detail="Company data folder not found.")
 
 
+def _header_label(label):
+    """Blank out the 'Unnamed: ...' placeholders pandas gives empty header cells."""
+    label = str(label)
+    return '' if label.startswith('Unnamed:') else label
+
+
+@lru_cache(maxsize=512)
+def _fmt_comp_header(col):
+    """Shorten a COMP metric header and add line breaks for readability."""
+    # Create more readable abbreviations
+    col_text = (col.replace('Total', 'Tot').replace('Margin', 'Mrgn')
+                .replace('Revenue', 'Rev').replace('Average', 'Avg'))
+
+    # Add (000s) suffix to LTM REV and LTM EBITDA columns
+    if 'LTM REV' in col_text or 'LTM Rev' in col_text or 'LTM EBITDA' in col_text:
+        col_text += '(000s)'
+
+    # Break "A / B" headers onto two lines (only when there is a single '/')
+    head, sep, tail = col_text.partition('/')
+    if sep and '/' not in tail:
+        col_text = f"{head.strip()}<br/>{tail.strip()}"
+
+    # Put a parenthesised suffix on its own line
+    if '(' in col_text and ')' in col_text:
+        col_text = col_text.replace('(', '<br/>(')
+    return col_text
+
+
+@lru_cache(maxsize=None)
+def _pdf_styles():
+    """
+    Build the report stylesheet once per process.
+    ParagraphStyle copies every attribute from its parent on construction, so the
+    fixed table/section styles are created here instead of per call or per row.
+    Styles are read-only once built and are shared across documents.
+    """
+    styles = getSampleStyleSheet()
+
+    # Paragraph styles for table data
+    styles.add(ParagraphStyle(
+        name='TableDataFirstCol',
+        fontSize=7,
+        leading=8,
+        alignment=0  # Left alignment for first column
+    ))
+    styles.add(ParagraphStyle(
+        name='TableData',
+        fontSize=7,
+        leading=8,
+        alignment=1  # Center alignment for other columns
+    ))
+
+    # Styles for table headers
+    styles.add(ParagraphStyle(
+        name='TableHeaderFirstCol',
+        fontSize=8,
+        leading=9,
+        alignment=0,  # Left alignment for first column header
+        fontName='Helvetica-Bold',
+        textColor=colors.whitesmoke
+    ))
+    styles.add(ParagraphStyle(
+        name='TableHeader',
+        fontSize=8,
+        leading=9,
+        alignment=1,  # Center alignment for other headers
+        fontName='Helvetica-Bold',
+        textColor=colors.whitesmoke
+    ))
+
+    td_style = styles['TableData']
+    td_first_style = styles['TableDataFirstCol']
+    th_style = styles['TableHeader']
+    th_first_style = styles['TableHeaderFirstCol']
+
+    # Section header rows ("Key Financial Ratios:")
+    styles.add(ParagraphStyle(name='CenteredHeader', parent=td_style, alignment=1, fontSize=8))
+    styles.add(ParagraphStyle(name='CenteredHeaderCap', parent=td_style, alignment=1, fontSize=8))
+
+    # Financial Statement Analysis section
+    styles.add(ParagraphStyle(
+        name='SectionHeader',
+        parent=styles['Heading3'],
+        fontName='Helvetica-Bold',
+        fontSize=11,
+        leading=13,
+        textColor=colors.darkslategray,
+        underline=0,
+        spaceAfter=6
+    ))
+    styles.add(ParagraphStyle(
+        name='BulletPoint',
+        parent=styles['Normal'],
+        fontName='Helvetica',
+        fontSize=10,
+        leading=14,  # Increased leading for better spacing between lines
+        leftIndent=20,  # Indentation for the bullet points
+        firstLineIndent=-12,  # Negative first line indent to make the bullet hang
+        spaceBefore=4,
+        spaceAfter=6,
+        alignment=0  # Left alignment
+    ))
+
+    # COMP table, with smaller font sizes
+    styles.add(ParagraphStyle(
+        name='CompTitle',
+        parent=styles['Heading2'],
+        fontName='Helvetica-Bold',
+        fontSize=11,
+        leading=13,
+        textColor=colors.black,
+        spaceAfter=6
+    ))
+    styles.add(ParagraphStyle(
+        name='CompHeaderStyle',
+        parent=th_style,
+        fontSize=7.5,
+        leading=9,
+        alignment=1,  # Center alignment
+        textColor=colors.whitesmoke
+    ))
+    styles.add(ParagraphStyle(
+        name='CompHeaderFirstColStyle',
+        parent=th_first_style,
+        fontSize=7.5,
+        leading=9,
+        alignment=0,  # Left alignment
+        textColor=colors.whitesmoke
+    ))
+    styles.add(ParagraphStyle(
+        name='CompDataStyle',
+        parent=td_style,
+        fontSize=7,
+        leading=9,
+        alignment=1  # Center alignment
+    ))
+    styles.add(ParagraphStyle(
+        name='CompDataFirstColStyle',
+        parent=td_first_style,
+        fontSize=7,
+        leading=9,
+        alignment=0  # Left alignment
+    ))
+    comp_header_style = styles['CompHeaderStyle']
+    styles.add(ParagraphStyle(
+        name='CompHeaderTitle', parent=comp_header_style, fontSize=7.5, alignment=1, textColor=colors.whitesmoke
+    ))
+    styles.add(ParagraphStyle(
+        name='CompHeaderGroup', parent=comp_header_style, alignment=1, textColor=colors.whitesmoke
+    ))
+
+    # Covenant summary title (the only non-static cell of that table)
+    styles.add(ParagraphStyle(
+        name='CovTitle', parent=th_style, fontSize=9, alignment=1, textColor=colors.whitesmoke
+    ))
+
+    styles.add(ParagraphStyle(
+        name='Footnote', parent=styles['Normal'], fontSize=8, textColor=colors.grey, alignment=0
+    ))
+    return styles
+
+
+# Static template tables. Every cell is a plain string (fonts come from the
+# TableStyle), so the cached rows/style can be shared by concurrent builds;
+# only the Table itself, which ReportLab mutates while laying out, is per document.
+_ESG_HEADERS = ("ESG Factor", "Risk\nRating") * 3  # ratings column is too narrow for one line
+_ESG_FACTORS = (
+    ("Climate Regulation", "Climate Change", "Habitat", "Sustainability",
+     "Blended Score", "ESG Engagement"),
+    ("Product Safety", "Workplace Safety", "Health & Wellness", "Stakeholder Engagement",
+     "Max Factor Score", ""),
+    ("Board Composition", "Succession planning", "Data Security", "Labor Relations",
+     "Aggregate Risk", ""),
+)
+_COV_TERMS = (
+    "Maximum Leverage Ratio",
+    "Unconsolidated Affiliates / Total Asset Value",
+    "Total Marketable Securities, etc. / Total Asset Value",
+    "Minimum Fixed Charge Coverage Ratio",
+    "Maximum Secured Indebtedness",
+    "Maximum Unencumbered Leverage Ratio",
+)
+_COV_MORE_TERMS = (
+    "Unimprovement Land / Unencumbered Pool Value",
+    "Development, JVs, etc. / Unencumbered Pool Value",
+)
+
+
+@lru_cache(maxsize=8)
+def _esg_table_template(doc_width):
+    """Rows, column widths and TableStyle of the ESG Risk Ratings template."""
+    rows = [_ESG_HEADERS]
+    cmds = [
+        # Header styling
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#44546A')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 8),
+        ('LEADING', (0, 0), (-1, 0), 9),
+        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 3),
+        ('TOPPADDING', (0, 0), (-1, 0), 3),
+        # Body alignment
+        ('ALIGN', (0, 1), (0, -1), 'LEFT'),
+        ('ALIGN', (2, 1), (2, -1), 'LEFT'),
+        ('ALIGN', (4, 1), (4, -1), 'LEFT'),
+        ('ALIGN', (1, 1), (1, -1), 'CENTER'),
+        ('ALIGN', (3, 1), (3, -1), 'CENTER'),
+        ('ALIGN', (5, 1), (5, -1), 'CENTER'),
+        # Grid / borders
+        ('BOX', (0, 0), (-1, -1), 0.5, colors.black),
+        ('GRID', (0, 0), (-1, -1), 0.25, colors.black),
+        # Background for data rows
+        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+        # Padding
+        ('LEFTPADDING', (0, 0), (-1, -1), 2),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 2),
+        ('TOPPADDING', (0, 1), (-1, -1), 1.5),
+        ('BOTTOMPADDING', (0, 1), (-1, -1), 1.5),
+        # Body font (matches the TableData paragraph style)
+        ('FONTSIZE', (0, 1), (-1, -1), 7),
+        ('LEADING', (0, 1), (-1, -1), 8),
+    ]
+    for i, labels in enumerate(zip(*_ESG_FACTORS), start=1):
+        row = []
+        for j, label in enumerate(labels):
+            # Factor labels are bold; empty factor slots show '*' like the ratings
+            row.extend([label or "*", "*"])
+            if label:
+                cmds.append(('FONTNAME', (2 * j, i), (2 * j, i), 'Helvetica-Bold'))
+        rows.append(tuple(row))
+
+    # Column widths: factors wider than ratings
+    factor_w = doc_width * 0.27
+    rating_w = doc_width * 0.06
+    return tuple(rows), (factor_w, rating_w) * 3, TableStyle(cmds)
+
+
+def _build_esg_table(doc_width):
+    """Fresh ESG Risk Ratings Table built from the cached template."""
+    rows, col_widths, style = _esg_table_template(doc_width)
+    return Table([list(r) for r in rows], colWidths=list(col_widths), style=style)
+
+
+@lru_cache(maxsize=8)
+def _covenant_table_template(doc_width, date):
+    """Rows (title cell left blank), column widths and TableStyle of the Covenant Summary."""
+    rows = [
+        ("", "", ""),  # Title row (span 3 cols), filled in per document
+        (date, "", ""),  # Date row (span 3)
+        ("Term", "Covenant Level", "Reported"),
+    ]
+    # Terms, with Covenant Level and Reported filled with '*'
+    rows.extend((t, "*", "*") for t in _COV_TERMS)
+    group_row = len(rows)
+    rows.append(("Additional Covenants / Baskets", "", ""))
+    rows.extend((t, "*", "*") for t in _COV_MORE_TERMS)
+
+    # Column widths
+    term_w = doc_width * 0.62
+    other_w = (doc_width - term_w) / 2
+
+    style = TableStyle([
+        ('SPAN', (0, 0), (-1, 0)),  # title span
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#44546A')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+        ('LEADING', (0, 0), (-1, 0), 9),  # keep the blank spanned cells to the title's height
+
+        ('SPAN', (0, 1), (-1, 1)),  # date span
+        ('BACKGROUND', (0, 1), (-1, 1), colors.lightgrey),
+        ('ALIGN', (0, 1), (-1, 1), 'CENTER'),
+        ('FONTNAME', (0, 1), (-1, 1), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 1), (-1, 1), 9),
+        ('LEADING', (0, 1), (-1, 1), 12),
+
+        ('BACKGROUND', (0, 2), (-1, 2), colors.lightgrey),  # header row
+        ('ALIGN', (0, 2), (-1, 2), 'CENTER'),
+        ('FONTNAME', (0, 2), (-1, 2), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 2), (-1, 2), 8),
+        ('LEADING', (0, 2), (-1, 2), 9),
+
+        ('ALIGN', (0, 3), (0, -1), 'LEFT'),  # term col left
+        ('ALIGN', (1, 3), (-1, -1), 'CENTER'),
+        ('FONTSIZE', (0, 3), (-1, -1), 7),
+        ('LEADING', (0, 3), (-1, -1), 8),
+
+        ('SPAN', (0, group_row), (-1, group_row)),  # group header span
+        ('BACKGROUND', (0, group_row), (-1, group_row), colors.lightgrey),
+        ('ALIGN', (0, group_row), (-1, group_row), 'CENTER'),
+        ('FONTNAME', (0, group_row), (-1, group_row), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, group_row), (-1, group_row), 8),
+        ('LEADING', (0, group_row), (-1, group_row), 9),
+
+        ('BOX', (0, 0), (-1, -1), 0.5, colors.black),
+        ('GRID', (0, 0), (-1, -1), 0.25, colors.black),
+    ])
+    return tuple(rows), (term_w, other_w, other_w), style
+
+
+def _build_covenant_table(doc_width, title, date):
+    """Fresh Covenant Summary Table; `title` is the flowable for the spanned title row."""
+    rows, col_widths, style = _covenant_table_template(doc_width, date)
+    data = [list(r) for r in rows]
+    data[0][0] = title
+    return Table(data, colWidths=list(col_widths), style=style)
+
+
 @router.post('/aqrr_pdf')
 def generate_pdf(data: dict = Body(...)):
     """Generates a PDF from company data."""
@@ -257,11 +670,11 @@ def generate_pdf(data: dict = Body(...)):
         raise HTTPException(status_code=404, detail="Company folder not found.")
 
     # Find the data file (csv, excel, or json)
-    data_file = None
-    for filename in os.listdir(company_path):
-        if filename.endswith(('.csv', '.xlsx', '.json')):
-            data_file = os.path.join(company_path, filename)
-            break
+    with os.scandir(company_path) as it:
+        data_file = next(
+            (e.path for e in it if e.name.endswith(('.csv', '.xlsx', '.json'))),
+            None,
+        )
 
     if not data_file:
         raise HTTPException(status_code=404, detail="Data file (csv, xlsx, or json) not found.")
@@ -269,12 +682,20 @@ def generate_pdf(data: dict = Body(...)):
     # Load data from the file
     try:
         if data_file.endswith('.csv'):
-            df = pd.read_csv(data_file)
-            # Replace NaN values with empty strings for CSV files
-            df = df.replace({np.nan: ''})
+            # Let pandas parse the two header rows natively. Disabling NA detection
+            # keeps blanks as '' (no NaN replace pass) and dtype=str skips type
+            # inference since every cell is rendered as text anyway
+            csv_kwargs = {'keep_default_na': False, 'na_filter': False, 'dtype': str}
+            try:
+                df = pd.read_csv(data_file, header=[0, 1], **csv_kwargs)
+            except pd.errors.ParserError:
+                df = pd.DataFrame()
+            if df.empty:
+                # Too few rows for a two-row header
+                df = pd.read_csv(data_file, **csv_kwargs)
         elif data_file.endswith('.xlsx'):
             # Explicitly specify the sheet name
-            df = pd.read_excel(data_file, sheet_name='Essence Table')
+            df = read_essence_table(data_file)
         elif data_file.endswith('.json'):
             with open(data_file, 'r') as f:
                 json_data = json.load(f)
@@ -307,103 +728,46 @@ def generate_pdf(data: dict = Body(...)):
         bottomMargin=0.75 * inch
     )
     elements = []
-    styles = getSampleStyleSheet()
-
-    # Define paragraph styles for table data
-    styles.add(ParagraphStyle(
-        name='TableDataFirstCol',
-        fontSize=7,
-        leading=8,
-        alignment=0  # Left alignment for first column
-    ))
-
-    styles.add(ParagraphStyle(
-        name='TableData',
-        fontSize=7,
-        leading=8,
-        alignment=1  # Center alignment for other columns
-    ))
-
-    # Define styles for table headers
-    styles.add(ParagraphStyle(
-        name='TableHeaderFirstCol',
-        fontSize=8,
-        leading=9,
-        alignment=0,  # Left alignment for first column header
-        fontName='Helvetica-Bold',
-        textColor=colors.whitesmoke
-    ))
-
-    styles.add(ParagraphStyle(
-        name='TableHeader',
-        fontSize=8,
-        leading=9,
-        alignment=1,  # Center alignment for other headers
-        fontName='Helvetica-Bold',
-        textColor=colors.whitesmoke
-    ))
+    styles = _pdf_styles()
 
 
     # Special handling for CSV files to create a two-row header
     if data_file.endswith('.csv'):
         # Assuming the first two rows should be headers
-        if len(df) >= 2:
-            # Extract the first two rows for headers
-            header_row1 = []
-            header_row2 = []
+        if isinstance(df.columns, pd.MultiIndex):
+            # Extract the two header levels
+            # Resolve per-column styles once instead of per cell
+            P = Paragraph
+            ncols = len(df.columns)
+            header_styles = [styles['TableHeaderFirstCol']] + [styles['TableHeader']] * (ncols - 1)
+            col_styles = [styles['TableDataFirstCol']] + [styles['TableData']] * (ncols - 1)
 
             # Apply different styles to first column vs other columns in headers
-            for i, cell in enumerate(df.columns.tolist()):
-                style = styles['TableHeaderFirstCol'] if i == 0 else styles['TableHeader']
-                header_row1.append(Paragraph(str(cell), style))
-
-            for i, cell in enumerate(df.iloc[0].tolist()):
-                style = styles['TableHeaderFirstCol'] if i == 0 else styles['TableHeader']
-                header_row2.append(Paragraph(str(cell), style))
-
-            # Remove the first row from the dataframe as it's now part of the header
-            df = df.iloc[1:].reset_index(drop=True)
-
-            # Prepare table data rows
-            table_rows = []
-            for row in df.values.tolist():
-                formatted_row = []
-                for i, cell in enumerate(row):
-                    style = styles['TableDataFirstCol'] if i == 0 else styles['TableData']
-                    formatted_row.append(Paragraph(str(cell) if cell != '' else '', style))
-                table_rows.append(formatted_row)
+            header_row1 = [
+                P(_header_label(cell), s)
+                for cell, s in zip(df.columns.get_level_values(0), header_styles)
+            ]
+            header_row2 = [
+                P(_header_label(cell), s)
+                for cell, s in zip(df.columns.get_level_values(1), header_styles)
+            ]
+
+            # Prepare table data rows; empty cells share one sentinel per column style
+            empty_cells = [P('', s) for s in col_styles]
+            table_rows = [
+                [P(str(cell), s) if cell != '' else e for cell, s, e in zip(row, col_styles, empty_cells)]
+                for row in df.values.tolist()
+            ]
 
             # Create table style with blue header background and no internal lines
-            table_style = TableStyle([
-                # Blue background for header rows
-                ('BACKGROUND', (0, 0), (-1, 1), colors.HexColor('#44546A')),
-                ('TEXTCOLOR', (0, 0), (-1, 1), colors.whitesmoke),
-                # First column left aligned for ALL rows (including headers and data)
-                ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-                # Other columns center aligned
-                ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 1), 'Helvetica-Bold'),
-                # Reduce padding to make header rows closer together
-                ('BOTTOMPADDING', (0, 0), (-1, 1), 0),
-                ('TOPPADDING', (0, 0), (-1, 1), 3),
-                # White background for data rows
-                ('BACKGROUND', (0, 2), (-1, -1), colors.white),
-                # Only draw the outer border of the table
-                ('BOX', (0, 0), (-1, -1), 0.5, colors.black),
-                # Add horizontal line between header and data
-                ('LINEBELOW', (0, 1), (-1, 1), 0.5, colors.black),
-                # Minimal padding for all cells to ensure compact layout
-                ('LEFTPADDING', (0, 0), (-1, -1), 2),
-                ('RIGHTPADDING', (0, 0), (-1, -1), 2),
-                # Tighten data rows
-                ('BOTTOMPADDING', (0, 2), (-1, -1), 1.5),
-                ('TOPPADDING', (0, 2), (-1, -1), 1.5),
-            ])
+            table_style = TableStyle(list(_CSV_TWO_ROW_STYLE_CMDS))
             # Define the exact keywords to check for
             exact_keywords = ["Total Debt", "Total Debt + COLs", "Book Capitalization", "Market Capitalization"]
             ratio_header_idx = None
+            # First-column labels read once instead of a df.iloc lookup per row
+            first_col = [str(x) for x in df.iloc[:, 0].tolist()] if ncols > 0 else [""] * len(table_rows)
             for i, row in enumerate(table_rows):
-                first_cell_value = str(df.iloc[i, 0]) if len(df.columns) > 0 else ""
+                first_cell_value = first_col[i]
                 # Check if the cell value exactly matches any of the keywords
                 if first_cell_value in exact_keywords:
                     # Add line above this row
@@ -426,35 +790,29 @@ def generate_pdf(data: dict = Body(...)):
                     table_style.add('BACKGROUND', (0, i + 2), (-1, i + 2), colors.lightgrey)
 
                     # Span the cell across all columns to center the text
-                    num_cols = len(df.columns)
-                    if num_cols > 1:
-                        table_style.add('SPAN', (0, i + 2), (num_cols - 1, i + 2))
+                    if ncols > 1:
+                        table_style.add('SPAN', (0, i + 2), (ncols - 1, i + 2))
 
                     # Make the text bold and centered
                     bold_italic_text = f"<b><i>{first_cell_value}</i></b>"
-                    row[0] = Paragraph(bold_italic_text, ParagraphStyle(
-                        name='CenteredHeader',
-                        parent=styles['TableData'],
-                        alignment=1,  # Center alignment
-                        fontSize=8,
-                    ))
+                    row[0] = Paragraph(bold_italic_text, styles['CenteredHeader'])
 
                     # Remove other cells in this row since we're spanning
-                    for j in range(1, len(row)):
-                        row[j] = Paragraph("", styles['TableData'])
+                    row[1:] = empty_cells[1:len(row)]
 
             # After we locate the "Key Financial Ratios:" header, format its subsequent rows to 2 decimals (e.g., 3.30x)
             if ratio_header_idx is not None:
-                for k in range(ratio_header_idx + 1, len(table_rows)):
-                    r = table_rows[k]
+                td_style = styles['TableData']
+                for r in table_rows[ratio_header_idx + 1:]:
                     for j in range(1, len(r)):
                         cell = r[j]
-                        txt = cell.text if isinstance(cell, Paragraph) else str(cell)
+                        # Exact type test: every cell here is a Paragraph built above
+                        txt = cell.text if type(cell) is Paragraph else str(cell)
                         # Only adjust values that look like ratios with an 'x'
-                        if isinstance(txt, str) and 'x' in txt.lower():
+                        if 'x' in txt or 'X' in txt:
                             new_txt = format_ratio_to_two_decimals(txt)
                             if new_txt != txt:
-                                r[j] = Paragraph(new_txt, styles['TableData'])
+                                r[j] = Paragraph(new_txt, td_style)
 
             data = [header_row1, header_row2] + table_rows
 
@@ -465,7 +823,7 @@ def generate_pdf(data: dict = Body(...)):
                 first_col_width = available_width * 0.45
                 remaining_width = available_width * 0.55
                 if num_cols > 1:
-                    col_widths = [first_col_width] + [remaining_width / (num_cols - 1) for _ in range(num_cols - 1)]
+                    col_widths = [first_col_width] + [remaining_width / (num_cols - 1)] * (num_cols - 1)
                 else:
                     col_widths = [available_width]
             else:
@@ -474,25 +832,15 @@ def generate_pdf(data: dict = Body(...)):
         else:
             # If there aren't enough rows for a two-row header, use a single row header
             table_headers = [Paragraph(str(col), styles['TableHeader']) for col in df.columns.tolist()]
-            table_rows = []
-            for row in df.values.tolist():
-                table_rows.append([Paragraph(str(cell) if cell != '' else '', styles['TableData']) for cell in row])
+            td_style = styles['TableData']
+            empty_cell = Paragraph('', td_style)
+            table_rows = [
+                [Paragraph(str(cell), td_style) if cell != '' else empty_cell for cell in row]
+                for row in df.values.tolist()
+            ]
 
             # Define default table style for single-row header CSV case
-            table_style = TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#44546A')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-                ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 3),
-                ('TOPPADDING', (0, 0), (-1, 0), 3),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-                ('BOX', (0, 0), (-1, -1), 0.5, colors.black),
-                ('LINEBELOW', (0, 0), (-1, 0), 0.5, colors.black),
-                ('LEFTPADDING', (0, 0), (-1, -1), 2),
-                ('RIGHTPADDING', (0, 0), (-1, -1), 2),
-            ])
+            table_style = TableStyle(list(_SINGLE_HEADER_STYLE_CMDS))
 
             data = [table_headers] + table_rows
 
@@ -503,7 +851,7 @@ def generate_pdf(data: dict = Body(...)):
                 first_col_width = available_width * 0.3
                 remaining_width = available_width * 0.7
                 if num_cols > 1:
-                    col_widths = [first_col_width] + [remaining_width / (num_cols - 1) for _ in range(num_cols - 1)]
+                    col_widths = [first_col_width] + [remaining_width / (num_cols - 1)] * (num_cols - 1)
                 else:
                     col_widths = [available_width]
             else:
@@ -517,26 +865,12 @@ def generate_pdf(data: dict = Body(...)):
             table_rows.append([Paragraph(str(cell), styles['TableData']) for cell in row])
 
         # Initialize table_style BEFORE adding dynamic rules
-        table_style = TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#44546A')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            # First column left aligned for ALL rows
-            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-            # Other columns center aligned
-            ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 3),
-            ('TOPPADDING', (0, 0), (-1, 0), 3),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-            ('BOX', (0, 0), (-1, -1), 0.5, colors.black),
-            ('LINEBELOW', (0, 0), (-1, 0), 0.5, colors.black),
-            ('LEFTPADDING', (0, 0), (-1, -1), 2),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 2),
-        ])
+        table_style = TableStyle(list(_SINGLE_HEADER_STYLE_CMDS))
 
-        # Styling based on first column content
+        # Styling based on first column content (labels read once, not per row via df.iloc)
+        first_col = [str(x) for x in df.iloc[:, 0].tolist()] if len(df.columns) > 0 else [""] * len(table_rows)
         for i, row in enumerate(table_rows):
-            first_cell_value = str(df.iloc[i, 0]) if len(df.columns) > 0 else ""
+            first_cell_value = first_col[i]
             if any(keyword in first_cell_value for keyword in ["Total Debt", "Book Capitalization", "Market Capitalization"]):
                 # Add line above this row
                 table_style.add('LINEABOVE', (0, i + 1), (-1, i + 1), 0.5, colors.black)
@@ -555,7 +889,7 @@ def generate_pdf(data: dict = Body(...)):
         num_cols = len(df.columns)
         if num_cols > 0:
             if num_cols > 1:
-                col_widths = [available_width * 0.2] + [available_width * 0.8 / (num_cols - 1) for _ in range(num_cols - 1)]
+                col_widths = [available_width * 0.2] + [available_width * 0.8 / (num_cols - 1)] * (num_cols - 1)
             else:
                 col_widths = [available_width]
         else:
@@ -567,9 +901,11 @@ def generate_pdf(data: dict = Body(...)):
     elements.append(KeepTogether(table))
     elements.append(Spacer(1, 24))
 
-    # Add text from statement analysis
-    for line in analysis_text.split('\n'):
-        elements.append(Paragraph(line, styles['Normal']))
+    # Add text from statement analysis: one flowable per blank-line separated
+    # block (lines within a block joined by <br/>) rather than one per line
+    for block in _PARA_BREAK_RE.split(analysis_text):
+        if block.strip():
+            elements.append(Paragraph(block.replace('\n', '<br/>\n'), styles['Normal']))
 
     doc.build(elements, onFirstPage=draw_aqrr_header, onLaterPages=draw_aqrr_header)
     buffer.seek(0)
@@ -577,16 +913,146 @@ def generate_pdf(data: dict = Body(...)):
     headers = {"Content-Disposition": f"attachment; filename={company_name}_report.pdf"}
     return StreamingResponse(buffer, media_type='application/pdf', headers=headers)
 
+
+# AQRR data API endpoints fetched by build_pdf_bytes_from_ticker
+_PDF_API_ENDPOINTS = ('hfa', 'credit_table', 'cap-table', 'comp')
+
+
+# In-process cache of rendered PDFs, keyed by a digest of the report inputs
+_PDF_CACHE_MAX_ENTRIES = 32
+_PDF_CACHE = OrderedDict()
+_PDF_CACHE_LOCK = threading.Lock()
+
+
+def _pdf_cache_key(*parts) -> bytes:
+    """Digest of the report inputs plus today's date (period labels depend on it)."""
+    blob = json.dumps([*parts, datetime.now().strftime('%Y%m%d')], sort_keys=True, default=str)
+    return hashlib.blake2b(blob.encode('utf-8'), digest_size=16).digest()
+
+
+def _pdf_cache_get(key):
+    with _PDF_CACHE_LOCK:
+        pdf_bytes = _PDF_CACHE.get(key)
+        if pdf_bytes is not None:
+            _PDF_CACHE.move_to_end(key)
+        return pdf_bytes
+
+
+def _pdf_cache_put(key, pdf_bytes):
+    with _PDF_CACHE_LOCK:
+        _PDF_CACHE[key] = pdf_bytes
+        _PDF_CACHE.move_to_end(key)
+        while len(_PDF_CACHE) > _PDF_CACHE_MAX_ENTRIES:
+            _PDF_CACHE.popitem(last=False)
+
+
+# Data rows a splitting table must fit below its header rows before it may start on a page
+_TABLE_MIN_START_ROWS = 3
+
+
+def _table_start_break(table, avail_width, avail_height, lead=(), data_rows=_TABLE_MIN_START_ROWS):
+    """
+    CondPageBreak sized for the `lead` flowables (e.g. a section title) plus `table`'s
+    repeated header rows and first `data_rows` rows, so a table that splits across
+    pages never starts as headers alone at the foot of a page.
+    """
+    needed = 0
+    for flowable in lead:
+        needed += flowable.wrap(avail_width, avail_height)[1]
+        needed += flowable.getSpaceBefore() + flowable.getSpaceAfter()
+    table.wrap(avail_width, avail_height)
+    needed += sum(table._rowHeights[:table.repeatRows + data_rows])
+    return CondPageBreak(needed)
+
+
+def _write_pdf(pdf_bytes, output):
+    """Write finished PDF bytes (or a memoryview of them) to a file path or a writable binary stream."""
+    if isinstance(output, (str, os.PathLike)):
+        with open(output, 'wb') as f:
+            f.write(pdf_bytes)
+    else:
+        output.write(pdf_bytes)
+
+
+def _format_pct_array(values):
+    """Format a float array as '12.3%' / '(12.3%)' using numpy's C-level string ops."""
+    values = np.asarray(values, dtype=float)
+    neg = values < 0
+    body = np.char.mod('%.1f', np.where(neg, -values, values))
+    return np.where(neg, np.char.add(np.char.add('(', body), '%)'), np.char.add(body, '%'))
+
+
+def _sorted_by_year(cols, key):
+    """Sort period columns by their parsed year, keeping the input order if parsing fails."""
+    try:
+        return sorted(cols, key=key)
+    except Exception:
+        return cols
+
+
+# Keywords to detect ratio rows in HFA, compiled into one alternation so each
+# metric name is matched with a single regex search
+_RATIO_KEYWORDS = (
+    'EBITDA / Int',
+    'EBITDA / Interest',
+    'EBITDAR / Interest',
+    'EBITDAR / Interest + Rent',
+    'Total Debt / EBITDA',
+    'Total Debt / Book',
+    'Total Debt + Leases / EBITDA',
+    'Total Debt + Leases / Book',
+)
+_RATIO_RE = re.compile('|'.join(map(re.escape, _RATIO_KEYWORDS)))
+
+# Translation tables that strip accounting/unit decoration before float(),
+# e.g. "(1,234.5x)" -> "-1234.5". Ratio cells only drop 'x' and percentage
+# cells only drop '%', so a mismatched unit still fails conversion as before.
+_RATIO_TRANS = str.maketrans({'(': '-', ')': None, ',': None, 'x': None})
+_PCT_TRANS = str.maketrans({'(': '-', ')': None, ',': None, '%': None})
+_NUM_TRANS = str.maketrans({'(': '-', ')': None, ',': None, 'x': None, '%': None})
+# Accounting sign/thousands only (units kept), and thousands separators only
+_SIGN_TRANS = str.maketrans({'(': '-', ')': None, ',': None})
+_COMMA_TRANS = str.maketrans('', '', ',')
+
+# CAP key financial ratios shown as percentages rather than 'x' (normalized labels)
+_PCT_LABELS = frozenset({'total debt / book capital', 'total debt + leases / book capital'})
+_WS_RE = re.compile(r'\s+')
+
+# CAP summary rows rendered bold with a rule above
+_BOLD_CAP_ROWS = frozenset({'Total Debt', 'Book Capitalization', 'Market Capitalization'})
+
+# HFA rows that open a new section (rule above)
+_SECTION_LINE_METRICS = frozenset({
+    'Revenue', 'Gross Profit', 'Operating Expenses', 'Adjusted EBITDA',
+    'Interest Expense', 'Capital Expenditures', 'Free Cash Flow',
+    'Acq. / Disp.', 'Equity / Dividends', 'Change in Cash',
+    'Cash - End of Period', 'Total Debt', 'Book Equity',
+})
+# Key financial ratio rows that start a new group (rule above)
+_RATIO_LINE_METRICS = frozenset({'Total Debt / EBITDA', 'Total Debt / Book Capital'})
+
+# HFA rows rendered indented / bold
+_INDENT_METRICS = frozenset({'% YoY Growth', '% Margin', 'Other'})
+_BOLD_METRICS = frozenset({
+    'Revenue', 'Gross Profit', 'Adjusted EBITDA', 'Free Cash Flow',
+    'Total Debt', 'Book Equity', 'Change in Cash', 'Cash - End of Period',
+})
+
+
 def build_pdf_bytes_from_ticker(ticker: str,
                             hfa_dir: str = os.path.join('output', 'json', 'hfa_output'),
                             fsa_dir: str = os.path.join('output', 'json', 'financial_analysis'),
-                            prefetched_data: dict = None) -> bytes:
+                            prefetched_data: dict = None,
+                            output=None) -> bytes | None:
     """
     Build the PDF for a given ticker by calling the HFA API and using its rows:
     - HFA table data from: POST {BASE_URL}/api/v1/hfa with body {"ticker": TICKER}
       BASE_URL is taken from env APP_BASE_URL (default http://127.0.0.1:9259)
     - Financial Statement Analysis from: output/json/financial_analysis/{TICKER}_FSA.json
-    Returns raw PDF bytes.
+    Returns raw PDF bytes, or writes the PDF to ``output`` (a file path or writable
+    binary stream) and returns None.
+    Rendered PDFs are cached in-process by a digest of their inputs, so repeated
+    calls with unchanged data skip the ReportLab build.
     """
     if not ticker:
         raise ValueError("No ticker provided.")
@@ -604,20 +1070,21 @@ def build_pdf_bytes_from_ticker(ticker: str,
         # Call HFA API to get rows for the table
         api_base = os.getenv('APP_BASE_URL', 'http://127.0.0.1:9259')
         api_url = f"{api_base.rstrip('/')}/api/v1/hfa"
+        # The four API calls are independent and I/O-bound, so issue them together;
+        # shutdown(wait=False) lets an early HFA failure return without waiting on the rest
+        pool = ThreadPoolExecutor(max_workers=len(_PDF_API_ENDPOINTS))
         try:
-            resp = requests.post(api_url, json={"ticker": ticker}, timeout=300)
-        except requests.RequestException as e:
-            raise RuntimeError(f"Failed to call HFA API at {api_url}: {e}")
-        if resp.status_code != 200:
-            try:
-                err_detail = resp.json()
-            except Exception:
-                err_detail = resp.text
-            raise RuntimeError(f"HFA API returned {resp.status_code}: {err_detail}")
+            pending = {ep: pool.submit(cached_post_json, ep, ticker) for ep in _PDF_API_ENDPOINTS}
+        finally:
+            pool.shutdown(wait=False)
         try:
-            payload = resp.json()
-        except Exception as e:
+            status, payload = pending['hfa'].result()
+        except ValueError as e:
             raise RuntimeError(f"Invalid JSON from HFA API: {e}")
+        except requests.RequestException as e:
+            raise RuntimeError(f"Failed to call HFA API at {api_url}: {e}")
+        if status != 200:
+            raise RuntimeError(f"HFA API returned {status}: {payload}")
         hfa_rows = payload.get("rows")
         if not isinstance(hfa_rows, list) or not hfa_rows:
             raise RuntimeError("HFA API response missing 'rows' list with data")
@@ -626,11 +1093,9 @@ def build_pdf_bytes_from_ticker(ticker: str,
         # Fetch Credit Risk Metrics data (non-fatal)
         credit_data = None
         try:
-            credit_url = f"{api_base.rstrip('/')}/api/v1/credit_table"
-            credit_resp = requests.post(credit_url, json={"ticker": ticker}, timeout=300)
-            if credit_resp.status_code == 200:
+            status, credit_payload = pending['credit_table'].result()
+            if status == 200:
                 try:
-                    credit_payload = credit_resp.json()
                     if isinstance(credit_payload, dict):
                         credit_data = credit_payload.get("json_data")
                         # Fallback: parse raw JSON string if provided by API
@@ -662,11 +1127,9 @@ def build_pdf_bytes_from_ticker(ticker: str,
         cap_json = None
         comp_rows = None
         try:
-            cap_url = f"{api_base.rstrip('/')}/api/v1/cap-table"
-            cap_resp = requests.post(cap_url, json={"ticker": ticker}, timeout=300)
-            if cap_resp.status_code == 200:
+            status, cap_payload = pending['cap-table'].result()
+            if status == 200:
                 try:
-                    cap_payload = cap_resp.json()
                     if isinstance(cap_payload, dict):
                         cap_json = cap_payload.get("json_data")
                         # Fallback: parse raw JSON string if provided by API
@@ -693,11 +1156,9 @@ def build_pdf_bytes_from_ticker(ticker: str,
         except Exception:
             cap_json = None
         try:
-            comp_url = f"{api_base.rstrip('/')}/api/v1/comp"
-            comp_resp = requests.post(comp_url, json={"ticker": ticker}, timeout=300)
-            if comp_resp.status_code == 200:
+            status, comp_payload = pending['comp'].result()
+            if status == 200:
                 try:
-                    comp_payload = comp_resp.json()
                     if isinstance(comp_payload, dict):
                         comp_rows = comp_payload.get("rows")
                 except Exception:
@@ -713,68 +1174,77 @@ def build_pdf_bytes_from_ticker(ticker: str,
                 except Exception:
                     fsa_data = None
 
+    # Company details and the title are rendered too, so resolve them up front and
+    # key the cached PDF on them; otherwise a hit would outlive their own expiry
+    try:
+        details = _cached_exposure(ticker)
+    except Exception:
+        details = None  # the Company Details table is left out below
+    company_title = _cached_title(ticker)
+
+    # Reuse a previously rendered PDF when none of the inputs changed
+    try:
+        cache_key = _pdf_cache_key(ticker, hfa_rows, cap_json, comp_rows, fsa_data, credit_data,
+                                   details, company_title)
+    except Exception:
+        cache_key = None  # inputs not JSON-serializable; build without caching
+    cached = _pdf_cache_get(cache_key) if cache_key is not None else None
+    if cached is not None:
+        if output is None:
+            return cached
+        _write_pdf(cached, output)
+        return None
+
     # Convert HFA rows to DataFrame
     df = json_to_dataframe(hfa_rows)
-    # Clean NaNs for rendering
-    df = df.replace({np.nan: '-'})
-    df = df.replace({None: '-'})
-    df = df.replace({0: '-'})
+    # Clean NaN/None and zero values for rendering in a single masked pass
+    df = df.mask(df.isna() | df.eq(0), '-')
     
     # Format numbers per metric type.
     # IMPORTANT: Do NOT divide by 1000 for percentage or ratio rows; these are formatted later.
     percentage_metrics = {'% YoY Growth', '% Margin'}
-    # Keywords to detect ratio rows in HFA
-    ratio_keywords = [
-        'EBITDA / Int',
-        'EBITDA / Interest',
-        'EBITDAR / Interest',
-        'EBITDAR / Interest + Rent',
-        'Total Debt / EBITDA',
-        'Total Debt / Book',
-        'Total Debt + Leases / EBITDA',
-        'Total Debt + Leases / Book',
-    ]
     # Specific ratio metrics that should be displayed as percentages (not with 'x')
     percentage_ratio_metrics = {
         'Total Debt / Book Capital',
         'Total Debt + Leases / Book Capital',
     }
     if 'Metric' in df.columns:
-        for i, row in df.iterrows():
-            metric_name = str(row['Metric'])
-            for col in df.columns:
-                if col == 'Metric':
-                    continue
-                val = row[col]
-                if val == '':
-                    df.at[i, col] = ''
-                    continue
-                # Keep raw values for percentage and ratio rows (no /1000 scaling)
-                if (metric_name in percentage_metrics) or any(k in metric_name for k in ratio_keywords):
-                    df.at[i, col] = val
-                else:
-                    df.at[i, col] = format_number_for_display(val)
+        # Keep raw values for percentage and ratio rows (no /1000 scaling)
+        metric = df['Metric'].astype(str)
+        raw_mask = metric.isin(percentage_metrics) | metric.str.contains(_RATIO_RE, regex=True)
+        formatted_cols = {}
+        for col in df.columns:
+            if col == 'Metric':
+                continue
+            vals = df[col]
+            formatted = vals.map(lambda v: '' if v == '' else format_number_for_display(v))
+            formatted_cols[col] = vals.where(raw_mask, formatted)
+        # Write all formatted columns back in one bulk assignment
+        if formatted_cols:
+            df[list(formatted_cols)] = pd.DataFrame(formatted_cols, index=df.index)
     else:
         # Fallback if no Metric column exists
-        for col in df.columns:
-            df[col] = df[col].apply(lambda x: format_number_for_display(x) if x != '' else '')
+        df = df.map(lambda x: format_number_for_display(x) if x != '' else '')
             
     # Special formatting for percentage rows
-    for i, row in enumerate(df.values):
-        metric = str(row[0]) if row[0] != '' else ''
-        if metric in ['% YoY Growth', '% Margin'] or metric in percentage_ratio_metrics:
-            for j, val in enumerate(row):
-                if j > 0 and val not in ['', '-']:
-                    try:
-                        # Format as percentage with one decimal place (do not scale by 100; assume values already in percent units)
-                        num_val = float(val.replace('(', '-').replace(')', '').replace(',', '')) if isinstance(val, str) else float(val)
-                        if num_val < 0:
-                            df.iloc[i, j] = f'({abs(num_val):.1f}%)'
-                        else:
-                            df.iloc[i, j] = f'{num_val:.1f}%'
-                    except:
-                        # Keep as is if conversion fails
-                        pass
+    if not df.empty:
+        first_col = df.iloc[:, 0].astype(str)
+        pct_rows = first_col.isin(percentage_metrics | percentage_ratio_metrics).to_numpy()
+        value_cols = df.columns[1:]
+        if pct_rows.any() and len(value_cols):
+            # Parse only the percentage rows, as one flattened block
+            values = df[value_cols].to_numpy(dtype=object)
+            block = values[pct_rows]
+            cells = pd.Series(block.ravel())
+            # Format as percentage with one decimal place (do not scale by 100; assume values already in percent units)
+            num = pd.to_numeric(cells.astype(str).str.translate(_SIGN_TRANS), errors='coerce')
+            # Keep as is if conversion fails
+            fmt_mask = (~cells.isin(['', '-']) & num.notna()).to_numpy()
+            if fmt_mask.any():
+                flat = block.ravel()
+                flat[fmt_mask] = _format_pct_array(num.to_numpy()[fmt_mask])
+                values[pct_rows] = flat.reshape(block.shape)
+                df[value_cols] = pd.DataFrame(values, index=df.index, columns=value_cols)
     # Ensure 'Metric' is the first column if present
     if 'Metric' in df.columns:
         cols = df.columns.tolist()
@@ -782,31 +1252,28 @@ def build_pdf_bytes_from_ticker(ticker: str,
         df = df[['Metric'] + cols]
     # Reorder columns into: Metric | years (asc) | YTD years (asc) | LTM years (asc)
     # Also capture groups to construct a two-row header later
-    all_cols = df.columns.tolist()
-    year_cols = [c for c in all_cols if isinstance(c, str) and c.isdigit() and len(c) == 4]
-    try:
-        year_cols_sorted = sorted(year_cols, key=lambda x: int(x))
-    except Exception:
-        year_cols_sorted = year_cols
-    ytd_cols = [c for c in all_cols if isinstance(c, str) and c.startswith('YTD ')]
-    try:
-        ytd_cols_sorted = sorted(ytd_cols, key=lambda x: int(x.split()[1]))
-    except Exception:
-        ytd_cols_sorted = ytd_cols
-    ltm_cols = [c for c in all_cols if isinstance(c, str) and c.startswith('LTM ')]
-    try:
-        ltm_cols_sorted = sorted(ltm_cols, key=lambda x: int(x.split()[1]))
-    except Exception:
-        ltm_cols_sorted = ltm_cols
-    ordered_cols = ['Metric']
-    ordered_cols += [c for c in year_cols_sorted if c in all_cols]
-    ordered_cols += [c for c in ytd_cols_sorted if c in all_cols]
-    ordered_cols += [c for c in ltm_cols_sorted if c in all_cols]
-    # Only reorder if all expected columns present
-    if all(c in all_cols for c in ordered_cols) and len(ordered_cols) == len(all_cols):
-        df = df[ordered_cols]
-
-    # Generate the PDF in-memory
+    col_groups = {'year': [], 'ytd': [], 'ltm': [], 'other': []}
+    for c in df.columns.tolist():
+        if isinstance(c, str) and c.isdigit() and len(c) == 4:
+            col_groups['year'].append(c)
+        elif isinstance(c, str) and c.startswith('YTD '):
+            col_groups['ytd'].append(c)
+        elif isinstance(c, str) and c.startswith('LTM '):
+            col_groups['ltm'].append(c)
+        else:
+            col_groups['other'].append(c)
+    year_cols_sorted = _sorted_by_year(col_groups['year'], int)
+    ytd_cols_sorted = _sorted_by_year(col_groups['ytd'], lambda x: int(x.split()[1]))
+    ltm_cols_sorted = _sorted_by_year(col_groups['ltm'], lambda x: int(x.split()[1]))
+    # Only reorder if all expected columns present; keep the groups in the
+    # frame's final column order for the HFA header
+    if col_groups['other'] == ['Metric']:
+        df = df[['Metric'] + year_cols_sorted + ytd_cols_sorted + ltm_cols_sorted]
+        year_cols, ytd_cols, ltm_cols = year_cols_sorted, ytd_cols_sorted, ltm_cols_sorted
+    else:
+        year_cols, ytd_cols, ltm_cols = col_groups['year'], col_groups['ytd'], col_groups['ltm']
+
+    # Generate the PDF in-memory; the bytes are cached before being handed out
     buffer = io.BytesIO()
 
     doc = SimpleDocTemplate(
@@ -818,45 +1285,23 @@ def build_pdf_bytes_from_ticker(ticker: str,
         bottomMargin=0.75 * inch
     )
     elements = []
-    styles = getSampleStyleSheet()
+    styles = _pdf_styles()
 
-    # Define paragraph styles for table data
-    styles.add(ParagraphStyle(
-        name='TableDataFirstCol',
-        fontSize=7,
-        leading=8,
-        alignment=0  # Left alignment for first column
-    ))
+    # Bind the table styles once; the row-building loops below use them per cell
+    td_style = styles['TableData']
+    td_first_style = styles['TableDataFirstCol']
+    th_style = styles['TableHeader']
+    th_first_style = styles['TableHeaderFirstCol']
 
-    styles.add(ParagraphStyle(
-        name='TableData',
-        fontSize=7,
-        leading=8,
-        alignment=1  # Center alignment for other columns
-    ))
-
-    # Define styles for table headers
-    styles.add(ParagraphStyle(
-        name='TableHeaderFirstCol',
-        fontSize=8,
-        leading=9,
-        alignment=0,  # Left alignment for first column header
-        fontName='Helvetica-Bold',
-        textColor=colors.whitesmoke
-    ))
-
-    styles.add(ParagraphStyle(
-        name='TableHeader',
-        fontSize=8,
-        leading=9,
-        alignment=1,  # Center alignment for other headers
-        fontName='Helvetica-Bold',
-        textColor=colors.whitesmoke
-    ))
+    # Shared placeholders for empty cells; Table re-wraps each cell before drawing,
+    # so a single read-only instance can back every empty slot
+    empty_para = Paragraph("", td_style)
+    empty_header = Paragraph("", th_style)
 
     # --- Company Details table (above CAP table) ---
     try:
-        details = build_exposure_table_for_ticker(ticker)
+        if details is None:
+            raise LookupError("company details unavailable")
         table_map = details.get("table", {}) if isinstance(details, dict) else {}
 
         def _val(key: str) -> str:
@@ -901,12 +1346,12 @@ def build_pdf_bytes_from_ticker(ticker: str,
             rkey = right_keys[i] if i < len(right_keys) else ""
 
             row = [
-                Paragraph(f"{lkey + ':' if lkey else ''}", styles['TableHeaderFirstCol']),
-                Paragraph(_val(lkey) if lkey else "", styles['TableDataFirstCol']),
-                Paragraph(f"{mkey + ':' if mkey else ''}", styles['TableHeaderFirstCol']),
-                Paragraph(_val(mkey) if mkey else "", styles['TableDataFirstCol']),
-                Paragraph(f"{rkey + ':' if rkey else ''}", styles['TableHeaderFirstCol']),
-                Paragraph(_val(rkey) if rkey else "", styles['TableDataFirstCol']),
+                Paragraph(f"{lkey + ':' if lkey else ''}", th_first_style),
+                Paragraph(_val(lkey) if lkey else "", td_first_style),
+                Paragraph(f"{mkey + ':' if mkey else ''}", th_first_style),
+                Paragraph(_val(mkey) if mkey else "", td_first_style),
+                Paragraph(f"{rkey + ':' if rkey else ''}", th_first_style),
+                Paragraph(_val(rkey) if rkey else "", td_first_style),
             ]
             comp_table_rows.append(row)
 
@@ -918,20 +1363,9 @@ def build_pdf_bytes_from_ticker(ticker: str,
         comp_table = Table(comp_table_rows, colWidths=comp_col_widths)
         comp_style = TableStyle([
             ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            # Blue background for label columns (0,2,4) across all rows
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#44546A')),
-            ('BACKGROUND', (2, 0), (2, -1), colors.HexColor('#44546A')),
-            ('BACKGROUND', (4, 0), (4, -1), colors.HexColor('#44546A')),
-            ('TEXTCOLOR', (0, 0), (0, -1), colors.whitesmoke),
-            ('TEXTCOLOR', (2, 0), (2, -1), colors.whitesmoke),
-            ('TEXTCOLOR', (4, 0), (4, -1), colors.whitesmoke),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTNAME', (2, 0), (2, -1), 'Helvetica-Bold'),
-            ('FONTNAME', (4, 0), (4, -1), 'Helvetica-Bold'),
-            # White background for value columns
-            ('BACKGROUND', (1, 0), (1, -1), colors.white),
-            ('BACKGROUND', (3, 0), (3, -1), colors.white),
-            ('BACKGROUND', (5, 0), (5, -1), colors.white),
+            # Alternating blue label / white value columns in a single command. Label
+            # text colour and weight come from the TableHeaderFirstCol paragraph style.
+            ('COLBACKGROUNDS', (0, 0), (-1, -1), [_HEADER_BG, colors.white]),
             # Borders and grid
             ('BOX', (0, 0), (-1, -1), 0.5, colors.black),
             ('GRID', (0, 0), (-1, -1), 0.25, colors.black),
@@ -949,25 +1383,24 @@ def build_pdf_bytes_from_ticker(ticker: str,
         pass
 
     # Build CAP table (above HFA) if available
-    company_title = get_company_title_from_ticker(ticker)
     # Build Key Credit Merits / Key Credit Risks table (to appear ABOVE the CAP table)
     try:
         merits = []
         risks = []
 
-        def _find_key(d, names):
-            """Find a value in dict d by any lowercase key name in names, allowing partial contains."""
-            if not isinstance(d, dict):
-                return None
-            lower_map = {str(k).lower(): k for k in d.keys()}
+        def _lower_map(d):
+            """Map lowercased keys of dict d to their values, built once per dict."""
+            return {str(k).lower(): v for k, v in d.items()} if isinstance(d, dict) else {}
+
+        def _find_key(lower_map, names):
+            """Find a value in a lowercased key map by any key name in names, allowing partial contains."""
             for n in names:
                 if n in lower_map:
-                    return d[lower_map[n]]
-            for k in d.keys():
-                kl = str(k).lower()
+                    return lower_map[n]
+            for kl, v in lower_map.items():
                 for n in names:
                     if n in kl:
-                        return d[k]
+                        return v
             return None
 
         def _to_list(x):
@@ -988,9 +1421,10 @@ def build_pdf_bytes_from_ticker(ticker: str,
 
         src = credit_data
         if isinstance(src, dict) and src:
-            root = _find_key(src, ["credit_risk_metrics"]) or src
-            merits_raw = _find_key(root, ["key_credit_metrics", "key_credit_merits"])
-            risks_raw = _find_key(root, ["key_credit_risks", "key_risks"])
+            root = _find_key(_lower_map(src), ["credit_risk_metrics"]) or src
+            root_map = _lower_map(root)
+            merits_raw = _find_key(root_map, ["key_credit_metrics", "key_credit_merits"])
+            risks_raw = _find_key(root_map, ["key_credit_risks", "key_risks"])
             merits = _to_list(merits_raw)
             risks = _to_list(risks_raw)
 
@@ -998,8 +1432,8 @@ def build_pdf_bytes_from_ticker(ticker: str,
             max_rows = max(len(merits), len(risks))
             # Header row
             header_row = [
-                Paragraph("Key Credit Merits", styles['TableHeaderFirstCol']),
-                Paragraph("Key Credit Risks", styles['TableHeaderFirstCol'])
+                Paragraph("Key Credit Merits", th_first_style),
+                Paragraph("Key Credit Risks", th_first_style)
             ]
             # Data rows
             data_rows = []
@@ -1007,8 +1441,8 @@ def build_pdf_bytes_from_ticker(ticker: str,
                 ltxt = merits[i] if i < len(merits) else ""
                 rtxt = risks[i] if i < len(risks) else ""
                 data_rows.append([
-                    Paragraph(str(ltxt), styles['TableDataFirstCol']),
-                    Paragraph(str(rtxt), styles['TableDataFirstCol'])
+                    Paragraph(str(ltxt), td_first_style),
+                    Paragraph(str(rtxt), td_first_style)
                 ])
 
             credit_table_data = [header_row] + data_rows
@@ -1051,30 +1485,30 @@ def build_pdf_bytes_from_ticker(ticker: str,
         # Prepare two-row header then a unified table with 6 columns
         cap_columns = ["Item", "Amount", "PPC Holdings", "Coupon", "Secured", "Maturity"]
 
-        header_row1_cap = [Paragraph(f"{company_title} - Capitalization Table", styles['TableHeaderFirstCol'])]
-        header_row1_cap += [Paragraph("", styles['TableHeader']) for _ in range(len(cap_columns) - 1)]
+        header_row1_cap = [Paragraph(f"{company_title} - Capitalization Table", th_first_style)]
+        header_row1_cap += [empty_header] * (len(cap_columns) - 1)
 
         header_row2_cap = []
         for i, col in enumerate(cap_columns):
-            style = styles['TableHeaderFirstCol'] if i == 0 else styles['TableHeader']
+            style = th_first_style if i == 0 else th_style
             header_row2_cap.append(Paragraph(col, style))
 
         cap_table_rows = []
         # As-of line (spans all columns)
         as_of = cap_json.get('as_of') or ""
         asof_text = f"As of {as_of}" if as_of else ""
-        asof_row = [Paragraph(asof_text, styles['TableDataFirstCol'])] + [Paragraph("", styles['TableData']) for _ in range(len(cap_columns) - 1)]
+        asof_row = [asof_text] + [''] * (len(cap_columns) - 1)
         cap_table_rows.append(asof_row)
 
         # Cash and Equivalents
         cae = cap_json.get('cash_and_equivalents')
         cap_table_rows.append([
-            Paragraph("Cash and Equivalents", styles['TableDataFirstCol']),
-            Paragraph(_fmt_num(cae), styles['TableData']),
-            Paragraph("", styles['TableData']),
-            Paragraph("", styles['TableData']),
-            Paragraph("", styles['TableData']),
-            Paragraph("", styles['TableData']),
+            Paragraph("Cash and Equivalents", td_first_style),
+            _fmt_num(cae),
+            '',
+            '',
+            '',
+            '',
         ])
 
         # Debt breakdown
@@ -1083,25 +1517,29 @@ def build_pdf_bytes_from_ticker(ticker: str,
             if not isinstance(d, dict):
                 continue
             cap_table_rows.append([
-                Paragraph(str(d.get('type', '')), styles['TableDataFirstCol']),
-                Paragraph(_fmt_num(d.get('amount')), styles['TableData']),
-                Paragraph(str(d.get('ppc_holdings', '')), styles['TableData']),
-                Paragraph(str(d.get('coupon', '')), styles['TableData']),
-                Paragraph(str(d.get('secured', '')), styles['TableData']),
-                Paragraph(str(d.get('maturity', '')), styles['TableData']),
+                Paragraph(str(d.get('type', '')), td_first_style),
+                _fmt_num(d.get('amount')),
+                str(d.get('ppc_holdings', '')),
+                str(d.get('coupon', '')),
+                str(d.get('secured', '')),
+                str(d.get('maturity', '')),
             ])
 
         # Totals and other summary items
         def _append_summary_row(label_key: str, display: str | None = None):
             label = display or label_key.replace('_', ' ').title()
             val = cap_json.get(label_key)
+            if label in _BOLD_CAP_ROWS:
+                # Totals rows are plain strings; the styling pass below bolds them via FONTNAME
+                cap_table_rows.append([label, _fmt_num(val), '', '', '', ''])
+                return
             cap_table_rows.append([
-                Paragraph(label, styles['TableDataFirstCol']),
-                Paragraph(_fmt_num(val), styles['TableData']),
-                Paragraph("", styles['TableData']),
-                Paragraph("", styles['TableData']),
-                Paragraph("", styles['TableData']),
-                Paragraph("", styles['TableData']),
+                Paragraph(label, td_first_style),
+                _fmt_num(val),
+                '',
+                '',
+                '',
+                '',
             ])
 
         # Add important totals in a specific order
@@ -1121,29 +1559,21 @@ def build_pdf_bytes_from_ticker(ticker: str,
         kfr = cap_json.get('key_financial_ratios') or {}
         if isinstance(kfr, dict) and kfr:
             cap_table_rows.append([
-                Paragraph("Key Financial Ratios:", ParagraphStyle(
-                    name='CenteredHeaderCap', parent=styles['TableData'], alignment=1, fontSize=8
-                )),
-                Paragraph("", styles['TableData']),
-                Paragraph("", styles['TableData']),
-                Paragraph("", styles['TableData']),
-                Paragraph("", styles['TableData']),
-                Paragraph("", styles['TableData']),
+                Paragraph("Key Financial Ratios:", styles['CenteredHeaderCap']),
+                '',
+                '',
+                '',
+                '',
+                '',
             ])
             for k, v in kfr.items():
                 label = k.replace('_', ' ').title() if isinstance(k, str) else str(k)
                 # For a few metrics, show percentage instead of 'x'
-                def _norm(s: str) -> str:
-                    return re.sub(r"\s+", " ", str(s).strip().lower())
-                pct_labels = {
-                    'total debt / book capital',
-                    'total debt + leases / book capital',
-                }
-                is_pct_metric = _norm(label) in pct_labels
+                is_pct_metric = _WS_RE.sub(' ', str(label).strip().lower()) in _PCT_LABELS
                 display_v = v
                 try:
                     if v is not None and str(v).strip() not in ('', '-'):
-                        fv = float(str(v).replace('(', '-').replace(')', '').replace(',', '').replace('x', '').replace('%', ''))
+                        fv = float(str(v).translate(_NUM_TRANS))
                         if is_pct_metric:
                             display_v = f"({abs(fv):.1f}%)" if fv < 0 else f"{fv:.1f}%"
                         else:
@@ -1151,12 +1581,12 @@ def build_pdf_bytes_from_ticker(ticker: str,
                 except Exception:
                     display_v = v
                 cap_table_rows.append([
-                    Paragraph(label, styles['TableDataFirstCol']),
-                    Paragraph(str(display_v), styles['TableData']),
-                    Paragraph("", styles['TableData']),
-                    Paragraph("", styles['TableData']),
-                    Paragraph("", styles['TableData']),
-                    Paragraph("", styles['TableData']),
+                    Paragraph(label, td_first_style),
+                    str(display_v),
+                    '',
+                    '',
+                    '',
+                    '',
                 ])
 
         data_cap = [header_row1_cap, header_row2_cap] + cap_table_rows
@@ -1165,9 +1595,9 @@ def build_pdf_bytes_from_ticker(ticker: str,
         first_col_w_cap = available_width_cap * 0.35
         rem_w_cap = available_width_cap - first_col_w_cap
         per_w = rem_w_cap / (len(cap_columns) - 1) if len(cap_columns) > 1 else available_width_cap
-        col_widths_cap = [first_col_w_cap] + [per_w for _ in range(len(cap_columns) - 1)]
+        col_widths_cap = [first_col_w_cap] + [per_w] * (len(cap_columns) - 1)
 
-        cap_style = TableStyle([
+        cap_cmds = [
             ('SPAN', (0, 0), (-1, 0)),
             ('BACKGROUND', (0, 0), (-1, 1), colors.HexColor('#44546A')),
             ('TEXTCOLOR', (0, 0), (-1, 1), colors.whitesmoke),
@@ -1181,7 +1611,10 @@ def build_pdf_bytes_from_ticker(ticker: str,
             ('LINEBELOW', (0, 1), (-1, 1), 0.5, colors.black),
             ('LEFTPADDING', (0, 0), (-1, -1), 2),
             ('RIGHTPADDING', (0, 0), (-1, -1), 2),
-        ])
+            # Font for plain-string data cells (matches the TableData paragraph style)
+            ('FONTSIZE', (0, 2), (-1, -1), 7),
+            ('LEADING', (0, 2), (-1, -1), 8),
+        ]
 
         # Add dynamic styling for notable rows and the ratios header
         base_row = 2  # account for two header rows
@@ -1189,36 +1622,29 @@ def build_pdf_bytes_from_ticker(ticker: str,
             abs_row = base_row + i
             first_val = ''
             try:
-                first_val = row[0].text
+                first_val = row[0] if type(row[0]) is str else row[0].text
             except Exception:
                 first_val = ''
-            if first_val in ("Total Debt", "Book Capitalization", "Market Capitalization"):
-                cap_style.add('LINEABOVE', (0, abs_row), (-1, abs_row), 0.5, colors.black)
-                # Bold the entire row
-                for j in range(len(row)):
-                    try:
-                        cell_text = row[j].text
-                        row[j] = Paragraph(f"<b>{cell_text}</b>", styles['TableData'])
-                    except Exception:
-                        pass
+            if first_val in _BOLD_CAP_ROWS:
+                cap_cmds.extend([
+                    ('LINEABOVE', (0, abs_row), (-1, abs_row), 0.5, colors.black),
+                    ('FONTNAME', (0, abs_row), (-1, abs_row), 'Helvetica-Bold'),
+                ])
             elif first_val.strip().lower().startswith("key financial ratios"):
-                cap_style.add('SPAN', (0, abs_row), (-1, abs_row))
-                cap_style.add('BACKGROUND', (0, abs_row), (-1, abs_row), colors.lightgrey)
-                cap_style.add('LINEABOVE', (0, abs_row), (-1, abs_row), 0.5, colors.black)
-                cap_style.add('LINEBELOW', (0, abs_row), (-1, abs_row), 0.5, colors.black)
+                cap_cmds.extend([
+                    ('SPAN', (0, abs_row), (-1, abs_row)),
+                    ('BACKGROUND', (0, abs_row), (-1, abs_row), colors.lightgrey),
+                    ('LINEABOVE', (0, abs_row), (-1, abs_row), 0.5, colors.black),
+                    ('LINEBELOW', (0, abs_row), (-1, abs_row), 0.5, colors.black),
+                ])
 
-        cap_table = Table(data_cap, colWidths=col_widths_cap)
-        cap_table.setStyle(cap_style)
+        # LongTable: cheaper layout/splitting for tall tables; keep both header rows on page breaks
+        cap_table = LongTable(data_cap, colWidths=col_widths_cap, repeatRows=2)
+        cap_table.setStyle(TableStyle(cap_cmds))
         elements.append(KeepTogether(cap_table))
         elements.append(Spacer(1, 24))
 
     # Build table from HFA DataFrame with custom two-row header
-    columns = df.columns.tolist()
-    # Determine groups again from ordered columns
-    year_cols = [c for c in columns if isinstance(c, str) and c.isdigit() and len(c) == 4]
-    ytd_cols = [c for c in columns if isinstance(c, str) and c.startswith('YTD ')]
-    ltm_cols = [c for c in columns if isinstance(c, str) and c.startswith('LTM ')]
-
     years_count = len(year_cols)
     ytd_count = len(ytd_cols)
     ltm_count = len(ltm_cols)
@@ -1226,119 +1652,37 @@ def build_pdf_bytes_from_ticker(ticker: str,
     left_top = f"{company_title} - Historical Financial Analysis"
     fye_str = "03/31"  # Default fiscal year end if unknown
 
-    # Row 1 header
-    header_row1 = []
-    header_row1.append(Paragraph(left_top, styles['TableHeaderFirstCol']))
-    # Fill placeholders for remaining columns
-    for _ in range(years_count + ytd_count + ltm_count):
-        header_row1.append(Paragraph("", styles['TableHeader']))
-
-    # Place group titles
+    # Row 1 header: each group title followed by placeholders for the rest of its span
+    header_row1 = [Paragraph(left_top, th_first_style)]
     if years_count > 0:
-        header_row1[1] = Paragraph("Fiscal Year Ended", styles['TableHeader'])
+        header_row1 += [Paragraph("Fiscal Year Ended", th_style)] + [empty_header] * (years_count - 1)
     if ytd_count > 0:
-        header_row1[1 + years_count] = Paragraph("YTD", styles['TableHeader'])
+        header_row1 += [Paragraph("YTD", th_style)] + [empty_header] * (ytd_count - 1)
     if ltm_count > 0:
-        header_row1[1 + years_count + ytd_count] = Paragraph("LTM", styles['TableHeader'])
+        header_row1 += [Paragraph("LTM", th_style)] + [empty_header] * (ltm_count - 1)
 
     # Row 2 header
     header_row2 = []
-    header_row2.append(Paragraph(f"<i>(FYE {fye_str})</i>", styles['TableHeaderFirstCol']))
+    header_row2.append(Paragraph(f"<i>(FYE {fye_str})</i>", th_first_style))
     # Years
     for y in year_cols:
-        header_row2.append(Paragraph(str(y), styles['TableHeader']))
+        header_row2.append(Paragraph(str(y), th_style))
     # YTD dates
     for ytd in ytd_cols:
         try:
             yr = int(str(ytd).split()[1])
-            header_row2.append(Paragraph(quarter_end_label_for_year(yr), styles['TableHeader']))
+            header_row2.append(Paragraph(quarter_end_label_for_year(yr), th_style))
         except Exception:
-            header_row2.append(Paragraph(str(ytd), styles['TableHeader']))
+            header_row2.append(Paragraph(str(ytd), th_style))
     # LTM dates
     for ltm in ltm_cols:
         try:
             yr = int(str(ltm).split()[1])
-            header_row2.append(Paragraph(quarter_end_label_for_year(yr), styles['TableHeader']))
+            header_row2.append(Paragraph(quarter_end_label_for_year(yr), th_style))
         except Exception:
-            header_row2.append(Paragraph(str(ltm), styles['TableHeader']))
-
-    # Data rows
-    table_rows = []
-    for i, row in enumerate(df.values.tolist()):
-        formatted_row = []
-        # Get the metric name (first column)
-        metric_name = str(row[0]) if row[0] != '' else ''
-        
-        # Determine if this row should be indented
-        indent_metrics = ['% YoY Growth', '% Margin', 'Other']
-        needs_indent = any(metric_name == m for m in indent_metrics)
-        
-        # Determine if this row should be bold
-        bold_metrics = ['Revenue', 'Gross Profit', 'Adjusted EBITDA', 'Free Cash Flow', 
-                       'Total Debt', 'Book Equity', 'Change in Cash', 'Cash - End of Period']
-        needs_bold = any(metric_name == m for m in bold_metrics)
-        # Determine if this row is a ratio row requiring x-formatting
-        is_ratio_row = any(k in metric_name for k in ratio_keywords)
-        # But certain ratio metrics should be rendered as percentages instead of 'x'
-        is_ratio_x_row = is_ratio_row and (metric_name not in percentage_ratio_metrics)
-        
-        # Format first column with indentation if needed
-        if needs_indent:
-            first_cell = f"&nbsp;&nbsp;&nbsp;{metric_name}"
-        else:
-            first_cell = metric_name
-            
-        # Apply bold formatting if needed
-        if needs_bold:
-            first_cell = f"<b>{first_cell}</b>"
-            formatted_row.append(Paragraph(first_cell, styles['TableDataFirstCol']))
-            # Make all cells in this row bold
-            for j, cell in enumerate(row[1:], 1):
-                cell_text = str(cell) if cell != '' else ''
-                # Apply formatting for ratio rows
-                if cell_text not in ['', '-']:
-                    if is_ratio_x_row:
-                        # Two decimals + 'x'
-                        try:
-                            v = float(str(cell_text).replace('(', '-').replace(')', '').replace(',', '').replace('x', ''))
-                            cell_text = f"({abs(v):.2f}x)" if v < 0 else f"{v:.2f}x"
-                        except Exception:
-                            pass
-                    elif metric_name in percentage_ratio_metrics:
-                        # Show as percentage with one decimal place
-                        try:
-                            v = float(str(cell_text).replace('(', '-').replace(')', '').replace(',', '').replace('%', ''))
-                            cell_text = f"({abs(v):.1f}%)" if v < 0 else f"{v:.1f}%"
-                        except Exception:
-                            pass
-                if cell_text:
-                    formatted_row.append(Paragraph(f"<b>{cell_text}</b>", styles['TableData']))
-                else:
-                    formatted_row.append(Paragraph('', styles['TableData']))
-        else:
-            # Regular formatting
-            formatted_row.append(Paragraph(first_cell, styles['TableDataFirstCol']))
-            for j, cell in enumerate(row[1:], 1):
-                cell_text = str(cell) if cell != '' else ''
-                # Apply formatting for ratio rows
-                if cell_text not in ['', '-']:
-                    if is_ratio_x_row:
-                        try:
-                            v = float(str(cell_text).replace('(', '-').replace(')', '').replace(',', '').replace('x', ''))
-                            cell_text = f"({abs(v):.2f}x)" if v < 0 else f"{v:.2f}x"
-                        except Exception:
-                            pass
-                    elif metric_name in percentage_ratio_metrics:
-                        try:
-                            v = float(str(cell_text).replace('(', '-').replace(')', '').replace(',', '').replace('%', ''))
-                            cell_text = f"({abs(v):.1f}%)" if v < 0 else f"{v:.1f}%"
-                        except Exception:
-                            pass
-                formatted_row.append(Paragraph(cell_text, styles['TableData']))
-                
-        table_rows.append(formatted_row)
+            header_row2.append(Paragraph(str(ltm), th_style))
 
-    table_style = TableStyle([
+    table_cmds = [
         # Blue background over first two header rows
         ('BACKGROUND', (0, 0), (-1, 1), colors.HexColor('#44546A')),
         ('TEXTCOLOR', (0, 0), (-1, 1), colors.whitesmoke),
@@ -1358,145 +1702,129 @@ def build_pdf_bytes_from_ticker(ticker: str,
         # Padding
         ('LEFTPADDING', (0, 0), (-1, -1), 2),
         ('RIGHTPADDING', (0, 0), (-1, -1), 2),
-    ])
+        # Font for plain-string data cells (matches the TableData paragraph style)
+        ('FONTSIZE', (0, 2), (-1, -1), 7),
+        ('LEADING', (0, 2), (-1, -1), 8),
+    ]
 
     # Add spans for groupings
     # Years span across columns 1..years_count
     if years_count > 0:
-        table_style.add('SPAN', (1, 0), (years_count, 0))
+        table_cmds.append(('SPAN', (1, 0), (years_count, 0)))
     # YTD span across next ytd_count
     if ytd_count > 0:
         ytd_start = 1 + years_count
         ytd_end = ytd_start + ytd_count - 1
-        table_style.add('SPAN', (ytd_start, 0), (ytd_end, 0))
+        table_cmds.append(('SPAN', (ytd_start, 0), (ytd_end, 0)))
     # LTM span across next ltm_count (likely 1)
     if ltm_count > 0:
         ltm_start = 1 + years_count + ytd_count
         ltm_end = ltm_start + ltm_count - 1
-        table_style.add('SPAN', (ltm_start, 0), (ltm_end, 0))
+        table_cmds.append(('SPAN', (ltm_start, 0), (ltm_end, 0)))
 
-    # Add horizontal lines and special formatting
-    for i, row in enumerate(table_rows):
-        if i < len(df):
-            first_cell_value = str(df.iloc[i, 0]) if len(df.columns) > 0 else ""
+    # Data rows, built in their final order: the Key Financial Ratios banner is
+    # appended ahead of the first ratio row, so each row's table position is
+    # simply len(table_rows) + 2 (two header rows) at append time
+    n_cols = len(df.columns)
+    table_rows = []
+    for metric_value, *cells in df.itertuples(index=False, name=None):
+        # Get the metric name (first column)
+        metric_name = str(metric_value) if metric_value != '' else ''
+        
+        # Determine if this row should be indented
+        needs_indent = metric_name in _INDENT_METRICS
+        
+        # Determine if this row should be bold
+        needs_bold = metric_name in _BOLD_METRICS
+        # Determine if this row is a ratio row requiring x-formatting
+        is_ratio_row = bool(_RATIO_RE.search(metric_name))
+        # But certain ratio metrics should be rendered as percentages instead of 'x'
+        is_ratio_x_row = is_ratio_row and (metric_name not in percentage_ratio_metrics)
+        
+        # Format first column with indentation if needed
+        if needs_indent:
+            first_cell = f"&nbsp;&nbsp;&nbsp;{metric_name}"
+        else:
+            first_cell = metric_name
             
-            # Add horizontal lines above specific rows
-            if first_cell_value in ["Revenue", "Gross Profit", "Operating Expenses", "Adjusted EBITDA", 
-                                   "Interest Expense", "Capital Expenditures", "Free Cash Flow", 
-                                   "Acq. / Disp.", "Equity / Dividends", "Change in Cash", 
-                                   "Cash - End of Period", "Total Debt", "Book Equity"]:
-                table_style.add('LINEABOVE', (0, i + 2), (-1, i + 2), 0.5, colors.black)
-                
-            # Add Key Financial Ratios section
-            if first_cell_value == "EBITDA / Int. Exp.":
-                # Insert a Key Financial Ratios header row before this row
-                kfr_row = [Paragraph("<b><i>Key Financial Ratios:</i></b>", ParagraphStyle(
-                    name='CenteredHeader',
-                    parent=styles['TableData'],
-                    alignment=1,  # Center alignment
-                    fontSize=8,
-                ))]
-                
-                # Add empty cells for the rest of the columns
-                for _ in range(len(df.columns) - 1):
-                    kfr_row.append(Paragraph("", styles['TableData']))
-                    
-                # Insert the row at the current position
-                table_rows.insert(i, kfr_row)
-                
-                # Add styling for the Key Financial Ratios row
-                table_style.add('SPAN', (0, i + 2), (-1, i + 2))
-                table_style.add('BACKGROUND', (0, i + 2), (-1, i + 2), colors.lightgrey)
-                table_style.add('LINEABOVE', (0, i + 2), (-1, i + 2), 0.5, colors.black)
-                table_style.add('LINEBELOW', (0, i + 2), (-1, i + 2), 0.5, colors.black)
-                
-                # Format all financial ratio rows to have x.x format
-                for j in range(len(df)):
-                    metric = str(df.iloc[j, 0]) if j < len(df) else ""
-                    if any(ratio in metric for ratio in [
-                        "EBITDA / Int",
-                        "EBITDA / Interest",
-                        "EBITDAR / Interest",
-                        "EBITDAR / Interest + Rent",
-                        "Total Debt / EBITDA",
-                        "Total Debt + Leases / EBITDA",
-                        "Total Debt / Book",
-                        "Total Debt + Leases / Book",
-                    ]):
-                        # Format each column value as a ratio with x.x format
-                        for col in range(1, len(df.columns)):
-                            # Adjust row position in table_rows (add 2 for header rows, add 1 more if after inserted KFR row)
-                            row_pos = j + 2 + (1 if j >= i else 0)
-                            if row_pos < len(table_rows):
-                                try:
-                                    cell = table_rows[row_pos][col]
-                                    if hasattr(cell, 'text') and cell.text and cell.text != '-':
-                                        # Try to convert to float and format as x.xx
-                                        val = float(cell.text.replace('(', '-').replace(')', '').replace(',', '').replace('x', ''))
-                                        if val < 0:
-                                            formatted = f"({abs(val):.2f}x)"
-                                        else:
-                                            formatted = f"{val:.2f}x"
-                                        table_rows[row_pos][col] = Paragraph(formatted, styles['TableData'])
-                                except Exception:
-                                    pass  # Skip if conversion fails
-                
-                # Add horizontal lines above specific ratio rows
-                for j in range(len(df)):
-                    metric = str(df.iloc[j, 0]) if j < len(df) else ""
-                    if metric in ["Total Debt / EBITDA", "Total Debt / Book Capital"]:
-                        # Adjust row position (add 2 for header rows, add 1 more if after inserted KFR row)
-                        row_pos = j + 2 + (1 if j >= i else 0)
-                        table_style.add('LINEABOVE', (0, row_pos), (-1, row_pos), 0.5, colors.black)
+        # Format value cells; ratio rows get two decimals + 'x', percentage ratios one decimal + '%'
+        cell_texts = []
+        for cell in cells:
+            cell_text = str(cell) if cell != '' else ''
+            if cell_text not in ['', '-']:
+                if is_ratio_x_row:
+                    try:
+                        v = float(cell_text.translate(_RATIO_TRANS))
+                        cell_text = f"({abs(v):.2f}x)" if v < 0 else f"{v:.2f}x"
+                    except Exception:
+                        pass
+                elif metric_name in percentage_ratio_metrics:
+                    try:
+                        v = float(cell_text.translate(_PCT_TRANS))
+                        cell_text = f"({abs(v):.1f}%)" if v < 0 else f"{v:.1f}%"
+                    except Exception:
+                        pass
+            cell_texts.append(cell_text)
+
+        # Key Financial Ratios banner row before the first ratio row
+        if metric_name == "EBITDA / Int. Exp.":
+            kfr_pos = len(table_rows) + 2
+            table_rows.append(
+                [Paragraph("<b><i>Key Financial Ratios:</i></b>", styles['CenteredHeader'])]
+                + [empty_para] * (n_cols - 1)
+            )
+            table_cmds.extend([
+                ('SPAN', (0, kfr_pos), (-1, kfr_pos)),
+                ('BACKGROUND', (0, kfr_pos), (-1, kfr_pos), colors.lightgrey),
+                ('LINEABOVE', (0, kfr_pos), (-1, kfr_pos), 0.5, colors.black),
+                ('LINEBELOW', (0, kfr_pos), (-1, kfr_pos), 0.5, colors.black),
+            ])
+
+        row_pos = len(table_rows) + 2
+        # Rule above section-opening rows and the leverage ratio groups
+        if metric_name in _SECTION_LINE_METRICS or metric_name in _RATIO_LINE_METRICS:
+            table_cmds.append(('LINEABOVE', (0, row_pos), (-1, row_pos), 0.5, colors.black))
+
+        # Value cells carry no markup, so they stay plain strings (no Paragraph parse)
+        if needs_bold:
+            # Bold rows are fully plain strings; the table style applies Helvetica-Bold to them
+            table_rows.append([first_cell] + cell_texts)
+            table_cmds.append(('FONTNAME', (0, row_pos), (-1, row_pos), 'Helvetica-Bold'))
+        else:
+            table_rows.append([Paragraph(first_cell, td_first_style)] + cell_texts)
 
     data = [header_row1, header_row2] + table_rows
 
     # Column widths (first column ~30%, remaining share ~70%)
     available_width = doc.width
-    num_cols = len(df.columns)
+    num_cols = n_cols
     if num_cols > 0:
         if num_cols > 1:
             first_col_width = available_width * 0.30
             remaining_width = available_width * 0.70
-            col_widths = [first_col_width] + [remaining_width / (num_cols - 1) for _ in range(num_cols - 1)]
+            col_widths = [first_col_width] + [remaining_width / (num_cols - 1)] * (num_cols - 1)
         else:
             col_widths = [available_width]
     else:
         col_widths = []
 
-    table = Table(data, colWidths=col_widths)
-    table.setStyle(table_style)
+    # LongTable: cheaper layout/splitting for tall tables; keep both header rows on page breaks
+    table = LongTable(data, colWidths=col_widths, repeatRows=2)
+    table.setStyle(TableStyle(table_cmds))
 
-    elements.append(KeepTogether(table))
+    # No KeepTogether: the table splits across pages with its headers repeated,
+    # instead of being laid out again to try to fit it whole on the next page
+    elements.append(_table_start_break(table, doc.width, doc.height))
+    elements.append(table)
     elements.append(Spacer(1, 24))
 
     # Add Financial Statement Analysis from JSON (if present)
     elements.append(Spacer(1, 12))
 
     # Define custom styles for FSA section
-    section_header_style = ParagraphStyle(
-        name='SectionHeader',
-        parent=styles['Heading3'],
-        fontName='Helvetica-Bold',
-        fontSize=11,
-        leading=13,
-        textColor=colors.darkslategray,
-        underline=0,
-        spaceAfter=6
-    )
+    section_header_style = styles['SectionHeader']
     
-    bullet_style = ParagraphStyle(
-        name='BulletPoint',
-        parent=styles['Normal'],
-        fontName='Helvetica',
-        fontSize=10,
-        leading=14,  # Increased leading for better spacing between lines
-        leftIndent=20,  # Indentation for the bullet points
-        firstLineIndent=-12,  # Negative first line indent to make the bullet hang
-        spaceBefore=4,
-        spaceAfter=6,
-        alignment=0  # Left alignment
-    )
+    bullet_style = styles['BulletPoint']
 
     if isinstance(fsa_data, dict):
         preferred_order = ["Income Statement", "Cash Flow Statement", "Balance Sheet"]
@@ -1506,9 +1834,9 @@ def build_pdf_bytes_from_ticker(ticker: str,
                 elements.append(Paragraph(f"<u>{section}</u>", section_header_style))
                 elements.append(Spacer(1, 6))
                 
-                # Add bullet points with proper formatting
-                for point in fsa_data[section]:
-                    elements.append(Paragraph(f"• {point}", bullet_style))
+                # Add bullet points with proper formatting; each bullet stays its own
+                # Paragraph so the hanging indent and inter-bullet spacing still apply
+                elements.extend([Paragraph(f"• {point}", bullet_style) for point in fsa_data[section]])
                 
                 elements.append(Spacer(1, 12))
     else:
@@ -1516,98 +1844,7 @@ def build_pdf_bytes_from_ticker(ticker: str,
 
     # Add ESG Risk Ratings template table (empty data) after FSA
     try:
-        # Define columns and labels
-        esg_headers = [
-            "ESG Factor", "Risk Rating",
-            "ESG Factor", "Risk Rating",
-            "ESG Factor", "Risk Rating",
-        ]
-        left_esg = [
-            "Climate Regulation",
-            "Climate Change",
-            "Habitat",
-            "Sustainability",
-            "Blended Score",
-            "ESG Engagement",
-        ]
-        mid_esg = [
-            "Product Safety",
-            "Workplace Safety",
-            "Health & Wellness",
-            "Stakeholder Engagement",
-            "Max Factor Score",
-            "",
-        ]
-        right_esg = [
-            "Board Composition",
-            "Succession planning",
-            "Data Security",
-            "Labor Relations",
-            "Aggregate Risk",
-            "",
-        ]
-        max_rows = max(len(left_esg), len(mid_esg), len(right_esg))
-
-        # Build table data
-        esg_data = []
-        # Header row
-        esg_data.append([Paragraph(h, ParagraphStyle(name='ESGHeader', parent=styles['TableHeader'])) for h in esg_headers])
-        # Data rows
-        for i in range(max_rows):
-            row_vals = [
-                left_esg[i] if i < len(left_esg) else "",
-                "*",
-                mid_esg[i] if i < len(mid_esg) else "",
-                "*",
-                right_esg[i] if i < len(right_esg) else "",
-                "*",
-            ]
-            row = []
-            for j, val in enumerate(row_vals):
-                if j % 2 == 0:  # ESG Factor columns
-                    # Show '*' for empty factor placeholders, keep labels bold
-                    if val:
-                        row.append(Paragraph(f"<b>{val}</b>", styles['TableDataFirstCol']))
-                    else:
-                        row.append(Paragraph("*", styles['TableDataFirstCol']))
-                else:  # Rating columns
-                    row.append(Paragraph(val if val else "*", styles['TableData']))
-            esg_data.append(row)
-
-        # Column widths: factors wider than ratings
-        factor_w = doc.width * 0.27
-        rating_w = doc.width * 0.06
-        esg_col_widths = [factor_w, rating_w, factor_w, rating_w, factor_w, rating_w]
-
-        esg_table = Table(esg_data, colWidths=esg_col_widths)
-        esg_style = TableStyle([
-            # Header styling
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#44546A')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('ALIGN', (0, 0), (-1, 0), 'LEFT'),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 3),
-            ('TOPPADDING', (0, 0), (-1, 0), 3),
-            # Body alignment
-            ('ALIGN', (0, 1), (0, -1), 'LEFT'),
-            ('ALIGN', (2, 1), (2, -1), 'LEFT'),
-            ('ALIGN', (4, 1), (4, -1), 'LEFT'),
-            ('ALIGN', (1, 1), (1, -1), 'CENTER'),
-            ('ALIGN', (3, 1), (3, -1), 'CENTER'),
-            ('ALIGN', (5, 1), (5, -1), 'CENTER'),
-            # Grid / borders
-            ('BOX', (0, 0), (-1, -1), 0.5, colors.black),
-            ('GRID', (0, 0), (-1, -1), 0.25, colors.black),
-            # Background for data rows
-            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-            # Padding
-            ('LEFTPADDING', (0, 0), (-1, -1), 2),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 2),
-            ('TOPPADDING', (0, 1), (-1, -1), 1.5),
-            ('BOTTOMPADDING', (0, 1), (-1, -1), 1.5),
-        ])
-        esg_table.setStyle(esg_style)
-        elements.append(KeepTogether(esg_table))
+        elements.append(KeepTogether(_build_esg_table(doc.width)))
         elements.append(Spacer(1, 12))
     except Exception:
         pass
@@ -1616,17 +1853,12 @@ def build_pdf_bytes_from_ticker(ticker: str,
     if isinstance(comp_rows, list) and comp_rows:
         try:
             # Add a title for the Comparables Analysis section
-            comp_title_style = ParagraphStyle(
-                name='CompTitle',
-                parent=styles['Heading2'],
-                fontName='Helvetica-Bold',
-                fontSize=11,
-                leading=13,
-                textColor=colors.black,
-                spaceAfter=6
-            )
-            elements.append(Paragraph("Comparables Analysis:", comp_title_style))
-            elements.append(Spacer(1, 6))
+            comp_title_style = styles['CompTitle']
+            comp_title = Paragraph("Comparables Analysis:", comp_title_style)
+            comp_title_gap = Spacer(1, 6)
+            comp_title_idx = len(elements)
+            elements.append(comp_title)
+            elements.append(comp_title_gap)
             
             df_comp = json_to_dataframe(comp_rows)
             df_comp = df_comp.replace({np.nan: '-'})  # Replace NaN with dash for better display
@@ -1638,55 +1870,21 @@ def build_pdf_bytes_from_ticker(ticker: str,
                 
             comp_cols = df_comp.columns.tolist()
 
-            # Define custom styles for the COMP table with smaller font sizes
-            comp_header_style = ParagraphStyle(
-                name='CompHeaderStyle',
-                parent=styles['TableHeader'],
-                fontSize=7.5,  # Increased font size
-                leading=9,
-                alignment=1,  # Center alignment
-                textColor=colors.whitesmoke
-            )
-            
-            comp_header_first_col_style = ParagraphStyle(
-                name='CompHeaderFirstColStyle',
-                parent=styles['TableHeaderFirstCol'],
-                fontSize=7.5,  # Increased font size
-                leading=9,
-                alignment=0,  # Left alignment
-                textColor=colors.whitesmoke
-            )
-            
-            comp_data_style = ParagraphStyle(
-                name='CompDataStyle',
-                parent=styles['TableData'],
-                fontSize=7,  # Increased font size
-                leading=9,
-                alignment=1  # Center alignment
-            )
-            
-            comp_data_first_col_style = ParagraphStyle(
-                name='CompDataFirstColStyle',
-                parent=styles['TableDataFirstCol'],
-                fontSize=7,  # Increased font size
-                leading=9,
-                alignment=0  # Left alignment
-            )
-            
+            # Custom styles for the COMP table with smaller font sizes
+            comp_header_style = styles['CompHeaderStyle']
+            comp_header_first_col_style = styles['CompHeaderFirstColStyle']
+            comp_data_style = styles['CompDataStyle']
+            comp_data_first_col_style = styles['CompDataFirstColStyle']
+            # One shared empty header cell for every filler slot
+            comp_empty_header = Paragraph("", comp_header_style)
+
             # Create header rows with proper styling
             # First header row (company name - Credit Comparable Analysis)
-            header_row1_comp = [Paragraph(f"{company_title} - Credit Comparable Analysis", 
-                                         ParagraphStyle(
-                                             name='CompHeaderTitle',
-                                             parent=comp_header_style,
-                                             fontSize=7.5,  # Slightly larger for title
-                                             alignment=1,  # Center alignment
-                                             textColor=colors.whitesmoke
-                                         ))]
+            header_row1_comp = [Paragraph(f"{company_title} - Credit Comparable Analysis",
+                                          styles['CompHeaderTitle'])]
             
             # Add empty cells for the rest of the columns in first header row
-            for _ in range(len(comp_cols) - 1):
-                header_row1_comp.append(Paragraph("", comp_header_style))
+            header_row1_comp += [comp_empty_header] * (len(comp_cols) - 1)
 
             # Second header row (LTM, 3-Year Average, etc.)
             # Define groups for the columns based on the screenshot
@@ -1699,84 +1897,50 @@ def build_pdf_bytes_from_ticker(ticker: str,
             header_row2_comp = [Paragraph("", comp_header_first_col_style)]  # First cell empty
             
             # Add column group headers
+            comp_group_style = styles['CompHeaderGroup']
             for group_name, span in col_groups:
-                header_row2_comp.append(Paragraph(group_name, 
-                                                ParagraphStyle(
-                                                    name='CompHeaderGroup',
-                                                    parent=comp_header_style,
-                                                    alignment=1,  # Center alignment
-                                                    textColor=colors.whitesmoke
-                                                )))
+                header_row2_comp.append(Paragraph(group_name, comp_group_style))
                 # Add empty cells for the span
-                for _ in range(span - 1):
-                    header_row2_comp.append(Paragraph("", comp_header_style))
-
-            # Third header row (actual column names)
-            header_row3_comp = []
-            for i, col in enumerate(comp_cols):
-                style = comp_header_first_col_style if i == 0 else comp_header_style
-                # Shorten and format column names for better readability
-                col_text = str(col)
-                if i > 0:  # Skip first column (Ticker)
-                    # Create more readable abbreviations
-                    col_text = col_text.replace('Total', 'Tot')
-                    # col_text = col_text.replace('EBITDAR', 'EBTDAR')
-                    # col_text = col_text.replace('EBITDA', 'EBTDA')
-                    col_text = col_text.replace('Margin', 'Mrgn')
-                    col_text = col_text.replace('Revenue', 'Rev')
-                    col_text = col_text.replace('Average', 'Avg')
-                    
-                    # Add (000s) suffix to LTM REV and LTM EBITDA columns
-                    if 'LTM REV' in col_text or 'LTM Rev' in col_text:
-                        col_text = col_text + '(000s)'
-                    elif 'LTM EBITDA' in col_text:
-                        col_text = col_text + '(000s)'
-
-                    # Add line breaks for complex headers to improve readability
-                    if '/' in col_text:
-                        parts = col_text.split('/')
-                        if len(parts) == 2:
-                            col_text = f"{parts[0].strip()}<br/>{parts[1].strip()}"
-                    
-                    # Add line breaks for headers with parentheses
-                    if '(' in col_text and ')' in col_text:
-                        col_text = col_text.replace('(', '<br/>(').replace(')', ')')
-                
-                header_row3_comp.append(Paragraph(col_text, style))
-
-            # Format the data rows
-            comp_table_rows = []
-            for row in df_comp.values.tolist():
-                formatted_row = []
-                for i, cell in enumerate(row):
-                    cell_text = str(cell) if cell != '' else '-'
-                    
-                    # Format numbers with proper decimal places and x suffix for ratios
-                    if i > 0 and cell_text != '-':  # Skip first column and empty cells
-                        try:
-                            val = float(str(cell_text).replace(',', ''))
-                            # Format as ratio with x suffix if appropriate
-                            if 'Ratio' in comp_cols[i] or any(x in comp_cols[i] for x in ['/', 'x']):
-                                cell_text = f"{val:.2f}x"
-                            # Format as percentage if appropriate
-                            elif '%' in comp_cols[i] or 'Margin' in comp_cols[i]:
-                                cell_text = f"{val:.1f}%"
-                            # Format as regular number with 1 decimal place
-                            else:
-                                cell_text = f"{val:.1f}"
-                        except (ValueError, TypeError):
-                            pass  # Keep as is if not a number
-                    
-                    # Use appropriate style based on column
-                    if i == 0:  # First column (company names)
-                        # Italicize the company name if it's not Average or Median
-                        if cell_text.upper() not in ("AVERAGE", "MEDIAN"):
-                            cell_text = f"<i>{cell_text}</i>"
-                        formatted_row.append(Paragraph(cell_text, comp_data_first_col_style))
-                    else:  # Data columns
-                        formatted_row.append(Paragraph(cell_text, comp_data_style))
-                        
-                comp_table_rows.append(formatted_row)
+                header_row2_comp += [comp_empty_header] * (span - 1)
+
+            # Third header row (actual column names); the Ticker column stays as-is
+            header_row3_comp = [Paragraph(str(comp_cols[0]), comp_header_first_col_style)]
+            header_row3_comp += [Paragraph(_fmt_comp_header(str(c)), comp_header_style) for c in comp_cols[1:]]
+
+            # Number format per column, decided once from the header:
+            # ratios get two decimals + 'x', percentages/margins one decimal + '%',
+            # everything else one decimal
+            col_fmt = [
+                '%.2fx' if ('Ratio' in c or '/' in c or 'x' in c)
+                else '%.1f%%' if ('%' in c or 'Margin' in c)
+                else '%.1f'
+                for c in map(str, comp_cols)
+            ]
+
+            # Format column by column on the typed frame, then zip into rows
+            comp_columns = []
+            summary_rows = []  # indices of the AVERAGE / MEDIAN rows
+            for i in range(len(comp_cols)):
+                col = df_comp.iloc[:, i]
+                texts = col.astype(str).mask(col.eq(''), '-').astype(object)
+                if i == 0:
+                    # Company names are italic; Average and Median labels are bold
+                    names = texts.tolist()
+                    summary_rows = [r for r, t in enumerate(names) if t.upper() in ("AVERAGE", "MEDIAN")]
+                    summary_set = set(summary_rows)
+                    comp_columns.append([
+                        Paragraph(f"<b>{t}</b>" if r in summary_set else f"<i>{t}</i>",
+                                  comp_data_first_col_style)
+                        for r, t in enumerate(names)
+                    ])
+                    continue
+                # Data columns (plain strings, styled by the table); non-numbers kept as is
+                num = pd.to_numeric(texts.str.translate(_COMMA_TRANS), errors='coerce')
+                fmt_mask = num.notna() & texts.ne('-')
+                if fmt_mask.any():
+                    texts[fmt_mask] = np.char.mod(col_fmt[i], num[fmt_mask].to_numpy(dtype=float)).tolist()
+                comp_columns.append(texts.tolist())
+            comp_table_rows = [list(r) for r in zip(*comp_columns)]
 
             # Combine all rows
             data_comp = [header_row1_comp, header_row2_comp, header_row3_comp] + comp_table_rows
@@ -1817,7 +1981,7 @@ def build_pdf_bytes_from_ticker(ticker: str,
                 comp_col_widths = []
 
             # Create table style with reduced padding to fit on page
-            comp_style = TableStyle([
+            comp_cmds = [
                 # Span the title across all columns in first row
                 ('SPAN', (0, 0), (-1, 0)),
                 # Background color for header rows
@@ -1855,132 +2019,42 @@ def build_pdf_bytes_from_ticker(ticker: str,
                 ('BACKGROUND', (0, 3), (-1, 3), colors.lightgrey),
                 # Add grid lines for better readability
                 ('GRID', (0, 3), (-1, -1), 0.25, colors.lightgrey),
-            ])
+                # Font for plain-string data cells (matches comp_data_style)
+                ('FONTSIZE', (0, 3), (-1, -1), 7),
+                ('LEADING', (0, 3), (-1, -1), 9),
+            ]
 
-            # Emphasize AVERAGE and MEDIAN rows
+            # Emphasize AVERAGE and MEDIAN rows (labels were already bolded above)
             base_row_idx = 3  # Data rows start at index 3 (after 3 header rows)
-            for i, row in enumerate(comp_table_rows):
-                abs_r = base_row_idx + i
-                try:
-                    first_val = row[0].text
-                    if "<i>" in first_val:  # Remove italic tags for comparison
-                        first_val = first_val.replace("<i>", "").replace("</i>", "")
-                except Exception:
-                    first_val = ''
-                    
-                if first_val.upper() in ("AVERAGE", "MEDIAN"):
+            for r in summary_rows:
+                abs_r = base_row_idx + r
+                comp_cmds.extend([
                     # Add line above these rows
-                    comp_style.add('LINEABOVE', (0, abs_r), (-1, abs_r), 0.5, colors.black)
-                    # Make text bold and add background color
-                    comp_style.add('BACKGROUND', (0, abs_r), (-1, abs_r), colors.lightgrey)
-                    # Make text bold
-                    for j in range(len(row)):
-                        try:
-                            cell_text = row[j].text
-                            row[j] = Paragraph(f"<b>{cell_text}</b>", 
-                                              comp_data_first_col_style if j == 0 else comp_data_style)
-                        except Exception:
-                            pass
-
-            comp_table = Table(data_comp, colWidths=comp_col_widths)
-            comp_table.setStyle(comp_style)
-            elements.append(Spacer(1, 12))
-            elements.append(KeepTogether(comp_table))
+                    ('LINEABOVE', (0, abs_r), (-1, abs_r), 0.5, colors.black),
+                    # Add background color
+                    ('BACKGROUND', (0, abs_r), (-1, abs_r), colors.lightgrey),
+                    # Make the plain-string value cells bold
+                    ('FONTNAME', (1, abs_r), (-1, abs_r), 'Helvetica-Bold'),
+                ])
+
+            # Split across pages with the three header rows repeated (no KeepTogether)
+            comp_table = Table(data_comp, colWidths=comp_col_widths, repeatRows=3)
+            comp_table.setStyle(TableStyle(comp_cmds))
+            comp_table_gap = Spacer(1, 12)
+            # Keep the section title, header rows and first data rows on one page
+            elements.insert(comp_title_idx, _table_start_break(
+                comp_table, doc.width, doc.height, lead=(comp_title, comp_title_gap, comp_table_gap)))
+            elements.append(comp_table_gap)
+            elements.append(comp_table)
         except Exception:
             pass
 
     # Covenant Summary Table (empty template) after COMP
     try:
-        cov_company_title = get_company_title_from_sec(ticker) or get_company_title_from_ticker(ticker)
-        cov_title = f"{cov_company_title} - Covenant Summary"
-        cov_date = "3/31/2025"
-
-        # Define styles
-        cov_title_style = ParagraphStyle(
-            name='CovTitle', parent=styles['TableHeader'], fontSize=9, alignment=1, textColor=colors.whitesmoke
-        )
-        cov_date_style = ParagraphStyle(
-            name='CovDate', parent=styles['Normal'], fontName='Helvetica-Bold', fontSize=9, alignment=1
-        )
-        cov_head_style = ParagraphStyle(
-            name='CovHead', parent=styles['TableHeader'], fontSize=8, alignment=1, textColor=colors.black
+        # Reuse the title resolved for the tables above (no extra SEC round-trip)
+        cov_table = _build_covenant_table(
+            doc.width, Paragraph(f"{company_title} - Covenant Summary", styles['CovTitle']), "3/31/2025"
         )
-        cov_term_style = ParagraphStyle(
-            name='CovTerm', parent=styles['TableDataFirstCol'], fontSize=7, alignment=0
-        )
-        cov_data_style = ParagraphStyle(
-            name='CovData', parent=styles['TableData'], fontSize=7, alignment=1
-        )
-        cov_group_style = ParagraphStyle(
-            name='CovGroup', parent=styles['TableHeader'], fontSize=8, alignment=1, textColor=colors.black
-        )
-
-        # Rows
-        cov_rows = []
-        # Title row (span 3 cols)
-        cov_rows.append([Paragraph(cov_title, cov_title_style), Paragraph("", cov_title_style), Paragraph("", cov_title_style)])
-        # Date row (span 3)
-        cov_rows.append([Paragraph(cov_date, cov_date_style), Paragraph("", cov_date_style), Paragraph("", cov_date_style)])
-        # Header row
-        cov_rows.append([
-            Paragraph("Term", cov_head_style),
-            Paragraph("Covenant Level", cov_head_style),
-            Paragraph("Reported", cov_head_style),
-        ])
-        # Terms (empty values)
-        terms = [
-            "Maximum Leverage Ratio",
-            "Unconsolidated Affiliates / Total Asset Value",
-            "Total Marketable Securities, etc. / Total Asset Value",
-            "Minimum Fixed Charge Coverage Ratio",
-            "Maximum Secured Indebtedness",
-            "Maximum Unencumbered Leverage Ratio",
-        ]
-        for t in terms:
-            # Fill Covenant Level and Reported with '*'
-            cov_rows.append([Paragraph(t, cov_term_style), Paragraph("*", cov_data_style), Paragraph("*", cov_data_style)])
-        # Group header
-        cov_rows.append([Paragraph("Additional Covenants / Baskets", cov_group_style), Paragraph("", cov_group_style), Paragraph("", cov_group_style)])
-        # Additional rows
-        more_terms = [
-            "Unimprovement Land / Unencumbered Pool Value",
-            "Development, JVs, etc. / Unencumbered Pool Value",
-        ]
-        for t in more_terms:
-            cov_rows.append([Paragraph(t, cov_term_style), Paragraph("*", cov_data_style), Paragraph("*", cov_data_style)])
-
-        # Column widths
-        term_w = doc.width * 0.62
-        other_w = (doc.width - term_w) / 2
-        cov_col_widths = [term_w, other_w, other_w]
-
-        cov_table = Table(cov_rows, colWidths=cov_col_widths)
-        cov_style = TableStyle([
-            ('SPAN', (0, 0), (-1, 0)),  # title span
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#44546A')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-
-            ('SPAN', (0, 1), (-1, 1)),  # date span
-            ('BACKGROUND', (0, 1), (-1, 1), colors.lightgrey),
-            ('ALIGN', (0, 1), (-1, 1), 'CENTER'),
-
-            ('BACKGROUND', (0, 2), (-1, 2), colors.lightgrey),  # header row
-            ('ALIGN', (0, 2), (-1, 2), 'CENTER'),
-            ('FONTNAME', (0, 2), (-1, 2), 'Helvetica-Bold'),
-
-            ('ALIGN', (0, 3), (0, -1), 'LEFT'),  # term col left
-            ('ALIGN', (1, 3), (-1, -1), 'CENTER'),
-
-            ('SPAN', (0, 9), (-1, 9)),  # group header span (row index depends on terms count)
-            ('BACKGROUND', (0, 9), (-1, 9), colors.lightgrey),
-            ('ALIGN', (0, 9), (-1, 9), 'CENTER'),
-            ('FONTNAME', (0, 9), (-1, 9), 'Helvetica-Bold'),
-
-            ('BOX', (0, 0), (-1, -1), 0.5, colors.black),
-            ('GRID', (0, 0), (-1, -1), 0.25, colors.black),
-        ])
-        cov_table.setStyle(cov_style)
         elements.append(Spacer(1, 12))
         elements.append(KeepTogether(cov_table))
         elements.append(Spacer(1, 12))
@@ -1989,17 +2063,24 @@ def build_pdf_bytes_from_ticker(ticker: str,
 
     # Add bottom note explaining '*'
     try:
-        footnote_style = ParagraphStyle(
-            name='Footnote', parent=styles['Normal'], fontSize=8, textColor=colors.grey, alignment=0
-        )
+        footnote_style = styles['Footnote']
         elements.append(Spacer(1, 6))
         elements.append(Paragraph("Note: '*' indicates the data source are private.", footnote_style))
     except Exception:
         pass
 
     doc.build(elements, onFirstPage=draw_aqrr_header, onLaterPages=draw_aqrr_header)
-    buffer.seek(0)
-    return buffer.getvalue()
+    if cache_key is None and output is not None:
+        # Nothing to cache: write the buffer's memory out without materialising bytes
+        _write_pdf(buffer.getbuffer(), output)
+        return None
+    pdf_bytes = buffer.getvalue()
+    if cache_key is not None:
+        _pdf_cache_put(cache_key, pdf_bytes)
+    if output is None:
+        return pdf_bytes
+    _write_pdf(pdf_bytes, output)
+    return None
 
 
 if __name__ == '__main__':
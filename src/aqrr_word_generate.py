@@ -2,46 +2,119 @@
 import os
 import io
 import json
+import mmap
 import re
+import time
 import requests
 import numpy as np
 import pandas as pd
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 import argparse
 import sys
+from copy import deepcopy
+from functools import lru_cache
+from xml.sax.saxutils import escape as xml_escape
 
 # Word document generation imports
 from docx import Document
-from docx.shared import Pt, Inches, RGBColor
+from docx.shared import Length, Pt, Inches, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.enum.table import WD_ALIGN_VERTICAL, WD_TABLE_ALIGNMENT
-from docx.oxml.ns import qn
-from docx.oxml import OxmlElement
+from docx.enum.table import WD_TABLE_ALIGNMENT
+from docx.oxml.ns import qn, nsdecls
+from docx.oxml import OxmlElement, parse_xml
 from fastapi import APIRouter, FastAPI, HTTPException, Body
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
 from io import BytesIO
+from src.api_cache import (HTTP_SESSION as _HTTP, cached_post_json, json_dumps as _json_dumps,
+                           json_loads as _json_loads, write_file_atomic)
+from src.excel_io import read_essence_table
+
+try:
+    import orjson  # optional C JSON parser
+except ImportError:
+    orjson = None
+
+
+# Namespace-qualified names used when editing table XML, resolved once
+_QN_TBLIND = qn('w:tblInd')
+_QN_TBLLAYOUT = qn('w:tblLayout')
+_QN_TBLW = qn('w:tblW')
+_QN_TCBORDERS = qn('w:tcBorders')
+_QN_SHD = qn('w:shd')
+_QN_FLDCHARTYPE = qn('w:fldCharType')
+_QN_W = qn('w:w')
+_QN_TYPE = qn('w:type')
+_QN_VAL = qn('w:val')
+_QN_FILL = qn('w:fill')
+_QN_SZ = qn('w:sz')
+_QN_SPACE = qn('w:space')
+_QN_COLOR = qn('w:color')
+_QN_XML_SPACE = qn('xml:space')
+
+# Trailing commas before a closing brace/bracket in LLM-produced JSON text
+_TRAILING_COMMA_RE = re.compile(r",\s*([}\]])")
+
+
+def _try_parse_json_text(s: str):
+    """Parse a raw JSON string from the API, sanitizing LLM artifacts on failure; None if unparseable."""
+    try:
+        return _json_loads(s)
+    except Exception:
+        # sanitize and retry: remove trailing commas and trim to outer braces
+        s2 = s.strip()
+        if s2.startswith("```"):
+            s2 = s2.strip('`')
+        s2 = _TRAILING_COMMA_RE.sub(r"\1", s2)
+        if '{' in s2 and '}' in s2:
+            s2 = s2[s2.find('{'): s2.rfind('}') + 1]
+        try:
+            return _json_loads(s2)
+        except Exception:
+            return None
+
+
+# On-disk copy of SEC's company_tickers.json, refreshed daily
+_SEC_CACHE_PATH = os.path.join('static', '.sec_tickers_cache.json')
+_SEC_CACHE_TTL_SECONDS = 24 * 3600
+
+# Endpoints fetched by build_word_bytes_from_ticker, with their request timeouts
+_WORD_API_TIMEOUTS = {'hfa': 300, 'credit_table': 300, 'company-table': 120, 'cap-table': 300, 'comp': 300}
 
 router = APIRouter()
 app = FastAPI(title="Word API")
 app.include_router(router, prefix="/word")
 
 
+# Directory scans are memoized per folder mtime: adding or removing an entry
+# bumps the mtime, so a changed folder is simply a new cache key
+@lru_cache(maxsize=8)
+def _scan_companies(base_folder: str, mtime_ns: int) -> tuple:
+    """Names of the company folders under base_folder."""
+    with os.scandir(base_folder) as it:
+        return tuple(e.name for e in it if e.is_dir())
+
+
+@lru_cache(maxsize=256)
+def _find_data_file(company_path: str, mtime_ns: int) -> str | None:
+    """Path of the first csv/xlsx/json file in a company folder, or None."""
+    with os.scandir(company_path) as it:
+        return next((e.path for e in it if e.name.endswith(('.csv', '.xlsx', '.json'))), None)
+
+
 @router.get('/get_companies')
 def get_companies():
     """Dynamically lists company folders."""
     base_folder = os.getenv('COMPANY_DATA_FOLDER', 'company_data')
     try:
-        companies = [
-            d for d in os.listdir(base_folder)
-            if os.path.isdir(os.path.join(base_folder, d))
-        ]
-        return companies
+        return list(_scan_companies(base_folder, os.stat(base_folder).st_mtime_ns))
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Company data folder not found.")
 
 
 @router.post('/aqrr_word')
-def generate_word(data: dict = Body(...)):
+async def generate_word(data: dict = Body(...)):
     """Generates a Word document from company data."""
     company_name = data.get('company')
     if not company_name:
@@ -53,16 +126,21 @@ def generate_word(data: dict = Body(...)):
         raise HTTPException(status_code=404, detail="Company folder not found.")
 
     # Find the data file (csv, excel, or json)
-    data_file = None
-    for filename in os.listdir(company_path):
-        if filename.endswith(('.csv', '.xlsx', '.json')):
-            data_file = os.path.join(company_path, filename)
-            break
+    data_file = _find_data_file(company_path, os.stat(company_path).st_mtime_ns)
 
     if not data_file:
         raise HTTPException(status_code=404, detail="Data file (csv, xlsx, or json) not found.")
 
-    # Load data from the file
+    # Loading and building are blocking file I/O + CPU work: keep them off the event loop
+    df = await run_in_threadpool(_load_df, data_file)
+    buffer = await run_in_threadpool(_build_doc_buffer, df, company_path, data_file, company_name)
+
+    headers = {"Content-Disposition": f"attachment; filename={company_name}_report.docx"}
+    return StreamingResponse(_iter_buffer(buffer), media_type='application/vnd.openxmlformats-officedocument.wordprocessingml.document', headers=headers)
+
+
+def _load_df(data_file):
+    """Load the company data file (csv, xlsx or json) into a non-empty DataFrame."""
     try:
         if data_file.endswith('.csv'):
             df = pd.read_csv(data_file)
@@ -70,10 +148,10 @@ def generate_word(data: dict = Body(...)):
             df = df.replace({np.nan: ''})
         elif data_file.endswith('.xlsx'):
             # Explicitly specify the sheet name
-            df = pd.read_excel(data_file, sheet_name='Essence Table')
+            df = read_essence_table(data_file, sheet_name='Essence Table')
         elif data_file.endswith('.json'):
-            with open(data_file, 'r') as f:
-                json_data = json.load(f)
+            with open(data_file, 'rb') as f:
+                json_data = _json_loads(f.read())
             df = json_to_dataframe(json_data)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error reading data file or worksheet: {e}")
@@ -81,7 +159,11 @@ def generate_word(data: dict = Body(...)):
     # Handle case where the data file or sheet is empty
     if df.empty:
         raise HTTPException(status_code=500, detail="Data file or specified worksheet is empty. Cannot create a table.")
+    return df
+
 
+def _build_doc_buffer(df, company_path, data_file, company_name):
+    """Create the Word document (table + statement analysis) and save it into a BytesIO."""
     # Load statement analysis text
     analysis_file = os.path.join(company_path, 'statement_analysis.txt')
     if os.path.exists(analysis_file):
@@ -90,33 +172,56 @@ def generate_word(data: dict = Body(...)):
     else:
         analysis_text = "No statement analysis text found."
 
-    # Generate the Word document
-    buffer = BytesIO()
-    
     # Create Word document
     doc = create_word_document(df, analysis_text, data_file, company_name)
-    
+
     # Save the document to the buffer
+    buffer = BytesIO()
     doc.save(buffer)
-    buffer.seek(0)
+    return buffer
 
-    headers = {"Content-Disposition": f"attachment; filename={company_name}_report.docx"}
-    return StreamingResponse(buffer, media_type='application/vnd.openxmlformats-officedocument.wordprocessingml.document', headers=headers)
+
+async def _iter_buffer(buffer: BytesIO, chunk_size: int = 1 << 16):
+    """
+    Yield the buffer's contents as fixed-size memoryview slices (no per-chunk copies).
+    Iterating a BytesIO directly splits binary data on newline bytes and each
+    of those chunks is pulled through a threadpool hop.
+    """
+    view = buffer.getbuffer()
+    for start in range(0, len(view), chunk_size):
+        yield view[start:start + chunk_size]
 
 # Helper functions from PDF generator
+def _ticker_title_map(data) -> dict:
+    """Index a company_tickers.json payload as {TICKER: title}; the first entry wins on duplicates."""
+    titles = {}
+    if isinstance(data, dict):
+        for entry in data.values():
+            if isinstance(entry, dict):
+                titles.setdefault(str(entry.get('ticker', '')).upper().strip(), entry.get('title'))
+    return titles
+
+
+@lru_cache(maxsize=4)
+def _load_ticker_index(mapping_path: str, mtime_ns: int) -> dict:
+    """Parse the static ticker mapping once per file version (`mtime_ns` keys the cache)."""
+    with open(mapping_path, 'rb') as f:
+        return _ticker_title_map(_json_loads(f.read()))
+
+
 def get_company_title_from_ticker(ticker: str, mapping_path: str = os.path.join('static', 'company_ticker.json')) -> str:
     """Return company title/name for a given ticker using static/company_ticker.json.
     Falls back to ticker if not found or file missing.
     """
     try:
-        with open(mapping_path, 'r') as f:
-            mapping = json.load(f)
         t_upper = ticker.upper()
-        for _, entry in mapping.items():
-            if isinstance(entry, dict) and entry.get('ticker', '').upper() == t_upper:
-                return entry.get('title') or t_upper
+        index = _load_ticker_index(mapping_path, os.stat(mapping_path).st_mtime_ns)
+        title = index.get(t_upper.strip())
+        if title is not None:
+            return title or t_upper
     except Exception:
         pass
+    return ticker
 
 
 def set_table_indent(table, inches: float = 0.0):
@@ -127,63 +232,144 @@ def set_table_indent(table, inches: float = 0.0):
         if tblPr is None:
             tblPr = OxmlElement('w:tblPr')
             tbl.append(tblPr)
-        tblInd = tblPr.find(qn('w:tblInd'))
+        tblInd = tblPr.find(_QN_TBLIND)
         if tblInd is None:
             tblInd = OxmlElement('w:tblInd')
             tblPr.append(tblInd)
         twips = int(inches * 1440)
-        tblInd.set(qn('w:w'), str(twips))
-        tblInd.set(qn('w:type'), 'dxa')
+        tblInd.set(_QN_W, str(twips))
+        tblInd.set(_QN_TYPE, 'dxa')
     except Exception:
         pass
 
 
+def _set_cells_preferred_width(cells, width_in: float):
+    """Set tcW on each cell to `width_in` inches (dxa)."""
+    width_twips = str(int(width_in * 1440))
+    for cell in cells:
+        tcW = cell._tc.get_or_add_tcPr().get_or_add_tcW()
+        tcW.set(_QN_TYPE, 'dxa')
+        tcW.set(_QN_W, width_twips)
+
+
 def set_column_preferred_width(table, col_idx: int, width_in: float):
     """Force a column's preferred width for all cells (sets tcW)."""
     try:
-        width_twips = int(width_in * 1440)
         column = table.columns[col_idx]
         column.width = Inches(width_in)
-        for cell in column.cells:
-            cell.width = Inches(width_in)
-            tcPr = cell._element.tcPr
-            if tcPr is None:
-                tcPr = OxmlElement('w:tcPr')
-                cell._element.append(tcPr)
-            tcW = tcPr.find(qn('w:tcW'))
-            if tcW is None:
-                tcW = OxmlElement('w:tcW')
-                tcPr.append(tcW)
-            tcW.set(qn('w:w'), str(width_twips))
-            tcW.set(qn('w:type'), 'dxa')
+        _set_cells_preferred_width(column.cells, width_in)
     except Exception:
         pass
 
 
+def set_grid_widths(table, widths_in):
+    """Set the <w:gridCol> widths of a table in one pass; same effect as column.width per column."""
+    for grid_col, width_in in zip(table._tbl.tblGrid.gridCol_lst, widths_in):
+        grid_col.w = Inches(width_in)
+
+
+def set_column_preferred_widths(table, widths_in):
+    """set_column_preferred_width for every column, building python-docx's cell grid only once."""
+    try:
+        set_grid_widths(table, widths_in)
+        cells = table._cells
+        col_count = len(table._tbl.tblGrid.gridCol_lst)
+        for col_idx, width_in in enumerate(widths_in):
+            _set_cells_preferred_width(cells[col_idx::col_count], width_in)
+    except Exception:
+        pass
+
+
+def _merge_row_cells(row, start: int, end: int):
+    """
+    Merge grid columns start..end of `row` into the first cell with one gridSpan
+    edit instead of repeated _Cell.merge() calls, summing widths the same way.
+    Content of the absorbed cells is dropped, so set the merged cell's text after.
+    """
+    cells = row.cells
+    merged = cells[start]
+    tc = merged._tc
+    span, width = tc.grid_span, tc.width
+    for cell in cells[start + 1:end + 1]:
+        other = cell._tc
+        if other is tc or other.getparent() is None:  # spanned cells repeat in row.cells
+            continue
+        span += other.grid_span
+        width = Length(width + other.width) if width and other.width else width
+        other.getparent().remove(other)
+    tc.grid_span = span
+    if width:
+        tc.width = width
+    return merged
+
+
+@lru_cache(maxsize=1)
+def _load_sec_map(url: str, ttl_bucket: int) -> dict:
+    """
+    {TICKER: title} from SEC's company_tickers.json, persisted under static/ for a day.
+    `ttl_bucket` only keys the in-process cache so it expires together with the file.
+    Raises if the download fails, so failures are not cached.
+    """
+    data = None
+    try:
+        if time.time() - os.path.getmtime(_SEC_CACHE_PATH) < _SEC_CACHE_TTL_SECONDS:
+            with open(_SEC_CACHE_PATH, 'rb') as f:
+                data = _json_loads(f.read())
+    except Exception:
+        data = None
+    if data is None:
+        resp = _HTTP.get(url, timeout=30)
+        resp.raise_for_status()
+        data = _json_loads(resp.content)
+        # Best-effort disk cache; a failure here must not break title lookup
+        try:
+            write_file_atomic(_SEC_CACHE_PATH, _json_dumps(data))
+        except Exception:
+            pass
+    return _ticker_title_map(data)
+
+
 def get_company_title_from_sec(ticker: str,
                                url: str = 'https://www.sec.gov/files/company_tickers.json') -> str | None:
     """Attempt to resolve company title from SEC's public company_tickers.json.
     Returns the company title or None if not found/failed.
     """
     try:
-        resp = requests.get(url, timeout=30)
-        if resp.status_code != 200:
-            return None
-        data = resp.json()
-        t_up = str(ticker).upper().strip()
-        if isinstance(data, dict):
-            for _, v in data.items():
-                try:
-                    if isinstance(v, dict) and str(v.get('ticker', '')).upper().strip() == t_up:
-                        title = v.get('title')
-                        return str(title) if title else None
-                except Exception:
-                    continue
+        titles = _load_sec_map(url, int(time.time() // _SEC_CACHE_TTL_SECONDS))
+        title = titles.get(str(ticker).upper().strip())
+        return str(title) if title else None
+    except Exception:
         return None
+
+
+# JSON files at least this large are parsed from a memory map instead of a read() copy
+_MMAP_MIN_BYTES = 1 << 20
+
+
+def _read_json_file(path: str):
+    """Parsed JSON from `path`, or None if the file is missing or unreadable."""
+    try:
+        with open(path, 'rb') as f:
+            if orjson is not None and os.fstat(f.fileno()).st_size >= _MMAP_MIN_BYTES:
+                # orjson parses straight out of the mapped pages
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                    try:
+                        return orjson.loads(view)
+                    except orjson.JSONDecodeError:
+                        return json.loads(view.tobytes())
+            return _json_loads(f.read())
     except Exception:
         return None
 
 
+def warm_sec_title_cache(url: str = 'https://www.sec.gov/files/company_tickers.json') -> None:
+    """Load the SEC ticker index ahead of the first report; failures are left for lookup time."""
+    try:
+        _load_sec_map(url, int(time.time() // _SEC_CACHE_TTL_SECONDS))
+    except Exception:
+        pass
+
+
 def current_quarter_index(reference: datetime | None = None) -> int:
     ref = reference or datetime.now()
     m = ref.month
@@ -237,6 +423,19 @@ def format_number_for_display(val):
         return str(val)
 
 
+@lru_cache(maxsize=4096)
+def _format_number_memo(val):
+    return format_number_for_display(val)
+
+
+def _format_number_cached(val):
+    """format_number_for_display, memoized for the placeholders/strings that repeat across HFA cells."""
+    try:
+        return _format_number_memo(val)
+    except TypeError:  # unhashable cell value
+        return format_number_for_display(val)
+
+
 def format_ratio_to_two_decimals(val):
     """Format ratio strings like '3.3x' to two decimals: '3.30x'. Leaves non-ratio values unchanged."""
     try:
@@ -257,23 +456,126 @@ def format_ratio_to_two_decimals(val):
         return str(val)
 
 
+def _format_number_column(vals: pd.Series) -> pd.Series:
+    """
+    Column-wise format_number_for_display ('' stays ''). Finite numbers are scaled
+    and formatted in bulk; anything else (placeholders, '%' strings, text) goes
+    through the scalar function.
+    """
+    num = pd.to_numeric(vals, errors='coerce').astype(float).to_numpy()
+    fast = np.isfinite(num)
+    out = vals.astype(object).copy()
+    if fast.any():
+        f = num[fast] / 1000
+        a = np.abs(f)
+        whole = np.abs(f - np.trunc(f)) < 1e-6
+        neg = f < 0
+        # Format each class of value in one pass instead of branching per cell
+        body = np.empty(len(f), dtype=object)
+        body[whole] = list(map('{:,}'.format, map(int, a[whole].tolist())))
+        body[~whole] = list(map('{:,.1f}'.format, a[~whole].tolist()))
+        body[neg] = '(' + body[neg] + ')'
+        out[fast] = body
+    if not fast.all():
+        out[~fast] = vals[~fast].map(lambda v: '' if v == '' else _format_number_cached(v))
+    return out
+
+
+def _format_pct_array(values):
+    """Format a float array as '12.3%' / '(12.3%)' using numpy's C-level string ops."""
+    values = np.asarray(values, dtype=float)
+    neg = values < 0
+    body = np.char.mod('%.1f', np.where(neg, -values, values))
+    return np.where(neg, np.char.add(np.char.add('(', body), '%)'), np.char.add(body, '%'))
+
+
+def _sorted_by_year(cols, key):
+    """Sort period columns by their parsed year, keeping the input order if parsing fails."""
+    try:
+        return sorted(cols, key=key)
+    except Exception:
+        return cols
+
+
+@lru_cache(maxsize=64)
+def _hfa_column_layout(columns: tuple):
+    """
+    Group HFA columns into years / YTD / LTM periods in a single pass.
+    Returns (reorder, year_cols, ytd_cols, ltm_cols): when the frame is just
+    'Metric' plus period columns, `reorder` is True and each group is sorted
+    by year; otherwise the groups keep the frame's column order. Memoized on
+    the column tuple since every ticker in a batch shares the same layout.
+    """
+    col_groups = {'year': [], 'ytd': [], 'ltm': [], 'other': []}
+    for c in columns:
+        if isinstance(c, str) and c.isdigit() and len(c) == 4:
+            col_groups['year'].append(c)
+        elif isinstance(c, str) and c.startswith('YTD '):
+            col_groups['ytd'].append(c)
+        elif isinstance(c, str) and c.startswith('LTM '):
+            col_groups['ltm'].append(c)
+        else:
+            col_groups['other'].append(c)
+    if col_groups['other'] == ['Metric']:
+        return (True,
+                tuple(_sorted_by_year(col_groups['year'], int)),
+                tuple(_sorted_by_year(col_groups['ytd'], lambda x: int(x.split()[1]))),
+                tuple(_sorted_by_year(col_groups['ltm'], lambda x: int(x.split()[1]))))
+    return False, tuple(col_groups['year']), tuple(col_groups['ytd']), tuple(col_groups['ltm'])
+
+
+# Keywords to detect ratio rows in HFA, compiled into one alternation so each
+# metric name is matched with a single regex search
+_RATIO_KEYWORDS = (
+    'EBITDA / Int',
+    'EBITDA / Interest',
+    'EBITDAR / Interest',
+    'EBITDAR / Interest + Rent',
+    'Total Debt / EBITDA',
+    'Total Debt + Leases / EBITDA',
+    'Total Debt / Book',
+    'Total Debt + Leases / Book',
+)
+_RATIO_RE = re.compile('|'.join(map(re.escape, _RATIO_KEYWORDS)))
+# Ratio metrics displayed as percentages (not with 'x')
+_PCT_RATIO_METRICS = frozenset({
+    'Total Debt / Book Capital',
+    'Total Debt + Leases / Book Capital',
+})
+# The same metrics as CAP ratio labels, in _norm_label form
+_PCT_RATIO_LABELS = frozenset(m.lower() for m in _PCT_RATIO_METRICS)
+_WS_RE = re.compile(r"\s+")
+
+
+def _norm_label(s) -> str:
+    """Lower-case a label and collapse runs of whitespace, for matching ratio names."""
+    return _WS_RE.sub(" ", str(s).strip().lower())
+# Accounting sign/thousands decoration stripped before float(), e.g. "(1,234.5)" -> "-1234.5"
+_SIGN_TRANS = str.maketrans({'(': '-', ')': None, ',': None})
+
+
 def flatten_json(nested_json, prefix='', separator='_'):
     """
     Flatten a nested JSON structure into a flat dictionary.
     Improved to handle complex nested structures including lists of objects.
+    Walks the structure with an explicit stack of item iterators (depth-first, in
+    key order) instead of recursing and merging a dict per nesting level.
     """
     flattened = {}
-    for key, value in nested_json.items():
-        if isinstance(value, dict):
-            flattened.update(flatten_json(value, f"{prefix}{key}{separator}", separator))
-        elif isinstance(value, list):
-            if value and all(isinstance(item, dict) for item in value):
-                for i, item in enumerate(value):
-                    flattened.update(flatten_json(item, f"{prefix}{key}{separator}{i}{separator}", separator))
-            else:
-                flattened[f"{prefix}{key}"] = json.dumps(value)
+    stack = [(prefix, iter(nested_json.items()))]
+    while stack:
+        pre, items = stack[-1]
+        for key, value in items:
+            if isinstance(value, dict):
+                stack.append((f"{pre}{key}{separator}", iter(value.items())))
+                break
+            if isinstance(value, list) and value and all(isinstance(item, dict) for item in value):
+                # Each object is keyed by its index: "<key>_<i>_<field>"
+                stack.append((f"{pre}{key}{separator}", iter(enumerate(value))))
+                break
+            flattened[f"{pre}{key}"] = json.dumps(value) if isinstance(value, list) else value
         else:
-            flattened[f"{prefix}{key}"] = value
+            stack.pop()
     return flattened
 
 
@@ -288,6 +590,9 @@ def json_to_dataframe(json_data):
             return pd.DataFrame()
 
         if all(isinstance(item, dict) for item in json_data):
+            # Fast path: flat records need no normalization pass
+            if not any(isinstance(v, (dict, list)) for item in json_data for v in item.values()):
+                return pd.DataFrame(json_data)
             try:
                 return pd.json_normalize(json_data)
             except Exception:
@@ -296,6 +601,8 @@ def json_to_dataframe(json_data):
         else:
             return pd.DataFrame(json_data, columns=['Value'])
     elif isinstance(json_data, dict):
+        if not any(isinstance(v, (dict, list)) for v in json_data.values()):
+            return pd.DataFrame([json_data])
         try:
             return pd.json_normalize([json_data])
         except Exception:
@@ -323,7 +630,48 @@ def set_cell_border(cell, **kwargs):
             tc.append(element)
 
         # Set val attribute
-        element.set(qn('w:val'), value)
+        element.set(_QN_VAL, value)
+
+
+@lru_cache(maxsize=16)
+def _shading_template(fill: str):
+    shading = OxmlElement('w:shd')
+    shading.set(_QN_FILL, fill)
+    return shading
+
+
+def _shading(fill: str):
+    """A fresh <w:shd w:fill=.../>, deep-copied from a cached template rather than built per cell."""
+    return deepcopy(_shading_template(fill))
+
+
+@lru_cache(maxsize=16)
+def _border_template(side: str, val: str, sz: str):
+    border = OxmlElement(f'w:{side}')
+    border.set(_QN_VAL, val)
+    if val != 'nil':
+        border.set(_QN_SZ, sz)
+        border.set(_QN_SPACE, '0')
+        border.set(_QN_COLOR, '000000')
+    return border
+
+
+def _border(side: str, val: str = 'single', sz: str = '4'):
+    """A fresh black tcBorders edge (e.g. <w:top w:val="single" .../>, or val='nil'), copied from a template."""
+    return deepcopy(_border_template(side, val, sz))
+
+
+@lru_cache(maxsize=16)
+def _tc_borders_template(edges: tuple):
+    borders = OxmlElement('w:tcBorders')
+    for side, val in edges:
+        borders.append(_border(side, val))
+    return borders
+
+
+def _tc_borders(*edges):
+    """A fresh <w:tcBorders> holding the given (side, val) edges in order, copied as one subtree."""
+    return deepcopy(_tc_borders_template(edges))
 
 
 def set_cell_background(cell, color, text_color=None):
@@ -335,10 +683,14 @@ def set_cell_background(cell, color, text_color=None):
         tc = OxmlElement('w:tcPr')
         cell._element.append(tc)
     
-    # Set background color
-    shading = OxmlElement('w:shd')
-    shading.set(qn('w:fill'), color)
-    tc.append(shading)
+    # Set background color, replacing any earlier shading so tcPr keeps a single w:shd
+    shd = _shading(color)
+    old = tc.find(_QN_SHD)
+    if old is None:
+        tc.append(shd)
+    else:
+        old.addprevious(shd)
+        tc.remove(old)
     
     # Set text color if provided
     if text_color and len(cell.paragraphs) > 0 and len(cell.paragraphs[0].runs) > 0:
@@ -346,6 +698,158 @@ def set_cell_background(cell, color, text_color=None):
         run.font.color.rgb = text_color
 
 
+def _grid_col_twips(table) -> int:
+    """Width of the table's first grid column in twips (python-docx splits the block width evenly)."""
+    grid_cols = table._tbl.tblGrid.gridCol_lst
+    return grid_cols[0].w.twips if grid_cols and grid_cols[0].w is not None else 0
+
+
+@lru_cache(maxsize=64)
+def _tc_open_xml(width_twips: int, align: str | None, bold: bool, italic: bool, fill: str | None, span: int,
+                 color: str | None = None, borders: str | None = None, indent: int | None = None) -> str:
+    """Everything of a <w:tc> up to its run text; only a handful of variants occur per table."""
+    tc_pr = f'<w:tcW w:type="dxa" w:w="{width_twips * span}"/>'
+    if span > 1:
+        tc_pr += f'<w:gridSpan w:val="{span}"/>'
+    if borders:
+        tc_pr += borders
+    if fill:
+        tc_pr += f'<w:shd w:fill="{fill}"/>'
+    r_pr = ('<w:rFonts w:ascii="Calibri" w:hAnsi="Calibri"/>'
+            + ('<w:b/>' if bold else '') + ('<w:i/>' if italic else '')
+            + (f'<w:color w:val="{color}"/>' if color else '') + '<w:sz w:val="16"/>')
+    p_pr = (f'<w:ind w:left="{indent}"/>' if indent else '') + (f'<w:jc w:val="{align}"/>' if align else '')
+    return (f'<w:tc><w:tcPr>{tc_pr}</w:tcPr><w:p><w:pPr>{p_pr}</w:pPr>'
+            f'<w:r><w:rPr>{r_pr}</w:rPr>')
+
+
+def _edge_xml(side: str, val: str = 'single', sz: str = '4') -> str:
+    """A tcBorders edge serialized the way _border(side, val, sz) builds it."""
+    if val == 'nil':
+        return f'<w:{side} w:val="nil"/>'
+    return f'<w:{side} w:val="{val}" w:sz="{sz}" w:space="0" w:color="000000"/>'
+
+
+def _top_border_xml(sz: str) -> str:
+    """tcBorders with a black single top edge, as _border('top', sz=sz) serializes."""
+    return f'<w:tcBorders>{_edge_xml("top", sz=sz)}</w:tcBorders>'
+
+
+_RUN_BREAKS_RE = re.compile(r'([\t\r\n])')
+
+
+def _run_text_xml(text: str) -> str:
+    """Run content for `text` as python-docx writes it: tabs become <w:tab/>, CR/LF <w:br/>."""
+    parts = []
+    for piece in _RUN_BREAKS_RE.split(text):
+        if piece == '\t':
+            parts.append('<w:tab/>')
+        elif piece in ('\r', '\n'):
+            parts.append('<w:br/>')
+        elif piece:
+            space = ' xml:space="preserve"' if piece != piece.strip() else ''
+            parts.append(f'<w:t{space}>{xml_escape(piece)}</w:t>')
+    return ''.join(parts)
+
+
+def _tc_xml(text: str, width_twips: int, align: str = 'left', bold: bool = False, italic: bool = False,
+            fill: str | None = None, span: int = 1, color: str | None = None, borders: str | None = None,
+            indent: int | None = None) -> str:
+    """
+    Serialize one table cell as <w:tc> XML: a single Calibri 8pt run, the same
+    markup python-docx writes for cell.text plus the run/paragraph formatting.
+    `borders` is a serialized <w:tcBorders>; `indent` a left indent in twips.
+    """
+    return (f'{_tc_open_xml(width_twips, align, bold, italic, fill, span, color, borders, indent)}'
+            f'{_run_text_xml(text) if text else ""}</w:r></w:p></w:tc>')
+
+
+def _empty_tc_xml(width_twips: int, align: str | None = None, run: bool = True, borders: str | None = None) -> str:
+    """
+    A cell whose text was set to '' and left unstyled, as python-docx writes it;
+    run=False gives a cell whose text was never set.
+    """
+    tc_pr = f'<w:tcW w:type="dxa" w:w="{width_twips}"/>' + (borders or '')
+    p_pr = f'<w:pPr><w:jc w:val="{align}"/></w:pPr>' if align else ''
+    return f'<w:tc><w:tcPr>{tc_pr}</w:tcPr><w:p>{p_pr}{"<w:r/>" if run else ""}</w:p></w:tc>'
+
+
+def _header_row_xml(labels, width_twips: int) -> str:
+    """Bold, light-gray header row; first column left aligned, the rest centered."""
+    return '<w:tr>' + ''.join(
+        _tc_xml(str(label), width_twips, 'center' if i > 0 else 'left', bold=True, fill="D3D3D3")
+        for i, label in enumerate(labels)
+    ) + '</w:tr>'
+
+
+def _data_row_xml(texts, width_twips: int, bold: bool = False) -> str:
+    """Data row; first column left aligned, the rest centered."""
+    return '<w:tr>' + ''.join(
+        _tc_xml(text, width_twips, 'center' if j > 0 else 'left', bold=bold)
+        for j, text in enumerate(texts)
+    ) + '</w:tr>'
+
+
+def _append_rows_xml(table, rows_xml):
+    """Parse the serialized <w:tr> rows once and append them to the table."""
+    fragment = parse_xml(f'<w:tbl {nsdecls("w")}>{"".join(rows_xml)}</w:tbl>')
+    table._tbl.extend(list(fragment))
+
+
+# Left indent (0.15") of the % Margin / % YoY Growth / Other labels in the HFA table
+_HFA_INDENT_TWIPS = 216
+
+# Top rule of the HFA separator rows; the cell's inner verticals are removed
+_HFA_SEPARATOR_EDGES = _edge_xml('top') + _edge_xml('left', 'nil') + _edge_xml('right', 'nil')
+
+
+@lru_cache(maxsize=256)
+def _hfa_edges_xml(col_idx: int, num_cols: int) -> str:
+    """Table edge verticals for an HFA grid column: left on the first, right on the last."""
+    return (_edge_xml('left', 'single' if col_idx == 0 else 'nil')
+            + _edge_xml('right', 'single' if col_idx == num_cols - 1 else 'nil'))
+
+
+def _hfa_row_xml(texts, width_twips: int, bold: bool = False, separator: bool = False,
+                 label: tuple | None = None) -> str:
+    """
+    One HFA data row as <w:tr> XML, edge borders included. `label` is
+    (bold, italic) for an indented first-column label, e.g. % Margin.
+    """
+    num_cols = len(texts)
+    cells = []
+    for j, text in enumerate(texts):
+        borders = (f'<w:tcBorders>{_HFA_SEPARATOR_EDGES if separator else ""}'
+                   f'{_hfa_edges_xml(j, num_cols)}</w:tcBorders>')
+        align = 'center' if j > 0 else 'left'
+        if not text:
+            cells.append(_empty_tc_xml(width_twips, align, borders=borders))
+        elif j == 0 and label:
+            cells.append(_tc_xml(text, width_twips, None, bold=label[0], italic=label[1], borders=borders,
+                                 indent=_HFA_INDENT_TWIPS))
+        else:
+            cells.append(_tc_xml(text, width_twips, align, bold=bold, borders=borders))
+    return '<w:tr>' + ''.join(cells) + '</w:tr>'
+
+
+@lru_cache(maxsize=16)
+def _hfa_kfr_row_xml(width_twips: int, num_cols: int) -> str:
+    """
+    The 'Key Financial Ratios:' header row of the HFA table: 14pt high, a bold
+    italic label on light gray merged across the full width.
+    """
+    tc_pr = f'<w:tcW w:type="dxa" w:w="{width_twips * num_cols}"/>'
+    if num_cols > 1:
+        tc_pr += f'<w:gridSpan w:val="{num_cols}"/>'
+    tc_pr += ('<w:vAlign w:val="center"/><w:shd w:fill="D3D3D3"/><w:tcBorders>'
+              + _edge_xml('left', 'single') + _edge_xml('right', 'single') + '</w:tcBorders>')
+    label = ('<w:p><w:pPr><w:spacing w:before="0" w:after="0"/><w:jc w:val="center"/></w:pPr><w:r/>'
+             '<w:r><w:rPr><w:rFonts w:ascii="Calibri" w:hAnsi="Calibri"/><w:b/><w:i/><w:color w:val="000000"/>'
+             '<w:sz w:val="16"/></w:rPr><w:t>Key Financial Ratios:</w:t></w:r></w:p>')
+    return (f'<w:tr><w:trPr><w:trHeight w:val="280"/></w:trPr>'
+            f'<w:tc><w:tcPr>{tc_pr}</w:tcPr>{label}</w:tc></w:tr>')
+
+
 def set_table_fixed_width(table, width_in: float):
     """Force a table to a fixed width by setting tblW and a fixed layout.
     This prevents Word from shrinking the table when cells are mostly empty.
@@ -357,19 +861,19 @@ def set_table_fixed_width(table, width_in: float):
             tblPr = OxmlElement('w:tblPr')
             tbl.append(tblPr)
         # Set fixed layout
-        tblLayout = tblPr.find(qn('w:tblLayout'))
+        tblLayout = tblPr.find(_QN_TBLLAYOUT)
         if tblLayout is None:
             tblLayout = OxmlElement('w:tblLayout')
             tblPr.append(tblLayout)
-        tblLayout.set(qn('w:type'), 'fixed')
+        tblLayout.set(_QN_TYPE, 'fixed')
         # Set width in twips (1 inch = 1440 twips)
         twips = int(width_in * 1440)
-        tblW = tblPr.find(qn('w:tblW'))
+        tblW = tblPr.find(_QN_TBLW)
         if tblW is None:
             tblW = OxmlElement('w:tblW')
             tblPr.append(tblW)
-        tblW.set(qn('w:w'), str(twips))
-        tblW.set(qn('w:type'), 'dxa')
+        tblW.set(_QN_W, str(twips))
+        tblW.set(_QN_TYPE, 'dxa')
     except Exception:
         pass
 
@@ -420,16 +924,16 @@ def add_header_footer(doc, company_name=None):
     # Add page number field
     run = footer_para.add_run()
     fld_char = OxmlElement('w:fldChar')
-    fld_char.set(qn('w:fldCharType'), 'begin')
+    fld_char.set(_QN_FLDCHARTYPE, 'begin')
     run._element.append(fld_char)
     
     instr_text = OxmlElement('w:instrText')
-    instr_text.set(qn('xml:space'), 'preserve')
+    instr_text.set(_QN_XML_SPACE, 'preserve')
     instr_text.text = "PAGE"
     run._element.append(instr_text)
     
     fld_char = OxmlElement('w:fldChar')
-    fld_char.set(qn('w:fldCharType'), 'end')
+    fld_char.set(_QN_FLDCHARTYPE, 'end')
     run._element.append(fld_char)
     
     # Format footer text
@@ -456,7 +960,8 @@ def create_word_document(df, analysis_text, data_file, company_name=None):
     # Add header and footer
     add_header_footer(doc, company_name)
     
-    # Create table from DataFrame
+    # Create table from DataFrame; the rows are serialized to XML and parsed in one go
+    # rather than filled cell by cell through python-docx
     if data_file.endswith('.csv'):
         # Special handling for CSV files to create a two-row header
         if len(df) >= 2:
@@ -468,197 +973,83 @@ def create_word_document(df, analysis_text, data_file, company_name=None):
             df = df.iloc[1:].reset_index(drop=True)
             
             # Create table with appropriate dimensions
-            num_rows = len(df) + 2  # +2 for the two header rows
             num_cols = len(df.columns)
-            table = doc.add_table(rows=num_rows, cols=num_cols)
+            table = doc.add_table(rows=0, cols=num_cols)
             table.style = 'Table Grid'
-            
-            # Fill in the header rows
-            for i, cell_text in enumerate(header_row1):
-                cell = table.cell(0, i)
-                cell.text = str(cell_text)
-                # Format header cell
-                cell_para = cell.paragraphs[0]
-                cell_para.alignment = WD_ALIGN_PARAGRAPH.CENTER if i > 0 else WD_ALIGN_PARAGRAPH.LEFT
-                run = cell_para.runs[0]
-                run.font.name = 'Calibri'
-                run.font.size = Pt(8)
-                run.font.bold = True
-                # Set background color
-                shading = OxmlElement('w:shd')
-                shading.set(qn('w:fill'), "D3D3D3")  # Light gray
-                cell._element.tcPr.append(shading)
-            
-            for i, cell_text in enumerate(header_row2):
-                cell = table.cell(1, i)
-                cell.text = str(cell_text) if cell_text != '' else ''
-                # Format header cell
-                cell_para = cell.paragraphs[0]
-                cell_para.alignment = WD_ALIGN_PARAGRAPH.CENTER if i > 0 else WD_ALIGN_PARAGRAPH.LEFT
-                run = cell_para.runs[0]
-                run.font.name = 'Calibri'
-                run.font.size = Pt(8)
-                run.font.bold = True
-                # Set background color
-                shading = OxmlElement('w:shd')
-                shading.set(qn('w:fill'), "D3D3D3")  # Light gray
-                cell._element.tcPr.append(shading)
-            
-            # Fill in the data rows
-            # Track the Word row index of the 'Key Financial Ratios:' header (two header rows offset)
-            ratio_header_word_row_idx = None
-            for i, row in enumerate(df.values):
-                for j, cell_text in enumerate(row):
-                    cell = table.cell(i + 2, j)  # +2 to account for the header rows
-                    cell.text = str(cell_text) if cell_text != '' else ''
-                    # Format data cell
-                    cell_para = cell.paragraphs[0]
-                    cell_para.alignment = WD_ALIGN_PARAGRAPH.CENTER if j > 0 else WD_ALIGN_PARAGRAPH.LEFT
-                    run = cell_para.runs[0]
-                    run.font.name = 'Calibri'
-                    run.font.size = Pt(8)  # Increased font size
-                    
-                    # Check for special formatting
-                    first_cell_value = str(df.iloc[i, 0]) if len(df.columns) > 0 else ""
-                    exact_keywords = ["Total Debt", "Total Debt + COLs", "Book Capitalization", "Market Capitalization"]
-                    
-                    if first_cell_value in exact_keywords:
-                        # Make the entire row bold
-                        run.font.bold = True
-                        # Add indent to first column if this is the first cell
-                        if j == 0:
-                            cell.text = f"   {first_cell_value}"
-                    
-                    # Special handling for "Key Financial Ratios:"
-                    elif first_cell_value == "Key Financial Ratios:":
-                        if j == 0:
-                            # Span the cell across all columns
-                            for k in range(1, num_cols):
-                                table.cell(i + 2, 0).merge(table.cell(i + 2, k))
-                            # Format the cell
-                            cell.text = first_cell_value
-                            cell_para = cell.paragraphs[0]
-                            cell_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                            run = cell_para.runs[0]
-                            run.font.name = 'Calibri'
-                            run.font.size = Pt(8)
-                            run.font.bold = True
-                            run.italic = True
-                            # Set background color to light gray
-                            shading = OxmlElement('w:shd')
-                            shading.set(qn('w:fill'), "D3D3D3")  # Light gray
-                            cell._element.tcPr.append(shading)
+            tc_width = _grid_col_twips(table)
+
+            # Header rows
+            rows_xml = [_header_row_xml(header_row1, tc_width), _header_row_xml(header_row2, tc_width)]
+
+            # Data rows
+            exact_keywords = {"Total Debt", "Total Debt + COLs", "Book Capitalization", "Market Capitalization"}
+            first_col = [str(v) for v in df.iloc[:, 0]] if num_cols > 0 else [""] * len(df)
+            for i, row in enumerate(df.itertuples(index=False, name=None)):
+                first_cell_value = first_col[i]
+                if first_cell_value == "Key Financial Ratios:":
+                    # One shaded cell spanning all columns
+                    rows_xml.append('<w:tr>' + _tc_xml(first_cell_value, tc_width, 'center', bold=True, italic=True,
+                                                        fill="D3D3D3", span=num_cols) + '</w:tr>')
+                    continue
+                # Bold rows get the whole row bold and an indented label
+                bold = first_cell_value in exact_keywords
+                texts = [str(v) for v in row]
+                if bold:
+                    texts[0] = f"   {first_cell_value}"
+                rows_xml.append(_data_row_xml(texts, tc_width, bold))
+            _append_rows_xml(table, rows_xml)
             
             # Set column widths
             # First column gets 45% of the table width, remaining columns share the rest
             table.autofit = False
             table.allow_autofit = False
-            for i, column in enumerate(table.columns):
-                if i == 0:
-                    column.width = Inches(3.5)  # 45% of ~7.27 inches (A4 width minus margins)
-                else:
-                    column.width = Inches(3.77 / (num_cols - 1))  # Remaining width divided among other columns
+            # 45% of ~7.27 inches (A4 width minus margins) for the labels, the rest divided evenly
+            set_grid_widths(table, [3.5] + [3.77 / (num_cols - 1)] * (num_cols - 1))
         
         else:
             # If there aren't enough rows for a two-row header, use a single row header
-            num_rows = len(df) + 1  # +1 for the header row
             num_cols = len(df.columns)
-            table = doc.add_table(rows=num_rows, cols=num_cols)
+            table = doc.add_table(rows=0, cols=num_cols)
             table.style = 'Table Grid'
-            
-            # Fill in the header row
-            for i, cell_text in enumerate(df.columns):
-                cell = table.cell(0, i)
-                cell.text = str(cell_text)
-                # Format header cell
-                cell_para = cell.paragraphs[0]
-                cell_para.alignment = WD_ALIGN_PARAGRAPH.CENTER if i > 0 else WD_ALIGN_PARAGRAPH.LEFT
-                run = cell_para.runs[0]
-                run.font.name = 'Calibri'
-                run.font.size = Pt(8)
-                run.font.bold = True
-                # Set background color
-                shading = OxmlElement('w:shd')
-                shading.set(qn('w:fill'), "D3D3D3")  # Light gray
-                cell._element.tcPr.append(shading)
-            
-            # Fill in the data rows
-            for i, row in enumerate(df.values):
-                for j, cell_text in enumerate(row):
-                    cell = table.cell(i + 1, j)  # +1 to account for the header row
-                    cell.text = str(cell_text) if cell_text != '' else ''
-                    # Format data cell
-                    cell_para = cell.paragraphs[0]
-                    cell_para.alignment = WD_ALIGN_PARAGRAPH.CENTER if j > 0 else WD_ALIGN_PARAGRAPH.LEFT
-                    run = cell_para.runs[0]
-                    run.font.name = 'Calibri'
-                    run.font.size = Pt(8)  # Increased font size
+            tc_width = _grid_col_twips(table)
+
+            rows_xml = [_header_row_xml(df.columns, tc_width)]
+            rows_xml.extend(_data_row_xml([str(v) for v in row], tc_width)
+                            for row in df.itertuples(index=False, name=None))
+            _append_rows_xml(table, rows_xml)
             
             # Set column widths
             table.autofit = False
             table.allow_autofit = False
-            for i, column in enumerate(table.columns):
-                if i == 0:
-                    column.width = Inches(2.5)  # 30% of ~8.27 inches (A4 width)
-                else:
-                    column.width = Inches(4.77 / (num_cols - 1))  # Remaining width divided among other columns
+            # 30% of ~8.27 inches (A4 width) for the labels, the rest divided evenly
+            set_grid_widths(table, [2.5] + [4.77 / (num_cols - 1)] * (num_cols - 1))
     
     else:
         # Original handling for non-CSV files
-        num_rows = len(df) + 1  # +1 for the header row
         num_cols = len(df.columns)
-        table = doc.add_table(rows=num_rows, cols=num_cols)
+        table = doc.add_table(rows=0, cols=num_cols)
         table.style = 'Table Grid'
-        
-        # Fill in the header row
-        for i, cell_text in enumerate(df.columns):
-            cell = table.cell(0, i)
-            cell.text = str(cell_text)
-            # Format header cell
-            cell_para = cell.paragraphs[0]
-            cell_para.alignment = WD_ALIGN_PARAGRAPH.CENTER if i > 0 else WD_ALIGN_PARAGRAPH.LEFT
-            run = cell_para.runs[0]
-            run.font.name = 'Calibri'
-            run.font.size = Pt(8)
-            run.font.bold = True
-            # Set background color
-            shading = OxmlElement('w:shd')
-            shading.set(qn('w:fill'), "D3D3D3")  # Light gray
-            cell._element.tcPr.append(shading)
-        
-        # Fill in the data rows
-        for i, row in enumerate(df.values):
-            for j, cell_text in enumerate(row):
-                cell = table.cell(i + 1, j)  # +1 to account for the header row
-                cell.text = str(cell_text) if cell_text != '' else ''
-                # Format data cell
-                cell_para = cell.paragraphs[0]
-                cell_para.alignment = WD_ALIGN_PARAGRAPH.CENTER if j > 0 else WD_ALIGN_PARAGRAPH.LEFT
-                run = cell_para.runs[0]
-                run.font.name = 'Calibri'
-                run.font.size = Pt(8)  # Increased font size
-                
-                # Styling based on first column content
-                first_cell_value = str(df.iloc[i, 0]) if len(df.columns) > 0 else ""
-                if any(keyword in first_cell_value for keyword in ["Total Debt", "Book Capitalization", "Market Capitalization"]):
-                    # Make the entire row bold
-                    run.font.bold = True
-                    # Add indent to first column if this is the first cell
-                    if j == 0:
-                        cell.text = f"   {first_cell_value}"
-                        run = cell.paragraphs[0].runs[0]
-                        run.font.name = 'Calibri'
-                        run.font.size = Pt(8)  # Increased font size
-                        run.font.bold = True
+        tc_width = _grid_col_twips(table)
+
+        rows_xml = [_header_row_xml(df.columns, tc_width)]
+        first_col = [str(v) for v in df.iloc[:, 0]] if num_cols > 0 else [""] * len(df)
+        for i, row in enumerate(df.itertuples(index=False, name=None)):
+            # Styling based on first column content
+            first_cell_value = first_col[i]
+            bold = any(keyword in first_cell_value
+                       for keyword in ("Total Debt", "Book Capitalization", "Market Capitalization"))
+            texts = [str(v) for v in row]
+            if bold:
+                # Make the entire row bold and indent the label
+                texts[0] = f"   {first_cell_value}"
+            rows_xml.append(_data_row_xml(texts, tc_width, bold))
+        _append_rows_xml(table, rows_xml)
         
         # Set column widths
         table.autofit = False
         table.allow_autofit = False
-        for i, column in enumerate(table.columns):
-            if i == 0:
-                column.width = Inches(1.65)  # 20% of ~8.27 inches (A4 width)
-            else:
-                column.width = Inches(5.62 / (num_cols - 1))  # Remaining width divided among other columns
+        # 20% of ~8.27 inches (A4 width) for the labels, the rest divided evenly
+        set_grid_widths(table, [1.65] + [5.62 / (num_cols - 1)] * (num_cols - 1))
     
     # Add a page break after the table
     doc.add_paragraph().add_run().add_break()
@@ -674,7 +1065,9 @@ def create_word_document(df, analysis_text, data_file, company_name=None):
 def build_word_bytes_from_ticker(ticker: str,
                                 hfa_dir: str = os.path.join('output', 'json', 'hfa_output'),
                                 fsa_dir: str = os.path.join('output', 'json', 'financial_analysis'),
-                                prefetched_data: dict = None) -> bytes:
+                                prefetched_data: dict = None,
+                                force_refresh: bool = False,
+                                output=None) -> bytes | None:
     """
     Build the Word document for a given ticker by calling the HFA API and using its rows:
     - HFA table data from: POST {BASE_URL}/api/v1/hfa with body {"ticker": TICKER}
@@ -682,7 +1075,9 @@ def build_word_bytes_from_ticker(ticker: str,
     - Financial Statement Analysis from: output/json/financial_analysis/{TICKER}_FSA.json
     - CAP table data from: POST {BASE_URL}/api/v1/cap-table with body {"ticker": TICKER}
     - COMP table data from: POST {BASE_URL}/api/v1/comp with body {"ticker": TICKER}
-    Returns raw Word document bytes.
+    API payloads are reused from output/cache for the day; force_refresh=True refetches them.
+    Returns raw Word document bytes, or saves straight to `output` (a path or binary
+    file object) and returns None, skipping the in-memory copy of the document.
     """
     if not ticker:
         raise ValueError("No ticker provided.")
@@ -701,20 +1096,24 @@ def build_word_bytes_from_ticker(ticker: str,
         # Call HFA API to get rows for the table
         api_base = os.getenv('APP_BASE_URL', 'http://127.0.0.1:9259')
         api_url = f"{api_base.rstrip('/')}/api/v1/hfa"
+        # The API calls are independent and I/O-bound, so issue them together;
+        # shutdown(wait=False) lets an early HFA failure return without waiting on the rest
+        pool = ThreadPoolExecutor(max_workers=len(_WORD_API_TIMEOUTS) + 1)
         try:
-            resp = requests.post(api_url, json={"ticker": ticker}, timeout=300)
-        except requests.RequestException as e:
-            raise RuntimeError(f"Failed to call HFA API at {api_url}: {e}")
-        if resp.status_code != 200:
-            try:
-                err_detail = resp.json()
-            except Exception:
-                err_detail = resp.text
-            raise RuntimeError(f"HFA API returned {resp.status_code}: {err_detail}")
+            pending = {ep: pool.submit(cached_post_json, ep, ticker, timeout, force_refresh)
+                       for ep, timeout in _WORD_API_TIMEOUTS.items()}
+            # The FSA file is read alongside the API calls
+            fsa_future = pool.submit(_read_json_file, fsa_path)
+        finally:
+            pool.shutdown(wait=False)
         try:
-            payload = resp.json()
-        except Exception as e:
+            status, payload = pending['hfa'].result()
+        except ValueError as e:
             raise RuntimeError(f"Invalid JSON from HFA API: {e}")
+        except requests.RequestException as e:
+            raise RuntimeError(f"Failed to call HFA API at {api_url}: {e}")
+        if status != 200:
+            raise RuntimeError(f"HFA API returned {status}: {payload}")
         hfa_rows = payload.get("rows")
         if not isinstance(hfa_rows, list) or not hfa_rows:
             raise RuntimeError("HFA API response missing 'rows' list with data")
@@ -722,32 +1121,14 @@ def build_word_bytes_from_ticker(ticker: str,
         # Fetch Credit Risk Metrics data (non-fatal)
         credit_data = None
         try:
-            credit_url = f"{api_base.rstrip('/')}/api/v1/credit_table"
-            credit_resp = requests.post(credit_url, json={"ticker": ticker}, timeout=300)
-            if credit_resp.status_code == 200:
+            status, credit_payload = pending['credit_table'].result()
+            if status == 200:
                 try:
-                    credit_payload = credit_resp.json()
                     if isinstance(credit_payload, dict):
                         credit_data = credit_payload.get("json_data")
                         # Fallback: parse raw JSON string if provided by API
                         if credit_data is None and isinstance(credit_payload.get("json_data_raw"), str):
-                            raw = credit_payload.get("json_data_raw")
-                            def _try_parse_json_text(s: str):
-                                try:
-                                    return json.loads(s)
-                                except Exception:
-                                    # sanitize and retry: remove trailing commas and trim to outer braces
-                                    s2 = s.strip()
-                                    if s2.startswith("```"):
-                                        s2 = s2.strip('`')
-                                    s2 = re.sub(r",\s*([}\\]])", r"\1", s2)
-                                    if '{' in s2 and '}' in s2:
-                                        s2 = s2[s2.find('{'): s2.rfind('}') + 1]
-                                    try:
-                                        return json.loads(s2)
-                                    except Exception:
-                                        return None
-                            credit_data = _try_parse_json_text(raw)
+                            credit_data = _try_parse_json_text(credit_payload.get("json_data_raw"))
                 except Exception:
                     credit_data = None
         except Exception:
@@ -756,11 +1137,9 @@ def build_word_bytes_from_ticker(ticker: str,
         # Fetch Company Exposure Details table (non-fatal)
         company_exposure = None
         try:
-            company_url = f"{api_base.rstrip('/')}/api/v1/company-table"
-            company_resp = requests.post(company_url, json={"ticker": ticker}, timeout=120)
-            if company_resp.status_code == 200:
+            status, company_payload = pending['company-table'].result()
+            if status == 200:
                 try:
-                    company_payload = company_resp.json()
                     if isinstance(company_payload, dict):
                         company_exposure = company_payload.get("table")
                 except Exception:
@@ -771,32 +1150,14 @@ def build_word_bytes_from_ticker(ticker: str,
         # Fetch CAP table JSON from API (non-fatal if unavailable)
         cap_json = None
         try:
-            cap_url = f"{api_base.rstrip('/')}/api/v1/cap-table"
-            cap_resp = requests.post(cap_url, json={"ticker": ticker}, timeout=300)
-            if cap_resp.status_code == 200:
+            status, cap_payload = pending['cap-table'].result()
+            if status == 200:
                 try:
-                    cap_payload = cap_resp.json()
                     if isinstance(cap_payload, dict):
                         cap_json = cap_payload.get("json_data")
                         # Fallback: parse raw JSON string if provided by API
                         if cap_json is None and isinstance(cap_payload.get("json_data_raw"), str):
-                            raw = cap_payload.get("json_data_raw")
-                            def _try_parse_json_text(s: str):
-                                try:
-                                    return json.loads(s)
-                                except Exception:
-                                    # sanitize and retry: remove trailing commas and trim to outer braces
-                                    s2 = s.strip()
-                                    if s2.startswith("```"):
-                                        s2 = s2.strip('`')
-                                    s2 = re.sub(r",\s*([}\]])", r"\1", s2)
-                                    if '{' in s2 and '}' in s2:
-                                        s2 = s2[s2.find('{'): s2.rfind('}') + 1]
-                                    try:
-                                        return json.loads(s2)
-                                    except Exception:
-                                        return None
-                            cap_json = _try_parse_json_text(raw)
+                            cap_json = _try_parse_json_text(cap_payload.get("json_data_raw"))
                 except Exception:
                     cap_json = None
         except Exception:
@@ -804,11 +1165,9 @@ def build_word_bytes_from_ticker(ticker: str,
         # Fetch COMP rows from API (non-fatal if unavailable)
         comp_rows = None
         try:
-            comp_url = f"{api_base.rstrip('/')}/api/v1/comp"
-            comp_resp = requests.post(comp_url, json={"ticker": ticker}, timeout=300)
-            if comp_resp.status_code == 200:
+            status, comp_payload = pending['comp'].result()
+            if status == 200:
                 try:
-                    comp_payload = comp_resp.json()
                     if isinstance(comp_payload, dict):
                         comp_rows = comp_payload.get("rows")
                 except Exception:
@@ -816,73 +1175,51 @@ def build_word_bytes_from_ticker(ticker: str,
         except Exception:
             comp_rows = None
         # Load FSA data if available
-        fsa_data = None
-        if os.path.exists(fsa_path):
-            with open(fsa_path, 'r') as f:
-                try:
-                    fsa_data = json.load(f)
-                except Exception:
-                    fsa_data = None
+        fsa_data = fsa_future.result()
 
     # Convert HFA rows to DataFrame
     df = json_to_dataframe(hfa_rows)
-    # Clean NaNs for rendering
-    df = df.replace({np.nan: '-'})
-    df = df.replace({None: '-'})
-    df = df.replace({0: '-'})
+    # Clean NaNs, Nones and zeros for rendering in a single pass
+    df = df.replace({np.nan: '-', None: '-', 0: '-'})
     # Format numbers per metric type.
     # IMPORTANT: Do NOT divide by 1000 for percentage or ratio rows; these are formatted later.
     percentage_metrics = {'% YoY Growth', '% Margin'}
-    ratio_keywords = [
-        'EBITDA / Int',
-        'EBITDA / Interest',
-        'EBITDAR / Interest',
-        'EBITDAR / Interest + Rent',
-        'Total Debt / EBITDA',
-        'Total Debt + Leases / EBITDA',
-        'Total Debt / Book',
-        'Total Debt + Leases / Book',
-    ]
-    # Specific ratio metrics that should be displayed as percentages (not with 'x')
-    percentage_ratio_metrics = {
-        'Total Debt / Book Capital',
-        'Total Debt + Leases / Book Capital',
-    }
     if 'Metric' in df.columns:
-        for i, row in df.iterrows():
-            metric_name = str(row['Metric'])
-            for col in df.columns:
-                if col == 'Metric':
-                    continue
-                val = row[col]
-                if val == '':
-                    df.at[i, col] = ''
-                    continue
-                if (metric_name in percentage_metrics) or any(k in metric_name for k in ratio_keywords):
-                    # keep raw, will format later
-                    df.at[i, col] = val
-                else:
-                    df.at[i, col] = format_number_for_display(val)
-    else:
-        # Fallback if no Metric column exists
-        for col in df.columns:
-            df[col] = df[col].apply(lambda x: format_number_for_display(x) if x != '' else '')
+        # Keep raw values for percentage and ratio rows (no /1000 scaling); they are formatted later
+        metric = df['Metric'].astype(str)
+        raw_mask = metric.isin(percentage_metrics) | metric.str.contains(_RATIO_RE, regex=True)
+        value_cols = [c for c in df.columns if c != 'Metric']
+        scale_rows = (~raw_mask).to_numpy()
+        if value_cols and scale_rows.any():
+            # Format every scaled cell in one pass over the flattened value block
+            values = df[value_cols].to_numpy(dtype=object)
+            block = values[scale_rows]
+            values[scale_rows] = _format_number_column(pd.Series(block.ravel())).to_numpy().reshape(block.shape)
+            df[value_cols] = pd.DataFrame(values, index=df.index, columns=value_cols)
+    elif df.size:
+        # Fallback if no Metric column exists: every cell is scaled, again in
+        # one pass over the flattened frame rather than one per column
+        values = df.to_numpy(dtype=object)
+        formatted = _format_number_column(pd.Series(values.ravel())).to_numpy().reshape(values.shape)
+        df = pd.DataFrame(formatted, index=df.index, columns=df.columns)
     # Special formatting for percentage rows
-    for i, row in enumerate(df.values):
-        metric = str(row[0]) if row[0] != '' else ''
-        if metric in ['% YoY Growth', '% Margin'] or metric in percentage_ratio_metrics:
-            for j, val in enumerate(row):
-                if j > 0 and val not in ['', '-']:
-                    try:
-                        # Format as percentage with one decimal place
-                        num_val = float(val.replace('(', '-').replace(')', '').replace(',', '')) if isinstance(val, str) else float(val)
-                        if num_val < 0:
-                            df.iloc[i, j] = f'({abs(num_val):.1f}%)'
-                        else:
-                            df.iloc[i, j] = f'{num_val:.1f}%'
-                    except:
-                        # Keep as is if conversion fails
-                        pass
+    if not df.empty:
+        first_col = df.iloc[:, 0].astype(str)
+        pct_rows = first_col.isin(percentage_metrics | _PCT_RATIO_METRICS).to_numpy()
+        value_cols = df.columns[1:]
+        if pct_rows.any() and len(value_cols):
+            values = df[value_cols].to_numpy(dtype=object)
+            block = values[pct_rows]
+            cells = pd.Series(block.ravel())
+            # Format as percentage with one decimal place
+            num = pd.to_numeric(cells.astype(str).str.translate(_SIGN_TRANS), errors='coerce')
+            # Keep as is if conversion fails
+            fmt_mask = (~cells.isin(['', '-']) & num.notna()).to_numpy()
+            if fmt_mask.any():
+                flat = block.ravel()
+                flat[fmt_mask] = _format_pct_array(num.to_numpy()[fmt_mask])
+                values[pct_rows] = flat.reshape(block.shape)
+                df[value_cols] = pd.DataFrame(values, index=df.index, columns=value_cols)
     # Ensure 'Metric' is the first column if present
     if 'Metric' in df.columns:
         cols = df.columns.tolist()
@@ -890,36 +1227,13 @@ def build_word_bytes_from_ticker(ticker: str,
         df = df[['Metric'] + cols]
     # Reorder columns into: Metric | years (asc) | YTD years (asc) | LTM years (asc)
     # Also capture groups to construct a two-row header later
-    all_cols = df.columns.tolist()
-    year_cols = [c for c in all_cols if isinstance(c, str) and c.isdigit() and len(c) == 4]
-    try:
-        year_cols_sorted = sorted(year_cols, key=lambda x: int(x))
-    except Exception:
-        year_cols_sorted = year_cols
-    ytd_cols = [c for c in all_cols if isinstance(c, str) and c.startswith('YTD ')]
-    try:
-        ytd_cols_sorted = sorted(ytd_cols, key=lambda x: int(x.split()[1]))
-    except Exception:
-        ytd_cols_sorted = ytd_cols
-    ltm_cols = [c for c in all_cols if isinstance(c, str) and c.startswith('LTM ')]
-    try:
-        ltm_cols_sorted = sorted(ltm_cols, key=lambda x: int(x.split()[1]))
-    except Exception:
-        ltm_cols_sorted = ltm_cols
-    ordered_cols = ['Metric']
-    ordered_cols += [c for c in year_cols_sorted if c in all_cols]
-    ordered_cols += [c for c in ytd_cols_sorted if c in all_cols]
-    ordered_cols += [c for c in ltm_cols_sorted if c in all_cols]
-    # Only reorder if all expected columns present
-    if all(c in all_cols for c in ordered_cols) and len(ordered_cols) == len(all_cols):
-        df = df[ordered_cols]
+    reorder, year_cols, ytd_cols, ltm_cols = _hfa_column_layout(tuple(df.columns))
+    if reorder:
+        df = df[['Metric', *year_cols, *ytd_cols, *ltm_cols]]
 
     # Get company title
     company_title = get_company_title_from_ticker(ticker)
 
-    # Generate the Word document in-memory
-    buffer = BytesIO()
-    
     # Create Word document
     doc = Document()
     
@@ -952,63 +1266,34 @@ def build_word_bytes_from_ticker(ticker: str,
             # Create 6-column table: (Label|Value) x 3
             rows_needed = len(labels_grid)
             doc.add_paragraph()  # spacing before
-            det_table = doc.add_table(rows=rows_needed, cols=6)
+            det_table = doc.add_table(rows=0, cols=6)
             det_table.style = 'Table Grid'
             det_table.autofit = False
             det_table.allow_autofit = False
+            tc_width = _grid_col_twips(det_table)
 
             # Column widths to fit within ~7.27 inches usable width
             try:
-                det_table.columns[0].width = Inches(1.20)  # L1
-                det_table.columns[1].width = Inches(1.22)  # V1
-                det_table.columns[2].width = Inches(1.20)  # L2
-                det_table.columns[3].width = Inches(1.22)  # V2
-                det_table.columns[4].width = Inches(1.20)  # L3
-                det_table.columns[5].width = Inches(1.22)  # V3
+                set_grid_widths(det_table, [1.20, 1.22, 1.20, 1.22, 1.20, 1.22])  # L1 V1 L2 V2 L3 V3
             except Exception:
                 pass
 
             def _val(x):
                 return '-' if (x is None or str(x).strip() == '') else str(x)
 
-            # Helper to style a label cell
-            def _style_label_cell(c):
-                para = c.paragraphs[0]
-                para.alignment = WD_ALIGN_PARAGRAPH.LEFT
-                run = para.runs[0]
-                run.font.name = 'Calibri'
-                run.font.size = Pt(8)
-                run.font.bold = True
-                run.font.color.rgb = RGBColor(255, 255, 255)
-                set_cell_background(c, "44546A", RGBColor(255, 255, 255))
-
-            # Helper to style a value cell
-            def _style_value_cell(c):
-                para = c.paragraphs[0]
-                para.alignment = WD_ALIGN_PARAGRAPH.LEFT
-                if c.text:
-                    run = para.runs[0]
-                    run.font.name = 'Calibri'
-                    run.font.size = Pt(8)
-
-            # Populate rows
-            for r, row_labels in enumerate(labels_grid):
+            # Populate rows: white-on-dark-blue labels, plain values, empty pairs left blank
+            rows_xml = []
+            for row_labels in labels_grid:
+                cells_xml = []
                 for pair_idx in range(3):
                     label = row_labels[pair_idx] if pair_idx < len(row_labels) else None
-                    lcol = pair_idx * 2
                     if label:
-                        # Label cell
-                        lcell = det_table.cell(r, lcol)
-                        lcell.text = f"{label}:"
-                        _style_label_cell(lcell)
-                        # Value cell
-                        vcell = det_table.cell(r, lcol + 1)
-                        vcell.text = _val(company_exposure.get(label))
-                        _style_value_cell(vcell)
+                        cells_xml.append(_tc_xml(f"{label}:", tc_width, bold=True, fill="44546A", color="FFFFFF"))
+                        cells_xml.append(_tc_xml(_val(company_exposure.get(label)), tc_width))
                     else:
-                        # Empty pair - clear both cells
-                        det_table.cell(r, lcol).text = ""
-                        det_table.cell(r, lcol + 1).text = ""
+                        cells_xml.append(_empty_tc_xml(tc_width) * 2)
+                rows_xml.append('<w:tr>' + ''.join(cells_xml) + '</w:tr>')
+            _append_rows_xml(det_table, rows_xml)
 
             # Spacing after details table
             doc.add_paragraph()
@@ -1066,45 +1351,29 @@ def build_word_bytes_from_ticker(ticker: str,
             # Some spacing before the table
             doc.add_paragraph()
             # Create the 2-column table
-            credit_table = doc.add_table(rows=max_rows + 1, cols=2)
+            credit_table = doc.add_table(rows=0, cols=2)
             credit_table.style = 'Table Grid'
+            tc_width = _grid_col_twips(credit_table)
 
-            # Header row styling
-            hdr0 = credit_table.cell(0, 0)
-            hdr1 = credit_table.cell(0, 1)
-            headers = (('Key Credit Merits', hdr0), ('Key Credit Risks', hdr1))
-            for text, cell in headers:
-                cell.text = text
-                para = cell.paragraphs[0]
-                para.alignment = WD_ALIGN_PARAGRAPH.LEFT
-                run = para.runs[0]
-                run.font.name = 'Calibri'
-                run.font.size = Pt(8)
-                run.font.bold = True
-                run.font.color.rgb = RGBColor(255, 255, 255)
-                set_cell_background(cell, "44546A", RGBColor(255, 255, 255))
+            # Header row: white on dark blue
+            rows_xml = ['<w:tr>' + ''.join(
+                _tc_xml(text, tc_width, bold=True, fill="44546A", color="FFFFFF")
+                for text in ('Key Credit Merits', 'Key Credit Risks')
+            ) + '</w:tr>']
 
-            # Data rows
+            # Data rows; the shorter list is padded with empty cells
             for i in range(max_rows):
-                ltxt = merits[i] if i < len(merits) else ""
-                rtxt = risks[i] if i < len(risks) else ""
-                lc = credit_table.cell(i + 1, 0)
-                rc = credit_table.cell(i + 1, 1)
-                lc.text = str(ltxt)
-                rc.text = str(rtxt)
-                for c in (lc, rc):
-                    para = c.paragraphs[0]
-                    para.alignment = WD_ALIGN_PARAGRAPH.LEFT
-                    if c.text:
-                        run = para.runs[0]
-                        run.font.name = 'Calibri'
-                        run.font.size = Pt(8)
+                texts = (merits[i] if i < len(merits) else "", risks[i] if i < len(risks) else "")
+                rows_xml.append('<w:tr>' + ''.join(
+                    _tc_xml(text, tc_width) if text else _empty_tc_xml(tc_width, 'left')
+                    for text in map(str, texts)
+                ) + '</w:tr>')
+            _append_rows_xml(credit_table, rows_xml)
 
             # Column widths (split usable width roughly in half)
             credit_table.autofit = False
             credit_table.allow_autofit = False
-            for i, column in enumerate(credit_table.columns):
-                column.width = Inches(3.635)
+            set_grid_widths(credit_table, [3.635] * len(credit_table.columns))
             # Space after the table
             doc.add_paragraph()
     except Exception:
@@ -1137,11 +1406,8 @@ def build_word_bytes_from_ticker(ticker: str,
         cap_table.style = 'Table Grid'
         
         # Add title row that spans all columns
-        title_row = cap_table.rows[0]
-        title_cell = title_row.cells[0]
         # Merge all cells in the first row
-        for i in range(1, len(cap_columns)):
-            title_cell.merge(title_row.cells[i])
+        title_cell = _merge_row_cells(cap_table.rows[0], 0, len(cap_columns) - 1)
         
         # Set the title with company name
         title_cell.text = f"{company_title} - Capitalization Table"
@@ -1154,9 +1420,7 @@ def build_word_bytes_from_ticker(ticker: str,
         title_run.font.color.rgb = RGBColor(255, 255, 255)
         
         # Set background color for title
-        title_shading = OxmlElement('w:shd')
-        title_shading.set(qn('w:fill'), "44546A")  # Dark blue
-        title_cell._element.tcPr.append(title_shading)
+        title_cell._element.tcPr.append(_shading("44546A"))  # Dark blue
         
         # Add header row
         header_row = cap_table.rows[1]
@@ -1172,30 +1436,45 @@ def build_word_bytes_from_ticker(ticker: str,
             run.font.bold = True
             run.font.color.rgb = RGBColor(255, 255, 255)
             # Set background color
-            shading = OxmlElement('w:shd')
-            shading.set(qn('w:fill'), "44546A")  # Dark blue
-            cell._element.tcPr.append(shading)
+            cell._element.tcPr.append(_shading("44546A"))  # Dark blue
         
         # (Removed explicit 'As of' row to match screenshot layout)
         
+        # Body rows are serialized as Calibri 8pt <w:tr> XML (first column left,
+        # the rest centered) and appended in one batch; cells left as None stay blank
+        cap_width = _grid_col_twips(cap_table)
+
+        def _cap_row_xml(texts, bold=False, top_sz=None):
+            texts = list(texts) + [None] * (len(cap_columns) - len(texts))
+            borders = _top_border_xml(top_sz) if top_sz else None
+            cells = []
+            for j, text in enumerate(texts):
+                align = 'center' if j > 0 else 'left'
+                if text:
+                    cells.append(_tc_xml(text, cap_width, align, bold=bold, borders=borders))
+                else:
+                    cells.append(_empty_tc_xml(cap_width, align, run=text is not None, borders=borders))
+            return '<w:tr>' + ''.join(cells) + '</w:tr>'
+
+        cap_rows = []
+
         # Cash and Equivalents
         cae = cap_json.get('cash_and_equivalents')
-        row = cap_table.add_row()
-        row.cells[0].text = "Cash and Equivalents"
-        row.cells[1].text = _fmt_num(cae)
+        cap_rows.append(_cap_row_xml(["Cash and Equivalents", _fmt_num(cae)]))
         
         # Debt breakdown
         debt_list = cap_json.get('debt') or []
         for d in debt_list:
             if not isinstance(d, dict):
                 continue
-            row = cap_table.add_row()
-            row.cells[0].text = str(d.get('type', ''))
-            row.cells[1].text = _fmt_num(d.get('amount'))
-            row.cells[2].text = str(d.get('ppc_holdings', ''))
-            row.cells[3].text = str(d.get('coupon', ''))
-            row.cells[4].text = str(d.get('secured', ''))
-            row.cells[5].text = str(d.get('maturity', ''))
+            cap_rows.append(_cap_row_xml([
+                str(d.get('type', '')),
+                _fmt_num(d.get('amount')),
+                str(d.get('ppc_holdings', '')),
+                str(d.get('coupon', '')),
+                str(d.get('secured', '')),
+                str(d.get('maturity', '')),
+            ]))
         
         # Add important totals in a specific order
         for key, disp in [
@@ -1210,68 +1489,25 @@ def build_word_bytes_from_ticker(ticker: str,
         ]:
             val = cap_json.get(key)
             if val is not None:
-                row = cap_table.add_row()
-                row.cells[0].text = disp
-                row.cells[1].text = _fmt_num(val)
-                
-                # Format special rows with bold text
+                # Special rows are bold, with a strong (slightly thicker) top
+                # border across the entire row as a separator
                 if disp in ["Total Debt", "Book Capitalization", "Market Capitalization"]:
-                    for cell in row.cells[:2]:  # Only format the first two cells
-                        for paragraph in cell.paragraphs:
-                            for run in paragraph.runs:
-                                run.font.bold = True
-                    # Add a strong top border across the entire row as a separator
-                    for cell in row.cells:
-                        tc = cell._element.tcPr
-                        if tc is None:
-                            tc = OxmlElement('w:tcPr')
-                            cell._element.append(tc)
-                        borders = tc.find(qn('w:tcBorders'))
-                        if borders is None:
-                            borders = OxmlElement('w:tcBorders')
-                            tc.append(borders)
-                        top = OxmlElement('w:top')
-                        top.set(qn('w:val'), 'single')
-                        top.set(qn('w:sz'), '8')  # slightly thicker
-                        top.set(qn('w:space'), '0')
-                        top.set(qn('w:color'), '000000')
-                        borders.append(top)
+                    cap_rows.append(_cap_row_xml([disp, _fmt_num(val)], bold=True, top_sz='8'))
+                else:
+                    cap_rows.append(_cap_row_xml([disp, _fmt_num(val)]))
         
         # Key financial ratios header
         kfr = cap_json.get('key_financial_ratios') or {}
         if isinstance(kfr, dict) and kfr:
-            row = cap_table.add_row()
-            cell = row.cells[0]
-            # Merge cells for the header
-            for i in range(1, len(cap_columns)):
-                cell.merge(row.cells[i])
-            cell.text = "Key Financial Ratios:"
-            # Format the cell
-            cell_para = cell.paragraphs[0]
-            cell_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            run = cell_para.runs[0]
-            run.font.name = 'Calibri'
-            run.font.size = Pt(8)
-            run.font.bold = True
-            run.italic = True
-            # Set background color to light gray
-            shading = OxmlElement('w:shd')
-            shading.set(qn('w:fill'), "D3D3D3")  # Light gray
-            cell._element.tcPr.append(shading)
+            # Header merged across the row, bold italic on light gray
+            cap_rows.append('<w:tr>' + _tc_xml("Key Financial Ratios:", cap_width, 'center', bold=True, italic=True,
+                                               fill="D3D3D3", span=len(cap_columns)) + '</w:tr>')
             
             # Add ratio rows
             for k, v in kfr.items():
                 label = k.replace('_', ' ').title() if isinstance(k, str) else str(k)
-                row = cap_table.add_row()
-                row.cells[0].text = label
                 # Format numeric ratios; for select metrics, show percentage instead of 'x'
-                def _norm(s: str) -> str:
-                    return re.sub(r"\s+", " ", str(s).strip().lower())
-                pct_labels = {
-                    'total debt / book capital',
-                    'total debt + leases / book capital',
-                }
-                is_pct_metric = _norm(label) in pct_labels
+                is_pct_metric = _norm_label(label) in _PCT_RATIO_LABELS
                 display_v = v
                 try:
                     if v is not None and str(v).strip() not in ('', '-'):
@@ -1282,27 +1518,15 @@ def build_word_bytes_from_ticker(ticker: str,
                             display_v = f"({abs(fv):.2f}x)" if fv < 0 else f"{fv:.2f}x"
                 except Exception:
                     display_v = v
-                row.cells[1].text = str(display_v)
-        
-        # Format all cells in the table
-        for row in cap_table.rows[1:]:  # Skip header row
-            for i, cell in enumerate(row.cells):
-                # Format cell text
-                cell_para = cell.paragraphs[0]
-                cell_para.alignment = WD_ALIGN_PARAGRAPH.CENTER if i > 0 else WD_ALIGN_PARAGRAPH.LEFT
-                if cell.text:  # Only format if there's text
-                    run = cell_para.runs[0]
-                    run.font.name = 'Calibri'
-                    run.font.size = Pt(8)  # Increased font size
+                cap_rows.append(_cap_row_xml([label, str(display_v)]))
+
+        _append_rows_xml(cap_table, cap_rows)
         
         # Set column widths
         cap_table.autofit = False
         cap_table.allow_autofit = False
-        for i, column in enumerate(cap_table.columns):
-            if i == 0:
-                column.width = Inches(2.5)  # First column wider
-            else:
-                column.width = Inches(4.77 / (len(cap_columns) - 1))  # Remaining width divided among other columns
+        # First column wider, remaining width divided among the other columns
+        set_grid_widths(cap_table, [2.5] + [4.77 / (len(cap_columns) - 1)] * (len(cap_columns) - 1))
         
         # Add space after CAP table
         doc.add_paragraph()
@@ -1311,22 +1535,16 @@ def build_word_bytes_from_ticker(ticker: str,
     if isinstance(cap_json, dict):
         doc.add_page_break()
     
-    # Determine groups from columns for the two-row header
-    columns = df.columns.tolist()
-    year_cols = [c for c in columns if isinstance(c, str) and c.isdigit() and len(c) == 4]
-    ytd_cols = [c for c in columns if isinstance(c, str) and c.startswith('YTD ')]
-    ltm_cols = [c for c in columns if isinstance(c, str) and c.startswith('LTM ')]
-    
+    # Column groups for the two-row header were captured during the reorder above
     years_count = len(year_cols)
     ytd_count = len(ytd_cols)
     ltm_count = len(ltm_cols)
     
-    # Create table with two header rows
-    num_rows = len(df) + 2  # +2 for the two header rows
+    # Create the table with its two header rows; data rows are appended as XML below
     num_cols = len(df.columns)
     
     # Now create the table
-    table = doc.add_table(rows=num_rows, cols=num_cols)
+    table = doc.add_table(rows=2, cols=num_cols)
     # Use a built-in style that's guaranteed to exist
     table.style = 'Table Grid'
     
@@ -1352,12 +1570,8 @@ def build_word_bytes_from_ticker(ticker: str,
         year_start_idx = 1  # First column after Metric
         year_end_idx = year_start_idx + years_count - 1
         
-        # Merge cells for the Fiscal Year Ended header - correct way to merge cells
-        fiscal_year_cell = header_row1.cells[year_start_idx]
-        # We need to merge with each cell one by one in sequence
-        for i in range(year_start_idx + 1, year_end_idx + 1):
-            # Always merge with the next cell (which is now at position year_start_idx + 1 after each merge)
-            fiscal_year_cell.merge(header_row1.cells[year_start_idx + 1])
+        # Merge cells for the Fiscal Year Ended header across all year columns
+        fiscal_year_cell = _merge_row_cells(header_row1, year_start_idx, year_end_idx)
         
         # Set text and formatting - ensure it's properly centered
         fiscal_year_cell.text = "Fiscal Year Ended"
@@ -1379,12 +1593,8 @@ def build_word_bytes_from_ticker(ticker: str,
         ytd_start_idx = year_start_idx + years_count
         ytd_end_idx = ytd_start_idx + ytd_count - 1
         
-        # Merge cells for the YTD header - correct way to merge cells
-        ytd_cell = header_row1.cells[ytd_start_idx]
-        # We need to merge with each cell one by one in sequence
-        for i in range(ytd_start_idx + 1, ytd_end_idx + 1):
-            # Always merge with the next cell (which is now at position ytd_start_idx + 1 after each merge)
-            ytd_cell.merge(header_row1.cells[ytd_start_idx + 1])
+        # Merge cells for the YTD header across all YTD columns
+        ytd_cell = _merge_row_cells(header_row1, ytd_start_idx, ytd_end_idx)
         
         # Set text and formatting
         ytd_cell.text = "YTD"
@@ -1403,12 +1613,8 @@ def build_word_bytes_from_ticker(ticker: str,
         ltm_start_idx = ytd_start_idx + ytd_count
         ltm_end_idx = ltm_start_idx + ltm_count - 1
         
-        # Merge cells for the LTM header - correct way to merge cells
-        ltm_cell = header_row1.cells[ltm_start_idx]
-        # We need to merge with each cell one by one in sequence
-        for i in range(ltm_start_idx + 1, ltm_end_idx + 1):
-            # Always merge with the next cell (which is now at position ltm_start_idx + 1 after each merge)
-            ltm_cell.merge(header_row1.cells[ltm_start_idx + 1])
+        # Merge cells for the LTM header across all LTM columns
+        ltm_cell = _merge_row_cells(header_row1, ltm_start_idx, ltm_end_idx)
         
         # Set text and formatting
         ltm_cell.text = "LTM"
@@ -1492,12 +1698,11 @@ def build_word_bytes_from_ticker(ticker: str,
     # Track whether we've inserted the Key Financial Ratios header
     kfr_inserted = False
 
-    # Fill in the data rows
-    for i, row in enumerate(df.values):
-        # Base index of the target row in the Word table (+2 header rows)
-        # If we've already inserted a KFR header row, we need to shift all following rows by +1
-        table_row_idx = i + 2 + (1 if kfr_inserted else 0)
-        
+    # Fill in the data rows: each row is serialized as <w:tr> XML (Calibri 8pt,
+    # first column left aligned, edge borders included) and appended in one batch
+    hfa_width = _grid_col_twips(table)
+    hfa_rows = []
+    for row in df.itertuples(index=False, name=None):
         # Get the metric name (first column)
         metric_name = str(row[0]) if row[0] != '' else ''
         
@@ -1508,244 +1713,86 @@ def build_word_bytes_from_ticker(ticker: str,
         is_margin_row = metric_name == '% Margin' or metric_name.strip() == '%'
         is_growth_row = metric_name == '% YoY Growth'
         is_other_row = metric_name == 'Other'
-        is_indent_row = is_margin_row or is_growth_row or is_other_row
-        is_kfr_header = metric_name == 'EBITDA / Int. Exp.' or 'Key Financial Ratios:' in metric_name
         # Ratio row detection
-        is_ratio_row = any(k in metric_name for k in ratio_keywords)
-        pct_ratio_metrics = {
-            'Total Debt / Book Capital',
-            'Total Debt + Leases / Book Capital',
-        }
+        is_ratio_row = _RATIO_RE.search(metric_name) is not None
         
         # Insert Key Financial Ratios header exactly once: just before the first ratio row encountered
         if not kfr_inserted and is_ratio_row:
-            # Ensure there is space for the header row at current index
-            table.add_row()
-            # Prepare the header row at current computed index
-            kfr_row = table.rows[table_row_idx]
-            kfr_cell = kfr_row.cells[0]
-            # Merge across entire width
-            for col_idx in range(1, num_cols):
-                try:
-                    kfr_cell.merge(kfr_row.cells[1])
-                except Exception:
-                    break
-            # Style the header cell
-            kfr_cell.text = ""
-            kfr_para = kfr_cell.paragraphs[0]
-            kfr_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            kfr_para.paragraph_format.space_before = Pt(0)
-            kfr_para.paragraph_format.space_after = Pt(0)
-            kfr_run = kfr_para.add_run("Key Financial Ratios:")
-            kfr_run.font.name = 'Calibri'
-            kfr_run.font.size = Pt(8)
-            kfr_run.bold = True
-            kfr_run.italic = True
-            kfr_run.font.color.rgb = RGBColor(0, 0, 0)
-            kfr_cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-            kfr_row.height = Pt(14)
-            # Background
-            kfr_shading = OxmlElement('w:shd')
-            kfr_shading.set(qn('w:fill'), "D3D3D3")
-            kfr_cell._element.tcPr.append(kfr_shading)
-            # Move write index to the next row (so current ratio row is placed under the header)
-            table_row_idx += 1
+            hfa_rows.append(_hfa_kfr_row_xml(hfa_width, num_cols))
             kfr_inserted = True
         
-        # If this row is the 'Key Financial Ratios:' header, merge across the full width
+        # If this row is the 'Key Financial Ratios:' header, render it as the styled header row
         if metric_name.strip().startswith('Key Financial Ratios:'):
-            kfr_row = table.rows[table_row_idx]
-            kfr_cell = kfr_row.cells[0]
-            
-            # Merge across entire row
-            for _ in range(1, num_cols):
-                try:
-                    kfr_cell.merge(kfr_row.cells[1])
-                except Exception:
-                    break
-            # Style (ensure visible)
-            kfr_cell.text = ""
-            kfr_para = kfr_cell.paragraphs[0]
-            kfr_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            kfr_para.paragraph_format.space_before = Pt(0)
-            kfr_para.paragraph_format.space_after = Pt(0)
-            kfr_run = kfr_para.add_run('Key Financial Ratios:')
-            kfr_run.font.name = 'Calibri'
-            kfr_run.font.size = Pt(8)
-            kfr_run.bold = True
-            kfr_run.italic = True
-            kfr_run.font.color.rgb = RGBColor(0, 0, 0)
-            kfr_cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-            kfr_row.height = Pt(14)
-            # Light gray background
-            kfr_shading = OxmlElement('w:shd')
-            kfr_shading.set(qn('w:fill'), "D3D3D3")
-            kfr_cell._element.tcPr.append(kfr_shading)
-            # Proceed to next row
+            hfa_rows.append(_hfa_kfr_row_xml(hfa_width, num_cols))
             continue
 
         # Fill in the data for this row
+        texts = []
         for j, cell_text in enumerate(row):
-            cell = table.cell(table_row_idx, j)
             text_out = str(cell_text) if cell_text != '' else ''
             # Apply ratio formatting for ratio rows, data columns only
             if j > 0 and is_ratio_row and text_out not in ['', '-']:
                 try:
                     v = float(str(text_out).replace('(', '-').replace(')', '').replace(',', '').replace('x', '').replace('%', ''))
-                    if metric_name in pct_ratio_metrics:
+                    if metric_name in _PCT_RATIO_METRICS:
                         text_out = f"({abs(v):.1f}%)" if v < 0 else f"{v:.1f}%"
                     else:
                         text_out = f"({abs(v):.2f}x)" if v < 0 else f"{v:.2f}x"
                 except Exception:
                     pass
-            cell.text = text_out
-            
-            # Format data cell
-            cell_para = cell.paragraphs[0]
-            cell_para.alignment = WD_ALIGN_PARAGRAPH.CENTER if j > 0 else WD_ALIGN_PARAGRAPH.LEFT
-            if cell.text:  # Only format if there's text
-                run = cell_para.runs[0]
-                run.font.name = 'Calibri'
-                run.font.size = Pt(8)  # Increased font size
-                
-                # Apply bold formatting if needed
-                if is_bold_row:
-                    run.font.bold = True
-                
-                # Apply indentation if needed
-                if j == 0:  # First column handling
-                    if is_margin_row:
-                        # Special handling for % Margin rows
-                        cell.text = "% Margin"
-                        # apply paragraph left indentation instead of leading spaces
-                        cell_para = cell.paragraphs[0]
-                        cell_para.paragraph_format.left_indent = Inches(0.15)
-                        run = cell_para.runs[0]
-                        run.font.name = 'Calibri'
-                        run.font.size = Pt(8)
-                        run.bold = True  # Make it bold
-                        run.italic = True
-                    elif is_growth_row:
-                        # Special handling for % YoY Growth rows
-                        cell.text = "% YoY Growth"
-                        cell_para = cell.paragraphs[0]
-                        cell_para.paragraph_format.left_indent = Inches(0.15)
-                        run = cell_para.runs[0]
-                        run.font.name = 'Calibri'
-                        run.font.size = Pt(8)
-                        run.bold = True  # Make it bold
-                        run.italic = True
-                    elif is_other_row:
-                        # Special handling for Other rows
-                        cell.text = "Other"
-                        cell_para = cell.paragraphs[0]
-                        cell_para.paragraph_format.left_indent = Inches(0.15)
-                        run = cell_para.runs[0]
-                        run.font.name = 'Calibri'
-                        run.font.size = Pt(8)
-                        run.italic = True
-                    elif is_indent_row:
-                        # General indentation
-                        cell.text = f"{cell_text}"
-                        cell_para = cell.paragraphs[0]
-                        cell_para.paragraph_format.left_indent = Inches(0.15)
-                        run = cell_para.runs[0]
-                        run.font.name = 'Calibri'
-                        run.font.size = Pt(8)
+            texts.append(text_out)
+
+        # Indented first-column labels: % Margin / % YoY Growth bold italic, Other italic
+        label = None
+        if texts and texts[0]:
+            if is_margin_row:
+                texts[0], label = "% Margin", (True, True)
+            elif is_growth_row:
+                texts[0], label = "% YoY Growth", (True, True)
+            elif is_other_row:
+                texts[0], label = "Other", (False, True)
         
         # Add horizontal lines above specific rows
-        if metric_name in ["Revenue", "Gross Profit", "Operating Expenses", "Adjusted EBITDA", 
-                          "Interest Expense", "Capital Expenditures", "Free Cash Flow", 
-                          "Acq. / Disp.", "Equity / Dividends", "Change in Cash", 
-                          "Cash - End of Period", "Total Debt", "Book Equity"]:
-            # Add a border to the top of this row
-            for j in range(num_cols):
-                cell = table.cell(table_row_idx, j)
-                tc = cell._element.tcPr
-                if tc is None:
-                    tc = OxmlElement('w:tcPr')
-                    cell._element.append(tc)
-                
-                # Add top border
-                tcBorders = OxmlElement('w:tcBorders')
-                tc.append(tcBorders)
-                top = OxmlElement('w:top')
-                top.set(qn('w:val'), 'single')
-                top.set(qn('w:sz'), '4')
-                top.set(qn('w:space'), '0')
-                top.set(qn('w:color'), '000000')
-                tcBorders.append(top)
-                
-                # Remove vertical borders
-                for side in ['left', 'right']:
-                    side_element = OxmlElement(f'w:{side}')
-                    side_element.set(qn('w:val'), 'nil')
-                    tcBorders.append(side_element)
+        separator = metric_name in ["Revenue", "Gross Profit", "Operating Expenses", "Adjusted EBITDA", 
+                                    "Interest Expense", "Capital Expenditures", "Free Cash Flow", 
+                                    "Acq. / Disp.", "Equity / Dividends", "Change in Cash", 
+                                    "Cash - End of Period", "Total Debt", "Book Equity"]
+        hfa_rows.append(_hfa_row_xml(texts, hfa_width, bold=is_bold_row, separator=separator, label=label))
+
+    _append_rows_xml(table, hfa_rows)
     
     # Removed previous post-processing merge for 'Key Financial Ratios:' to avoid width overflow
 
     # Set column widths
     table.autofit = False
     table.allow_autofit = False
-    for i, column in enumerate(table.columns):
-        if i == 0:
-            column.width = Inches(3.5)  # 45% of ~7.27 inches (A4 width minus margins)
-        else:
-            column.width = Inches(3.77 / (num_cols - 1))  # Remaining width divided among other columns
+    # 45% of ~7.27 inches (A4 width minus margins) for the labels, the rest divided evenly
+    set_grid_widths(table, [3.5] + [3.77 / (num_cols - 1)] * (num_cols - 1))
     
-    # Set borders for the table - only vertical lines at left and right edges
-    for row_idx, row in enumerate(table.rows):
-        # detect KFR merged header row
-        is_kfr_row = False
-        try:
-            first_txt = row.cells[0].text.strip()
-            is_kfr_row = first_txt.startswith("Key Financial Ratios:")
-        except Exception:
-            is_kfr_row = False
+    # Set borders for the header rows - only vertical lines at left and right
+    # edges (the data rows carry theirs in the XML built above)
+    for row in table.rows[:2]:
+        seen = set()
         for cell_idx, cell in enumerate(row.cells):
-            tc = cell._element.tcPr
-            if tc is None:
-                tc = OxmlElement('w:tcPr')
-                cell._element.append(tc)
+            # A merged cell repeats in row.cells once per grid column it spans
+            if cell._tc in seen:
+                continue
+            seen.add(cell._tc)
+            tc = cell._element.get_or_add_tcPr()
             
-            # Ensure borders element exists
-            borders = tc.find(qn('w:tcBorders'))
+            # Set vertical borders only at the edges: left border only for the
+            # first column, right border only for the cell reaching the last
+            left = 'single' if cell_idx == 0 else 'nil'
+            right = 'single' if cell_idx + cell._tc.grid_span - 1 == num_cols - 1 else 'nil'
+            borders = tc.find(_QN_TCBORDERS)
             if borders is None:
-                borders = OxmlElement('w:tcBorders')
-                tc.append(borders)
-            
-            # Set vertical borders only at the edges
-            # Left border only for first column (for KFR row, only apply to first occurrence)
-            left_element = OxmlElement('w:left')
-            if cell_idx == 0:  # First column
-                left_element.set(qn('w:val'), 'single')
-                left_element.set(qn('w:sz'), '4')
-                left_element.set(qn('w:space'), '0')
-                left_element.set(qn('w:color'), '000000')
-            elif is_kfr_row:
-                # No inner verticals for merged KFR row
-                left_element.set(qn('w:val'), 'nil')
-            else:  # Other columns
-                left_element.set(qn('w:val'), 'nil')
-            borders.append(left_element)
-            
-            # Right border only for last column
-            right_element = OxmlElement('w:right')
-            if cell_idx == num_cols - 1:  # Last column
-                right_element.set(qn('w:val'), 'single')
-                right_element.set(qn('w:sz'), '4')
-                right_element.set(qn('w:space'), '0')
-                right_element.set(qn('w:color'), '000000')
-            elif is_kfr_row:
-                # No inner verticals for merged KFR row
-                right_element.set(qn('w:val'), 'nil')
-            else:  # Other columns
-                right_element.set(qn('w:val'), 'nil')
-            borders.append(right_element)
+                tc.append(_tc_borders(('left', left), ('right', right)))
+            else:
+                borders.append(_border('left', left))
+                borders.append(_border('right', right))
             
             # Ensure header cells have the proper background color
-            if row_idx <= 1:  # First two rows are headers
-                set_cell_background(cell, "44546A", RGBColor(255, 255, 255))
+            set_cell_background(cell, "44546A", RGBColor(255, 255, 255))
     
     # Add a page break after the table
     doc.add_paragraph().add_run().add_break()
@@ -1852,11 +1899,7 @@ def build_word_bytes_from_ticker(ticker: str,
         try:
             esg_table.autofit = False
             esg_table.allow_autofit = False
-            for idx, col in enumerate(esg_table.columns):
-                if idx % 2 == 0:
-                    col.width = Inches(1.75)
-                else:
-                    col.width = Inches(0.65)
+            set_grid_widths(esg_table, [1.75 if idx % 2 == 0 else 0.65 for idx in range(len(esg_table.columns))])
         except Exception:
             pass
 
@@ -1959,11 +2002,8 @@ def build_word_bytes_from_ticker(ticker: str,
             comp_table.style = 'Table Grid'
 
             # Add title row that spans all columns
-            title_row = comp_table.rows[0]
-            title_cell = title_row.cells[0]
             # Merge all cells in the first row
-            for i in range(1, num_cols):
-                title_cell.merge(title_row.cells[i])
+            title_cell = _merge_row_cells(comp_table.rows[0], 0, num_cols - 1)
 
             # Set the title with company name
             title_cell.text = f"{company_title} - Credit Comparable Analysis"
@@ -1975,9 +2015,7 @@ def build_word_bytes_from_ticker(ticker: str,
             title_run.font.bold = True
 
             # Set background color for title to light gray
-            title_shading = OxmlElement('w:shd')
-            title_shading.set(qn('w:fill'), "D3D3D3")  # Light gray
-            title_cell._element.tcPr.append(title_shading)
+            title_cell._element.tcPr.append(_shading("D3D3D3"))  # Light gray
 
             # Note: adjusted_headers and df_to_header_map already built above
 
@@ -2008,9 +2046,7 @@ def build_word_bytes_from_ticker(ticker: str,
             ltm_indices = sorted([_idx(h) for h in ltm_members if _idx(h) is not None])
             if ltm_indices:
                 first, last = ltm_indices[0], ltm_indices[-1]
-                merged = group_row.cells[first]
-                for _ in range(first + 1, last + 1):
-                    merged.merge(group_row.cells[first + 1])
+                merged = _merge_row_cells(group_row, first, last)
                 merged.text = "LTM"
                 _dark_header(merged)
             avg_members = [
@@ -2021,9 +2057,7 @@ def build_word_bytes_from_ticker(ticker: str,
             avg_indices = sorted([_idx(h) for h in avg_members if _idx(h) is not None])
             if avg_indices:
                 first, last = avg_indices[0], avg_indices[-1]
-                merged = group_row.cells[first]
-                for _ in range(first + 1, last + 1):
-                    merged.merge(group_row.cells[first + 1])
+                merged = _merge_row_cells(group_row, first, last)
                 merged.text = "3-Year Average"
                 _dark_header(merged)
 
@@ -2074,7 +2108,7 @@ def build_word_bytes_from_ticker(ticker: str,
                 set_cell_background(cell, "44546A", RGBColor(255, 255, 255))
 
             # Fill in the data rows
-            for i, row in enumerate(df_comp.values):
+            for i, row in enumerate(df_comp.itertuples(index=False, name=None)):
                 table_row = comp_table.rows[i + 3]  # +3 to account for title + group + header rows
 
                 # First column: Ticker
@@ -2092,9 +2126,7 @@ def build_word_bytes_from_ticker(ticker: str,
                 else:
                     run.font.bold = True
                     # Add light gray background for Average and Median rows
-                    shading = OxmlElement('w:shd')
-                    shading.set(qn('w:fill'), "D3D3D3")  # Light gray
-                    table_row.cells[0]._element.tcPr.append(shading)
+                    table_row.cells[0]._element.tcPr.append(_shading("D3D3D3"))  # Light gray
 
                 # Fill in the data for the remaining columns
                 for j, cell_text in enumerate(row):
@@ -2149,9 +2181,7 @@ def build_word_bytes_from_ticker(ticker: str,
                     if ticker.upper() in ("AVERAGE", "MEDIAN"):
                         run.font.bold = True
                         # Add light gray background
-                        shading = OxmlElement('w:shd')
-                        shading.set(qn('w:fill'), "D3D3D3")  # Light gray
-                        table_row.cells[table_col_idx]._element.tcPr.append(shading)
+                        table_row.cells[table_col_idx]._element.tcPr.append(_shading("D3D3D3"))  # Light gray
             
             # Set column widths (Ticker ~15%, remaining evenly) and center the table
             comp_table.autofit = False
@@ -2161,10 +2191,10 @@ def build_word_bytes_from_ticker(ticker: str,
             first_col_frac = 0.15
             remaining_cols = max(1, num_cols - 1)
             other_frac = (1.0 - first_col_frac) / remaining_cols
-            for i, column in enumerate(comp_table.columns):
-                frac = first_col_frac if i == 0 else other_frac
-                width_in = total_w_in * frac
-                set_column_preferred_width(comp_table, i, width_in)
+            set_column_preferred_widths(
+                comp_table,
+                [total_w_in * (first_col_frac if i == 0 else other_frac) for i in range(num_cols)],
+            )
             # Force total table width
             set_table_fixed_width(comp_table, total_w_in)
             set_table_indent(comp_table, 0.0)
@@ -2199,9 +2229,7 @@ def build_word_bytes_from_ticker(ticker: str,
 
         r = 0
         # Title row spanning 3 cols
-        title_cell = cov_table.cell(r, 0)
-        for c in range(1, 3):
-            title_cell.merge(cov_table.cell(r, c))
+        title_cell = _merge_row_cells(cov_table.rows[r], 0, 2)
         title_cell.text = cov_title
         para = title_cell.paragraphs[0]
         para.alignment = WD_ALIGN_PARAGRAPH.CENTER
@@ -2213,9 +2241,7 @@ def build_word_bytes_from_ticker(ticker: str,
         r += 1
 
         # Date row spanning 3 cols
-        date_cell = cov_table.cell(r, 0)
-        for c in range(1, 3):
-            date_cell.merge(cov_table.cell(r, c))
+        date_cell = _merge_row_cells(cov_table.rows[r], 0, 2)
         date_cell.text = cov_date
         para = date_cell.paragraphs[0]
         para.alignment = WD_ALIGN_PARAGRAPH.CENTER
@@ -2224,9 +2250,7 @@ def build_word_bytes_from_ticker(ticker: str,
         run.font.size = Pt(9)
         run.bold = True
         # light gray background
-        shading = OxmlElement('w:shd')
-        shading.set(qn('w:fill'), "D3D3D3")
-        date_cell._element.tcPr.append(shading)
+        date_cell._element.tcPr.append(_shading("D3D3D3"))
         r += 1
 
         # Header row
@@ -2241,9 +2265,7 @@ def build_word_bytes_from_ticker(ticker: str,
             run.font.size = Pt(8)
             run.bold = True
             # light gray background
-            shading = OxmlElement('w:shd')
-            shading.set(qn('w:fill'), "D3D3D3")
-            hcell._element.tcPr.append(shading)
+            hcell._element.tcPr.append(_shading("D3D3D3"))
         r += 1
 
         # Term rows
@@ -2265,9 +2287,7 @@ def build_word_bytes_from_ticker(ticker: str,
             r += 1
 
         # Group header row spanning 3 cols
-        group_cell = cov_table.cell(r, 0)
-        for c in range(1, 3):
-            group_cell.merge(cov_table.cell(r, c))
+        group_cell = _merge_row_cells(cov_table.rows[r], 0, 2)
         group_cell.text = "Additional Covenants / Baskets"
         para = group_cell.paragraphs[0]
         para.alignment = WD_ALIGN_PARAGRAPH.CENTER
@@ -2275,9 +2295,7 @@ def build_word_bytes_from_ticker(ticker: str,
         run.font.name = 'Calibri'
         run.font.size = Pt(8)
         run.bold = True
-        shading = OxmlElement('w:shd')
-        shading.set(qn('w:fill'), "D3D3D3")
-        group_cell._element.tcPr.append(shading)
+        group_cell._element.tcPr.append(_shading("D3D3D3"))
         r += 1
 
         for term in more_terms:
@@ -2304,8 +2322,7 @@ def build_word_bytes_from_ticker(ticker: str,
             cov_table.alignment = WD_TABLE_ALIGNMENT.CENTER
             total_w_in = 7.15  # slightly under full width to avoid Word auto-shrink
             widths_in = [total_w_in * 0.62, total_w_in * 0.19, total_w_in * 0.19]
-            for idx, w_in in enumerate(widths_in):
-                set_column_preferred_width(cov_table, idx, w_in)
+            set_column_preferred_widths(cov_table, widths_in)
             # Force total table width
             set_table_fixed_width(cov_table, total_w_in)
             set_table_indent(cov_table, 0.0)
@@ -2334,9 +2351,13 @@ def build_word_bytes_from_ticker(ticker: str,
         # Add a page break before the end of the document
         doc.add_page_break()
     
-    # Save the document to the buffer
+    if output is not None:
+        doc.save(output)
+        return None
+
+    # Save the document to an in-memory buffer
+    buffer = BytesIO()
     doc.save(buffer)
-    buffer.seek(0)
     return buffer.getvalue()
 
 
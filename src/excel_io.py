@@ -0,0 +1,16 @@
+import pandas as pd
+
+
+def read_essence_table(path, sheet_name='Essence Table'):
+    """Read a single worksheet, preferring the Rust-backed calamine engine."""
+    try:
+        return pd.read_excel(path, sheet_name=sheet_name, engine='calamine')
+    except (ImportError, ValueError):
+        # calamine not installed (or pandas too old to know it): fall back to
+        # openpyxl in read-only/values-only mode, skipping style/formula parsing
+        return pd.read_excel(
+            path,
+            sheet_name=sheet_name,
+            engine='openpyxl',
+            engine_kwargs={'read_only': True, 'data_only': True},
+        )